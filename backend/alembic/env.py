@@ -10,12 +10,14 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parents[1]))
 
 from app.database import Base
-from app.config import settings
+from app.config import get_settings
 
 # Importer tous les modèles
 from app.models.candidate import Candidate
 from app.models.job_offer import JobOffer
 from app.models.interview import InterviewSession, InterviewQuestion, InterviewResponse
+from app.models.job_statistics import JobStatistics
+from app.models.cv_blob import CVBlob
 
 # this is the Alembic Config object
 config = context.config
@@ -28,7 +30,7 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 # URL de la base de données depuis settings
-config.set_main_option('sqlalchemy.url', settings.DATABASE_URL)
+config.set_main_option('sqlalchemy.url', get_settings().database_url)
 
 
 def run_migrations_offline() -> None:
@@ -0,0 +1,57 @@
+"""Index composites des listes de candidats et des sessions d'entretien
+
+- candidates (job_offer_id, cv_score DESC) : /by-job, /ranking, rang et
+  percentile d'un candidat
+- interview_sessions (candidate_id, job_offer_id, status) : recherche de la
+  session en cours au démarrage d'un entretien
+
+Les tables sont créées par init_db / create_all : un index déjà présent
+(base créée après l'ajout des index aux modèles) n'est pas recréé.
+
+Revision ID: 4b7e2a91c3d5
+Revises:
+Create Date: 2026-10-17 09:00:00
+
+"""
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2a91c3d5'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("ix_candidates_job_offer_score", "candidates", ["job_offer_id", sa.text("cv_score DESC")]),
+    ("ix_interview_sessions_candidate_job_status", "interview_sessions", ["candidate_id", "job_offer_id", "status"]),
+]
+
+
+def _existing_indexes(table: str) -> Optional[set]:
+    """Noms des index de la table (None si la table n'existe pas encore)"""
+    if op.get_context().as_sql:
+        # Mode --sql : pas de base à inspecter, le script contient tout
+        return set()
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return None
+    return {index["name"] for index in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        existing = _existing_indexes(table)
+        if existing is not None and name not in existing:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        existing = _existing_indexes(table)
+        if existing is not None and (name in existing or op.get_context().as_sql):
+            op.drop_index(name, table_name=table)
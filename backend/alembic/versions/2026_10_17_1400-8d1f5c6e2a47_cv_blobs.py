@@ -0,0 +1,50 @@
+"""Table cv_blobs : CVs stockés par contenu (sha256)
+
+Texte et données extraites d'un PDF, partagés par toutes les candidatures
+qui envoient le même fichier. Les anciens fichiers horodatés restent
+référencés tels quels par candidates.cv_filename.
+
+Revision ID: 8d1f5c6e2a47
+Revises: 4b7e2a91c3d5
+Create Date: 2026-10-17 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d1f5c6e2a47'
+down_revision: Union[str, None] = '4b7e2a91c3d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(table: str) -> bool:
+    """La table existe déjà (créée par init_db / create_all)"""
+    if op.get_context().as_sql:
+        return False
+    return sa.inspect(op.get_bind()).has_table(table)
+
+
+def upgrade() -> None:
+    if _has_table("cv_blobs"):
+        return
+    op.create_table(
+        "cv_blobs",
+        sa.Column("sha256", sa.String(length=64), primary_key=True),
+        sa.Column("filename", sa.String(length=500), nullable=False),
+        sa.Column("original_filename", sa.String(length=500)),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("cv_text", sa.Text()),
+        sa.Column("extracted_data", sa.JSON()),
+        sa.Column("analyzer_version", sa.String(length=20)),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("cv_blobs")
@@ -0,0 +1,46 @@
+"""Colonne interview_sessions.question_ids : ordre des questions d'une session
+
+La question suivante est lue par clé primaire (question_ids[questions_answered])
+au lieu de relire toutes les questions de l'offre à chaque réponse. Les
+sessions existantes sont complétées à leur prochaine question
+(Interviewer._session_question_ids).
+
+Revision ID: 3c9a7d2e5f81
+Revises: 8d1f5c6e2a47
+Create Date: 2026-10-17 16:00:00
+
+"""
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9a7d2e5f81'
+down_revision: Union[str, None] = '8d1f5c6e2a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _existing_columns(table: str) -> Optional[set]:
+    """Colonnes de la table (None si la table n'existe pas encore)"""
+    if op.get_context().as_sql:
+        # Mode --sql : pas de base à inspecter, le script contient tout
+        return set()
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return None
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    existing = _existing_columns("interview_sessions")
+    if existing is None or "question_ids" in existing:
+        # Table absente (créée complète par init_db) ou colonne déjà présente
+        return
+    op.add_column("interview_sessions", sa.Column("question_ids", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("interview_sessions", "question_ids")
@@ -0,0 +1,58 @@
+"""Sommes courantes des scores d'une session d'entretien
+
+technical_score_sum / technical_count et behavioral_score_sum /
+behavioral_count sont mis à jour à chaque réponse au lieu de relire toutes
+les réponses de la session. Les sessions existantes restent à NULL et sont
+recalculées à leur prochaine réponse (Interviewer._update_scores) ou par
+scripts/recompute_interview_scores.py.
+
+Revision ID: 6e2b8f4a1d93
+Revises: 3c9a7d2e5f81
+Create Date: 2026-10-17 18:00:00
+
+"""
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e2b8f4a1d93'
+down_revision: Union[str, None] = '3c9a7d2e5f81'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = [
+    ("technical_score_sum", sa.Float()),
+    ("technical_count", sa.Integer()),
+    ("behavioral_score_sum", sa.Float()),
+    ("behavioral_count", sa.Integer()),
+]
+
+
+def _existing_columns(table: str) -> Optional[set]:
+    """Colonnes de la table (None si la table n'existe pas encore)"""
+    if op.get_context().as_sql:
+        # Mode --sql : pas de base à inspecter, le script contient tout
+        return set()
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return None
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    existing = _existing_columns("interview_sessions")
+    if existing is None:
+        # Table absente : créée complète par init_db
+        return
+    for name, column_type in COLUMNS:
+        if name not in existing:
+            op.add_column("interview_sessions", sa.Column(name, column_type, nullable=True))
+
+
+def downgrade() -> None:
+    for name, _ in reversed(COLUMNS):
+        op.drop_column("interview_sessions", name)
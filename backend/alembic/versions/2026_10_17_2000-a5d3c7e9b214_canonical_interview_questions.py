@@ -0,0 +1,53 @@
+"""Questions d'entretien canoniques : interview_questions.text_hash
+
+Les questions de la banque JSON sont enregistrées une seule fois, identifiées
+par le sha256 de leur texte normalisé, et référencées par toutes les sessions
+(interview_sessions.question_ids). Les copies par offre des anciennes sessions
+restent avec text_hash NULL.
+
+Revision ID: a5d3c7e9b214
+Revises: 6e2b8f4a1d93
+Create Date: 2026-10-17 20:00:00
+
+"""
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5d3c7e9b214'
+down_revision: Union[str, None] = '6e2b8f4a1d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _existing_columns(table: str) -> Optional[set]:
+    """Colonnes de la table (None si la table n'existe pas encore)"""
+    if op.get_context().as_sql:
+        # Mode --sql : pas de base à inspecter, le script contient tout
+        return set()
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return None
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    existing = _existing_columns("interview_questions")
+    if existing is None or "text_hash" in existing:
+        # Table absente (créée complète par init_db) ou colonne déjà présente
+        return
+    with op.batch_alter_table("interview_questions") as batch_op:
+        batch_op.add_column(sa.Column("text_hash", sa.String(length=64), nullable=True))
+        batch_op.create_unique_constraint("uq_interview_questions_text_hash", ["text_hash"])
+
+
+def downgrade() -> None:
+    existing = _existing_columns("interview_questions")
+    if existing is None or ("text_hash" not in existing and not op.get_context().as_sql):
+        return
+    with op.batch_alter_table("interview_questions") as batch_op:
+        batch_op.drop_constraint("uq_interview_questions_text_hash", type_="unique")
+        batch_op.drop_column("text_hash")
@@ -0,0 +1,55 @@
+"""Vecteurs des mots-clés attendus : interview_questions.keyword_vectors
+
+Les vecteurs spaCy des mots-clés d'une question sont calculés une seule
+fois (question_store) au lieu d'analyser chaque mot-clé à chaque réponse.
+keyword_vectors_model identifie le pipeline qui les a produits : ils sont
+recalculés au démarrage si le modèle change.
+
+Revision ID: b7e4d1f9c362
+Revises: a5d3c7e9b214
+Create Date: 2026-10-17 22:00:00
+
+"""
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4d1f9c362'
+down_revision: Union[str, None] = 'a5d3c7e9b214'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _existing_columns(table: str) -> Optional[set]:
+    """Colonnes de la table (None si la table n'existe pas encore)"""
+    if op.get_context().as_sql:
+        # Mode --sql : pas de base à inspecter, le script contient tout
+        return set()
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return None
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    existing = _existing_columns("interview_questions")
+    if existing is None:
+        # Table absente (créée complète par init_db)
+        return
+    if "keyword_vectors" not in existing:
+        op.add_column("interview_questions", sa.Column("keyword_vectors", sa.JSON(), nullable=True))
+    if "keyword_vectors_model" not in existing:
+        op.add_column("interview_questions", sa.Column("keyword_vectors_model", sa.String(length=100), nullable=True))
+
+
+def downgrade() -> None:
+    existing = _existing_columns("interview_questions")
+    if existing is None:
+        return
+    with op.batch_alter_table("interview_questions") as batch_op:
+        for column in ("keyword_vectors_model", "keyword_vectors"):
+            if column in existing or op.get_context().as_sql:
+                batch_op.drop_column(column)
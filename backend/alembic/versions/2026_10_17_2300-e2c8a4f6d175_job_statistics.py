@@ -0,0 +1,54 @@
+"""Table job_statistics : statistiques matérialisées par offre
+
+Agrégats des candidats d'une offre (effectifs, sommes des scores,
+histogramme, catégories, compétences), mis à jour à chaque création ou
+suppression de candidat. Les lignes manquantes sont remplies au démarrage
+(RecruitmentStats.ensure_job_statistics).
+
+Revision ID: e2c8a4f6d175
+Revises: b7e4d1f9c362
+Create Date: 2026-10-17 23:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c8a4f6d175'
+down_revision: Union[str, None] = 'b7e4d1f9c362'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(table: str) -> bool:
+    """La table existe déjà (créée par init_db / create_all)"""
+    if op.get_context().as_sql:
+        return False
+    return sa.inspect(op.get_bind()).has_table(table)
+
+
+def upgrade() -> None:
+    if _has_table("job_statistics"):
+        return
+    op.create_table(
+        "job_statistics",
+        sa.Column("job_offer_id", sa.Integer(), sa.ForeignKey("job_offers.id"), primary_key=True),
+        sa.Column("total_candidates", sa.Integer(), nullable=False),
+        sa.Column("scored_count", sa.Integer(), nullable=False),
+        sa.Column("score_sum", sa.Float(), nullable=False),
+        sa.Column("score_sum_squares", sa.Float(), nullable=False),
+        sa.Column("score_histogram", sa.JSON()),
+        sa.Column("count_a", sa.Integer(), nullable=False),
+        sa.Column("count_b", sa.Integer(), nullable=False),
+        sa.Column("count_c", sa.Integer(), nullable=False),
+        sa.Column("count_d", sa.Integer(), nullable=False),
+        sa.Column("skill_counts", sa.JSON()),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("job_statistics")
@@ -0,0 +1,70 @@
+"""Index de classement des candidats sur coalesce(cv_score, 0)
+
+Les listes par offre (/by-job, /ranking, export), le rang et le percentile
+trient et comparent Candidate.ranking_score (cv_score absent compté comme
+0) : une clé de pagination jamais NULL, dans le même ordre sur PostgreSQL
+(NULL en tête d'un tri décroissant) et SQLite. L'index (job_offer_id,
+cv_score DESC) est remplacé par l'index sur cette expression.
+
+Revision ID: f4a9b2c6e813
+Revises: e2c8a4f6d175
+Create Date: 2026-10-18 09:00:00
+
+"""
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a9b2c6e813'
+down_revision: Union[str, None] = 'e2c8a4f6d175'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+OLD_INDEX = ("ix_candidates_job_offer_score", ["job_offer_id", sa.text("cv_score DESC")])
+NEW_INDEX = ("ix_candidates_job_offer_ranking", ["job_offer_id", sa.text("coalesce(cv_score, 0) DESC")])
+
+
+def _existing_indexes(table: str) -> Optional[set]:
+    """Noms des index de la table (None si la table n'existe pas encore)"""
+    if op.get_context().as_sql:
+        # Mode --sql : pas de base à inspecter, le script contient tout
+        return set()
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table(table):
+        return None
+    if bind.dialect.name == "sqlite":
+        # L'inspecteur SQLite ignore les index sur expression
+        rows = bind.execute(
+            sa.text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"),
+            {"table": table}
+        )
+        return {row[0] for row in rows}
+    return {index["name"] for index in inspector.get_indexes(table)}
+
+
+def _replace_index(drop: tuple, create: tuple) -> None:
+    existing = _existing_indexes("candidates")
+    if existing is None:
+        # Table absente (créée complète par init_db)
+        return
+
+    name, columns = create
+    if name not in existing:
+        op.create_index(name, "candidates", columns)
+
+    name, _ = drop
+    if name in existing or op.get_context().as_sql:
+        op.drop_index(name, table_name="candidates")
+
+
+def upgrade() -> None:
+    _replace_index(drop=OLD_INDEX, create=NEW_INDEX)
+
+
+def downgrade() -> None:
+    _replace_index(drop=NEW_INDEX, create=OLD_INDEX)
@@ -2,40 +2,42 @@
 Routes API pour la gestion des candidats et analyse de CV
 """
 
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, BackgroundTasks, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, BackgroundTasks, Query, Response
+from sqlalchemy.orm import Session, load_only, undefer, undefer_group
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 from datetime import datetime
-import shutil
+import zipfile
 from pathlib import Path
 import logging
 
-from app.database import get_db
-from app.models.candidate import Candidate
+from app.config import get_settings
+from app.database import get_db, SessionLocal
+from app.models.candidate import Candidate, LISTING_COLUMNS
 from app.models.job_offer import JobOffer
-from app.modules.cv_analyzer import CVParser, CVMatcher
-from app.modules.cv_analyzer.scorer import CVScorer
-from app.modules.cv_analyzer.extractor_ml import CVExtractorML
+from app.api.pagination import paginate
 from app.modules.cv_analyzer.statistics import RecruitmentStats
-from app.modules.cv_analyzer.excel_exporter import ExcelExporter
+from app.modules.cv_analyzer import batch_processor, cv_store, export_jobs
+from app.modules.cv_analyzer.offload import run_cpu_bound
+from app.modules.cv_analyzer.analysis_cache import get_cached_analysis, set_cached_analysis
+from app.modules.cv_analyzer.search_index import chunk_text
+from app.modules.model_registry import ModelRegistry, get_model_registry
 
 from app.modules.cv_analyzer.improved_analyzer import ImprovedCVAnalyzer
 from pydantic import BaseModel, EmailStr
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 router = APIRouter()
 
-# Initialiser les modules NLP
-cv_parser = CVParser()
-cv_extractor = CVExtractorML(custom_model_path="models/skill_ner_v2")
-cv_matcher = CVMatcher(use_bert=True)
-cv_scorer = CVScorer()
-excel_exporter = ExcelExporter()
+# Les modules NLP (parser, extracteur, matcher, analyseurs...) sont partagés
+# via le registre des modèles, chargé au démarrage : Depends(get_model_registry)
 
 # Dossier pour stocker les CVs
 UPLOAD_DIR = Path("data/uploads/cvs")
+EXPORT_BATCH_SIZE = 1000  # Candidats lus par paquet lors des exports
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 
@@ -69,13 +71,22 @@ class CandidateListResponse(BaseModel):
     id: int
     name: Optional[str] = "Nom non trouvé"
     email: Optional[str]
-    cv_score: float
+    cv_score: Optional[float]
     final_score: float
     application_status: str
     applied_at: datetime
     recommendation: str
 
 
+class BatchUploadResponse(BaseModel):
+    """Réponse après upload d'un lot de CVs"""
+    batch_id: str
+    job_offer_id: int
+    total_files: int
+    status: str
+    message: str
+
+
 class CandidateRankingResponse(BaseModel):
     """Classement des candidats"""
     candidate_id: int
@@ -83,31 +94,160 @@ class CandidateRankingResponse(BaseModel):
     name: Optional[str]
     email: Optional[str]
     final_score: float
-    cv_score: float
+    cv_score: Optional[float]
     category: str
     recommendation: str
 
 
+# ============ Helpers ============
+
+def _analyze_improved(
+    analyzer: ImprovedCVAnalyzer,
+    cv_text: str,
+    job_requirements: dict,
+    extracted_data: Optional[dict] = None
+) -> dict:
+    """
+    Analyse un CV avec ImprovedCVAnalyzer, en passant par le cache d'analyses
+    (clé : contenu du CV + exigences de l'offre + version de l'analyseur)
+    
+    Si les données extraites sont déjà connues (cv_blobs), seul le scoring
+    par rapport à l'offre est calculé.
+    """
+    analysis = get_cached_analysis(cv_text, job_requirements)
+    if analysis is not None:
+        return analysis
+    
+    if extracted_data is not None:
+        analysis = analyzer.score(extracted_data, job_requirements)
+    else:
+        analysis = run_cpu_bound(analyzer.analyze, cv_text, job_requirements)
+    set_cached_analysis(cv_text, job_requirements, analysis)
+    
+    return analysis
+
+
+def _build_candidate(
+    extracted_data: dict,
+    cv_text: str,
+    cv_filename: str,
+    cv_score: float,
+    score_breakdown: dict,
+    job_offer_id: int,
+    fallback_email: str
+) -> Candidate:
+    """Construit un Candidate à partir des données extraites du CV"""
+    contact = extracted_data.get('contact', {})
+    name = contact.get('name')
+    
+    return Candidate(
+        first_name=name.split()[0] if name else "Prénom",
+        last_name=name.split()[-1] if name else "Nom",
+        email=contact.get('email') or fallback_email,
+        phone=contact.get('phone'),
+        cv_filename=cv_filename,
+        cv_text=cv_text,
+        extracted_data=extracted_data,
+        cv_score=cv_score,
+        score_breakdown=score_breakdown,
+        job_offer_id=job_offer_id
+    )
+
+
+def _check_upload_size(upload: UploadFile):
+    """
+    Refuse (413) un fichier dont la taille est déjà connue et dépasse
+    settings.max_upload_size_mb, avant de le copier
+    (la limite est de toute façon appliquée pendant la copie)
+    """
+    if upload.size is not None and upload.size > cv_store.max_upload_bytes():
+        raise HTTPException(
+            status_code=413,
+            detail=f"{upload.filename} : fichier trop volumineux (maximum {settings.max_upload_size_mb} Mo)"
+        )
+
+
+def _check_batch_limits(total_bytes: int, total_files: int):
+    """
+    Refuse (413) un lot dont les PDF (archives décompressées) dépassent
+    settings.max_batch_extracted_size_mb ou settings.max_batch_files
+    """
+    if total_bytes > settings.max_batch_extracted_size_mb * 1024 * 1024:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Lot trop volumineux une fois décompressé "
+                   f"(maximum {settings.max_batch_extracted_size_mb} Mo)"
+        )
+    if total_files > settings.max_batch_files:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Lot trop grand (maximum {settings.max_batch_files} PDF)"
+        )
+
+
+def _zip_pdf_members(archive: zipfile.ZipFile) -> List[zipfile.ZipInfo]:
+    """Fichiers PDF d'une archive ZIP (dossiers ignorés)"""
+    return [
+        member for member in archive.infolist()
+        if not member.is_dir() and Path(member.filename).name.lower().endswith('.pdf')
+    ]
+
+
+def _index_candidates(models: ModelRegistry, items: List[tuple]):
+    """
+    Ajoute des CVs à l'index de recherche sémantique (tâche de fond)
+    Une erreur d'indexation ne doit pas faire échouer l'upload
+    
+    Args:
+        items: (candidate_id, cv_text)
+    """
+    try:
+        search_index = models.search_index
+        if search_index is not None and items:
+            search_index.add_candidates(items)
+    except Exception as e:
+        logger.error(f"❌ Erreur d'indexation pour la recherche : {e}", exc_info=True)
+
+
+def _unindex_candidates(models: ModelRegistry, candidate_ids: List[int]):
+    """
+    Retire des candidats supprimés de l'index de recherche sémantique
+    Une erreur n'empêche pas la suppression (search_candidates ignore les
+    candidats absents de la base)
+    """
+    try:
+        search_index = models.search_index
+        if search_index is not None and candidate_ids:
+            search_index.remove_candidates(candidate_ids)
+    except Exception as e:
+        logger.error(f"❌ Erreur de désindexation pour la recherche : {e}", exc_info=True)
+
+
 # ============ Routes d'Upload et Analyse ============
 
 @router.post("/upload-cv", response_model=CandidateUploadResponse, status_code=201)
-async def upload_and_analyze_cv(
+def upload_and_analyze_cv(
     job_offer_id: int,
+    background_tasks: BackgroundTasks,
     cv_file: UploadFile = File(...),
     use_improved: bool = Query(True, description="Utiliser le nouvel analyseur (True) ou l'ancien (False)"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    models: ModelRegistry = Depends(get_model_registry)
 ):
     """
     📤 Upload et analyse d'un CV
     
     Cette route :
-    1. Sauvegarde le fichier PDF
+    1. Sauvegarde le fichier PDF (une seule copie par contenu : {sha256}.pdf)
     2. Extrait le texte avec pdfplumber
     3. Extrait les données (NLP)
     4. Match avec l'offre d'emploi
     5. Calcule le score
     6. Sauvegarde le candidat en base
     
+    Les étapes 2 et 3 sont sautées si le même fichier a déjà été envoyé
+    (table cv_blobs) : seul le score propre à l'offre est recalculé.
+    
     Args:
         job_offer_id: ID de l'offre d'emploi
         cv_file: Fichier PDF du CV
@@ -127,37 +267,38 @@ async def upload_and_analyze_cv(
     if not job_offer:
         raise HTTPException(status_code=404, detail=f"Offre d'emploi #{job_offer_id} introuvable")
     
-    # ========== 2. Vérifier que c'est un PDF ==========
+    # ========== 2. Vérifier que c'est un PDF (et sa taille) ==========
     if not cv_file.filename.endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Le fichier doit être un PDF")
+    _check_upload_size(cv_file)
     
+    stored = None
     try:
         # ========== 3. Sauvegarder le fichier ==========
+        # Copie par blocs : limite de taille et sha256 pendant la copie,
+        # contenu gardé en mémoire pour le parser (pas de relecture du disque)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_filename = f"{timestamp}_{cv_file.filename}"
-        file_path = UPLOAD_DIR / safe_filename
-        
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(cv_file.file, buffer)
+        stored = cv_store.save_upload(cv_file.file, UPLOAD_DIR, keep_content=True)
+        sha256, safe_filename, size_bytes, content = stored.sha256, stored.filename, stored.size_bytes, stored.content
+        blob = cv_store.get_blobs(db, [sha256]).get(sha256)
+        cached_extraction = cv_store.cached_extraction(blob)
         
         logger.info(f"✅ CV sauvegardé : {safe_filename}")
         
         # ========== 4. Extraire le texte du PDF ==========
-        cv_text = cv_parser.extract_text_from_pdf(str(file_path))
-        logger.info(f"📄 Texte extrait : {len(cv_text)} caractères")
+        if blob is not None and blob.cv_text is not None:
+            cv_text = blob.cv_text
+            logger.info(f"♻️  CV déjà analysé : texte réutilisé ({len(cv_text)} caractères)")
+        else:
+            cv_text = run_cpu_bound(models.cv_parser.extract_text_from_pdf, content)
+            logger.info(f"📄 Texte extrait : {len(cv_text)} caractères")
         
         # ========== 5. Analyser selon la méthode choisie ==========
         if use_improved:
             # NOUVEAU ANALYSEUR
-            from app.modules.cv_analyzer.improved_analyzer import ImprovedCVAnalyzer
-            
-            analyzer = ImprovedCVAnalyzer()
-            analysis = analyzer.analyze(cv_text, {
-                "required_skills": job_offer.required_skills or [],
-                "nice_to_have_skills": job_offer.nice_to_have_skills or [],
-                "experience_min_years": job_offer.experience_min_years or 0,
-                "education_level": job_offer.education_level or ""
-            })
+            analysis = _analyze_improved(
+                models.improved_analyzer, cv_text, job_offer.to_requirements(), cached_extraction
+            )
             
             extracted_data = analysis["extracted_data"]
             cv_score = analysis["cv_score"]
@@ -167,22 +308,23 @@ async def upload_and_analyze_cv(
         
         else:
             # ANCIEN ANALYSEUR
-            extracted_data = cv_extractor.extract_all(cv_text)
+            extracted_data = run_cpu_bound(models.cv_extractor.extract_all, cv_text)
             logger.info(f"🧠 Données extraites : {len(extracted_data['skills'])} compétences")
             
-            skills_match = cv_matcher.match_skills(
+            skills_match = run_cpu_bound(
+                models.cv_matcher.match_skills,
                 cv_skills=extracted_data['skills'],
                 required_skills=job_offer.required_skills or [],
                 threshold=0.7
             )
             
-            experience_match = cv_matcher.match_experience(
+            experience_match = models.cv_matcher.match_experience(
                 cv_years=extracted_data['experience_years'],
                 required_min_years=job_offer.experience_min_years or 0,
                 required_max_years=job_offer.experience_max_years
             )
             
-            score_result = cv_scorer.calculate_final_score(
+            score_result = models.cv_scorer.calculate_final_score(
                 skills_match=skills_match,
                 experience_match=experience_match,
                 education=extracted_data['education'],
@@ -194,26 +336,38 @@ async def upload_and_analyze_cv(
             
             logger.info(f"📊 Ancien analyseur - Score: {cv_score}")
         
+        # Texte et données extraites réutilisables par les prochains envois du fichier
+        if blob is None or (use_improved and cached_extraction is None):
+            cv_store.save_blob(
+                db, sha256, size_bytes, cv_text,
+                extracted_data=extracted_data if use_improved else None,
+                original_filename=cv_file.filename
+            )
+        
         # ========== 6. Créer le candidat en base ==========
-        new_candidate = Candidate(
-            first_name=extracted_data['contact']['name'].split()[0] if extracted_data.get('contact', {}).get('name') else "Prénom",
-            last_name=extracted_data['contact']['name'].split()[-1] if extracted_data.get('contact', {}).get('name') else "Nom",
-            email=extracted_data.get('contact', {}).get('email') or f"candidate_{timestamp}@temp.com",
-            phone=extracted_data.get('contact', {}).get('phone'),
-            cv_filename=safe_filename,
-            cv_text=cv_text,
+        new_candidate = _build_candidate(
             extracted_data=extracted_data,
+            cv_text=cv_text,
+            cv_filename=safe_filename,
             cv_score=cv_score,
             score_breakdown=score_breakdown,
-            job_offer_id=job_offer_id
+            job_offer_id=job_offer_id,
+            fallback_email=f"candidate_{timestamp}@temp.com"
         )
         
         db.add(new_candidate)
+        db.flush()
+        RecruitmentStats.record_candidates(db, [new_candidate])
         db.commit()
+        # Fichier remis en place s'il a été supprimé depuis la sauvegarde
+        # (dernier candidat du même CV supprimé entre-temps)
+        cv_store.finalize_upload(stored, UPLOAD_DIR)
         db.refresh(new_candidate)
         
         logger.info(f"✅ Candidat créé : ID #{new_candidate.id}")
         
+        background_tasks.add_task(_index_candidates, models, [(new_candidate.id, cv_text)])
+        
         return CandidateUploadResponse(
             candidate_id=new_candidate.id,
             name=extracted_data.get('contact', {}).get('name'),
@@ -223,18 +377,398 @@ async def upload_and_analyze_cv(
             message=f"CV analysé avec succès. Score: {cv_score}/100 ({'Improved' if use_improved else 'Standard'})"
         )
     
+    except cv_store.UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    
     except Exception as e:
         logger.error(f"❌ Erreur lors de l'analyse : {e}", exc_info=True)
+        db.rollback()
         raise HTTPException(status_code=500, detail=f"Erreur lors de l'analyse du CV : {str(e)}")
+    
+    finally:
+        # Sans effet si le candidat a été validé
+        if stored is not None:
+            cv_store.discard_upload(db, stored, UPLOAD_DIR)
+
+
+@router.post("/upload-batch", response_model=BatchUploadResponse, status_code=202)
+def upload_cv_batch(
+    job_offer_id: int,
+    background_tasks: BackgroundTasks,
+    files: List[UploadFile] = File(...),
+    db: Session = Depends(get_db),
+    models: ModelRegistry = Depends(get_model_registry)
+):
+    """
+    📦 Upload d'un lot de CVs (plusieurs PDF et/ou archives ZIP)
+    
+    Les fichiers sont sauvegardés puis analysés en arrière-plan dans un
+    pool de processus (taille : settings.max_workers). Les candidats sont
+    insérés par paquets avec bulk_save_objects. Un fichier déjà envoyé
+    (table cv_blobs) n'est pas ré-analysé : seul son score est recalculé.
+    
+    Args:
+        job_offer_id: ID de l'offre d'emploi
+        files: Fichiers PDF ou archives ZIP contenant des PDF
+    
+    Returns:
+        BatchUploadResponse: Identifiant du lot à suivre avec GET /batch/{batch_id}
+    
+    Example:
+        curl -X POST "http://localhost:8000/api/candidates/upload-batch?job_offer_id=1" \
+             -F "files=@cv1.pdf" -F "files=@cvs.zip"
+    """
+    logger.info(f"📦 Upload d'un lot de {len(files)} fichier(s) pour offre #{job_offer_id}")
+    
+    job_offer = db.query(JobOffer).filter(JobOffer.id == job_offer_id).first()
+    if not job_offer:
+        raise HTTPException(status_code=404, detail=f"Offre d'emploi #{job_offer_id} introuvable")
+    
+    # Formats, tailles connues (PDF, membres des archives), taille totale
+    # décompressée et nombre de PDF vérifiés avant toute écriture sur disque
+    max_total_bytes = settings.max_batch_extracted_size_mb * 1024 * 1024
+    total_bytes = 0
+    total_files = 0
+    
+    for upload in files:
+        filename = upload.filename or ""
+        
+        if filename.lower().endswith('.pdf'):
+            _check_upload_size(upload)
+            total_bytes += upload.size or 0
+            total_files += 1
+        
+        elif filename.lower().endswith('.zip'):
+            try:
+                with zipfile.ZipFile(upload.file) as archive:
+                    for member in _zip_pdf_members(archive):
+                        if member.file_size > cv_store.max_upload_bytes():
+                            raise HTTPException(
+                                status_code=413,
+                                detail=f"{Path(member.filename).name} : fichier trop volumineux "
+                                       f"(maximum {settings.max_upload_size_mb} Mo)"
+                            )
+                        total_bytes += member.file_size
+                        total_files += 1
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail=f"Archive ZIP invalide : {filename}")
+            upload.file.seek(0)
+        
+        else:
+            raise HTTPException(status_code=400, detail=f"Format non supporté : {filename} (PDF ou ZIP attendu)")
+        
+        _check_batch_limits(total_bytes, total_files)
+    
+    # (fichier stocké, nom d'origine)
+    saved_files = []
+    written_bytes = 0
+    
+    def save(source, original_name: str):
+        nonlocal written_bytes
+        # Tailles déclarées revérifiées pendant la copie : par fichier et pour le lot
+        remaining = max_total_bytes - written_bytes
+        try:
+            stored = cv_store.save_upload(
+                source, UPLOAD_DIR, max_bytes=min(cv_store.max_upload_bytes(), remaining)
+            )
+        except cv_store.UploadTooLargeError:
+            if remaining < cv_store.max_upload_bytes():
+                raise cv_store.UploadTooLargeError(
+                    f"Lot trop volumineux une fois décompressé "
+                    f"(maximum {settings.max_batch_extracted_size_mb} Mo)"
+                )
+            raise
+        written_bytes += stored.size_bytes
+        saved_files.append((stored, original_name))
+    
+    try:
+        for upload in files:
+            filename = upload.filename or ""
+            
+            if filename.lower().endswith('.pdf'):
+                save(upload.file, Path(filename).name)
+            
+            else:
+                with zipfile.ZipFile(upload.file) as archive:
+                    for member in _zip_pdf_members(archive):
+                        with archive.open(member) as source:
+                            save(source, Path(member.filename).name)
+    except cv_store.UploadTooLargeError as e:
+        # Copies supprimées, et fichiers créés par ce lot s'ils ne sont pas partagés
+        for stored, _ in saved_files:
+            cv_store.discard_upload(db, stored, UPLOAD_DIR)
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    if not saved_files:
+        raise HTTPException(status_code=400, detail="Aucun PDF trouvé dans les fichiers envoyés")
+    
+    batch_id = batch_processor.create_batch(job_offer_id, len(saved_files))
+    background_tasks.add_task(
+        _process_cv_batch,
+        batch_id,
+        job_offer_id,
+        saved_files,
+        job_offer.to_requirements(),
+        models
+    )
+    
+    logger.info(f"✅ Lot {batch_id} : {len(saved_files)} CVs en file d'analyse")
+    
+    return BatchUploadResponse(
+        batch_id=batch_id,
+        job_offer_id=job_offer_id,
+        total_files=len(saved_files),
+        status="pending",
+        message=f"{len(saved_files)} CVs en cours d'analyse"
+    )
+
+
+@router.get("/batch/{batch_id}")
+async def get_batch_status(batch_id: str):
+    """
+    📦 Suivi d'un lot de CVs
+    
+    Args:
+        batch_id: Identifiant retourné par POST /upload-batch
+    
+    Returns:
+        dict: Statut, fichiers traités, candidats créés, erreurs
+    """
+    batch = batch_processor.get_batch(batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail=f"Lot {batch_id} introuvable")
+    
+    return batch
+
+
+def _process_cv_batch(
+    batch_id: str,
+    job_offer_id: int,
+    saved_files: List[tuple],
+    job_requirements: dict,
+    models: ModelRegistry
+):
+    """
+    Analyse un lot de CVs dans le pool de processus et insère les candidats
+    
+    Exécuté en tâche de fond (thread), avec sa propre session DB.
+    Seuls les contenus sans extraction enregistrée (cv_blobs) partent dans
+    le pool, une fois chacun ; les autres sont seulement scorés. Les copies
+    des fichiers sont remises en place après l'insertion de chaque paquet.
+    
+    Args:
+        saved_files: (fichier stocké, nom d'origine)
+    """
+    batch_processor.update_batch(batch_id, status="processing")
+    pool = batch_processor.get_process_pool()
+    chunk_size = settings.max_workers * settings.batch_size
+    db = SessionLocal()
+    
+    try:
+        for chunk_index, chunk in enumerate(batch_processor.iter_chunks(saved_files, chunk_size)):
+            blobs = cv_store.get_blobs(db, [stored.sha256 for stored, _ in chunk])
+            # Contenus à analyser : la copie du premier envoi de chacun
+            to_parse = {}
+            for stored, _ in chunk:
+                if cv_store.cached_extraction(blobs.get(stored.sha256)) is None:
+                    to_parse.setdefault(stored.filename, stored.hold_path)
+            results = pool.map(
+                batch_processor.analyze_cv_file,
+                list(to_parse.values()),
+                [job_requirements] * len(to_parse)
+            )
+            parsed = dict(zip(to_parse, results))
+            
+            candidates = []
+            errors = []
+            saved_blobs = set()  # contenus enregistrés dans cv_blobs pendant ce paquet
+            for offset, (stored, original_filename) in enumerate(chunk):
+                filename, sha256, size_bytes = stored.filename, stored.sha256, stored.size_bytes
+                if filename in parsed:
+                    result = parsed[filename]
+                    if "error" in result:
+                        errors.append({"file": original_filename, "error": result["error"]})
+                        continue
+                    cv_text = result["cv_text"]
+                    analysis = result["analysis"]
+                    if sha256 not in saved_blobs:
+                        cv_store.save_blob(
+                            db, sha256, size_bytes, cv_text,
+                            extracted_data=analysis["extracted_data"],
+                            original_filename=original_filename
+                        )
+                        saved_blobs.add(sha256)
+                else:
+                    blob = blobs[sha256]
+                    cv_text = blob.cv_text
+                    analysis = _analyze_improved(models.improved_analyzer, cv_text, job_requirements, blob.extracted_data)
+                
+                candidates.append(_build_candidate(
+                    extracted_data=analysis["extracted_data"],
+                    cv_text=cv_text,
+                    cv_filename=filename,
+                    cv_score=analysis["cv_score"],
+                    score_breakdown=analysis["score_breakdown"],
+                    job_offer_id=job_offer_id,
+                    fallback_email=f"candidate_{batch_id[:8]}_{chunk_index * chunk_size + offset}@temp.com"
+                ))
+            
+            inserted, insert_errors = _bulk_insert_candidates(db, candidates)
+            errors.extend(insert_errors)
+            for stored, _ in chunk:
+                cv_store.finalize_upload(stored, UPLOAD_DIR)
+            
+            # Seuls les candidats insérés par ce paquet sont indexés (pas ceux
+            # qui possédaient déjà l'email en cas de doublon)
+            if inserted:
+                _index_candidates(models, [(c.id, c.cv_text) for c in inserted])
+            
+            batch_processor.update_batch(
+                batch_id,
+                processed=len(chunk),
+                created=len(inserted),
+                failed=len(errors),
+                errors=errors
+            )
+        
+        batch_processor.update_batch(batch_id, status="completed", completed_at=datetime.now().isoformat())
+        logger.info(f"✅ Lot {batch_id} terminé")
+    
+    except Exception as e:
+        logger.error(f"❌ Erreur lors du traitement du lot {batch_id} : {e}", exc_info=True)
+        batch_processor.update_batch(
+            batch_id,
+            status="failed",
+            completed_at=datetime.now().isoformat(),
+            errors=[{"file": None, "error": str(e)}]
+        )
+        db.rollback()
+    finally:
+        # Copies des paquets non insérés (sans effet sur les autres)
+        for stored, _ in saved_files:
+            cv_store.discard_upload(db, stored, UPLOAD_DIR)
+        db.close()
+
+
+def _bulk_insert_candidates(db: Session, candidates: List[Candidate]):
+    """
+    Insère les candidats avec bulk_save_objects (et met à jour les
+    statistiques de l'offre dans la même transaction)
+    En cas de conflit (email déjà existant), réessaie un par un
+    
+    Returns:
+        tuple: (candidats insérés, ids renseignés ; liste des erreurs)
+    """
+    if not candidates:
+        return [], []
+    
+    try:
+        db.bulk_save_objects(candidates, return_defaults=True)
+        RecruitmentStats.record_candidates(db, candidates)
+        db.commit()
+        return candidates, []
+    except IntegrityError:
+        db.rollback()
+    
+    inserted = []
+    errors = []
+    for candidate in candidates:
+        candidate.id = None  # Éventuellement renseigné par l'insertion annulée
+        try:
+            db.add(candidate)
+            db.flush()
+            RecruitmentStats.record_candidates(db, [candidate])
+            db.commit()
+            inserted.append(candidate)
+        except IntegrityError as e:
+            db.rollback()
+            errors.append({"file": candidate.cv_filename, "error": f"Candidat en double : {e.orig}"})
+    
+    return inserted, errors
+
+
+# ============ Recherche sémantique ============
+
+@router.get("/search")
+def search_candidates(
+    q: str = Query(..., min_length=2, description="Recherche libre (ex: streaming Kafka)"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    models: ModelRegistry = Depends(get_model_registry)
+):
+    """
+    🔎 Recherche sémantique dans les CVs de tous les candidats
+    
+    La requête est comparée aux passages des CVs indexés (index IVF sur les
+    embeddings BERT), sans parcourir la base.
+    
+    Args:
+        q: Texte recherché
+        limit: Nombre maximum de candidats
+    
+    Returns:
+        dict: Candidats triés par similarité, avec le passage le plus proche
+    
+    Example:
+        curl "http://localhost:8000/api/candidates/search?q=streaming%20Kafka"
+    """
+    search_index = models.search_index
+    if search_index is None:
+        raise HTTPException(status_code=503, detail="Recherche sémantique indisponible (sentence-transformers non installé)")
+    
+    hits = run_cpu_bound(search_index.search, q, top_k=limit)
+    candidates = _candidates_by_id(db, [hit["candidate_id"] for hit in hits])
+    
+    # Candidats supprimés encore indexés (suppression avant la
+    # désindexation) : retirés de l'index puis recherche relancée
+    missing = [hit["candidate_id"] for hit in hits if hit["candidate_id"] not in candidates]
+    if missing:
+        run_cpu_bound(search_index.remove_candidates, missing)
+        hits = run_cpu_bound(search_index.search, q, top_k=limit)
+        candidates = _candidates_by_id(db, [hit["candidate_id"] for hit in hits])
+    
+    results = []
+    for hit in hits:
+        candidate = candidates.get(hit["candidate_id"])
+        if candidate is None:
+            # Candidat supprimé depuis son indexation
+            continue
+        
+        chunks = chunk_text(candidate.cv_text)
+        results.append({
+            "candidate_id": candidate.id,
+            "name": f"{candidate.first_name} {candidate.last_name}",
+            "email": candidate.email,
+            "job_offer_id": candidate.job_offer_id,
+            "cv_score": candidate.cv_score,
+            "similarity": round(hit["score"], 4),
+            "excerpt": chunks[hit["chunk_index"]] if hit["chunk_index"] < len(chunks) else ""
+        })
+    
+    return {
+        "query": q,
+        "total": len(results),
+        "results": results
+    }
+
+
+def _candidates_by_id(db: Session, candidate_ids: List[int]) -> dict:
+    """Candidats (avec le texte du CV) indexés par id"""
+    return {
+        c.id: c for c in db.query(Candidate).options(undefer_group("cv_content")).filter(
+            Candidate.id.in_(candidate_ids)
+        ).all()
+    }
 
 
 # ============ Routes d'Analyse ============
 
 @router.get("/{candidate_id}/analysis", response_model=CandidateAnalysisResponse)
-async def get_candidate_analysis(
+def get_candidate_analysis(
     candidate_id: int,
     use_improved: bool = Query(False, description="Utiliser le nouvel analyseur pour recalculer"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    models: ModelRegistry = Depends(get_model_registry)
 ):
     """
     📊 Récupère l'analyse complète d'un candidat
@@ -249,7 +783,7 @@ async def get_candidate_analysis(
     Example:
         GET /api/candidates/1/analysis?use_improved=true
     """
-    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+    candidate = db.query(Candidate).options(undefer_group("cv_content")).filter(Candidate.id == candidate_id).first()
     
     if not candidate:
         raise HTTPException(status_code=404, detail=f"Candidat #{candidate_id} introuvable")
@@ -260,15 +794,7 @@ async def get_candidate_analysis(
         if not job:
             raise HTTPException(status_code=404, detail="Offre d'emploi non trouvée")
         
-        from app.modules.cv_analyzer.improved_analyzer import ImprovedCVAnalyzer
-        
-        analyzer = ImprovedCVAnalyzer()
-        analysis = analyzer.analyze(candidate.cv_text, {
-            "required_skills": job.required_skills or [],
-            "nice_to_have_skills": job.nice_to_have_skills or [],
-            "experience_min_years": job.experience_min_years or 0,
-            "education_level": job.education_level or ""
-        })
+        analysis = _analyze_improved(models.improved_analyzer, candidate.cv_text, job.to_requirements())
         
         return CandidateAnalysisResponse(
             candidate_id=candidate.id,
@@ -297,9 +823,10 @@ async def get_candidate_analysis(
 
 
 @router.get("/{candidate_id}/analysis-improved", response_model=dict)
-async def get_improved_analysis(
+def get_improved_analysis(
     candidate_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    models: ModelRegistry = Depends(get_model_registry)
 ):
     """
     🆕 Analyse AMÉLIORÉE du CV avec matching réel
@@ -317,10 +844,8 @@ async def get_improved_analysis(
     Example:
         GET /api/candidates/1/analysis-improved
     """
-    from app.modules.cv_analyzer.improved_analyzer import ImprovedCVAnalyzer
-    
     # Récupérer le candidat
-    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+    candidate = db.query(Candidate).options(undefer_group("cv_content")).filter(Candidate.id == candidate_id).first()
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidat non trouvé")
     
@@ -330,13 +855,7 @@ async def get_improved_analysis(
         raise HTTPException(status_code=404, detail="Offre d'emploi non trouvée")
     
     # Analyser le CV avec le nouvel analyseur
-    analyzer = ImprovedCVAnalyzer()
-    analysis = analyzer.analyze(candidate.cv_text, {
-        "required_skills": job.required_skills or [],
-        "nice_to_have_skills": job.nice_to_have_skills or [],
-        "experience_min_years": job.experience_min_years or 0,
-        "education_level": job.education_level or ""
-    })
+    analysis = _analyze_improved(models.improved_analyzer, candidate.cv_text, job.to_requirements())
     
     return {
         "candidate_id": candidate.id,
@@ -350,9 +869,10 @@ async def get_improved_analysis(
 
 
 @router.get("/{candidate_id}/comparison", response_model=dict)
-async def compare_analyzers(
+def compare_analyzers(
     candidate_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    models: ModelRegistry = Depends(get_model_registry)
 ):
     """
     📊 Compare l'ancien et le nouveau analyseur
@@ -370,10 +890,8 @@ async def compare_analyzers(
     Example:
         GET /api/candidates/1/comparison
     """
-    from app.modules.cv_analyzer.improved_analyzer import ImprovedCVAnalyzer
-    
     # Récupérer le candidat
-    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+    candidate = db.query(Candidate).options(undefer_group("cv_content")).filter(Candidate.id == candidate_id).first()
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidat non trouvé")
     
@@ -391,13 +909,7 @@ async def compare_analyzers(
     }
     
     # Nouveau score (avec matching)
-    analyzer = ImprovedCVAnalyzer()
-    new_analysis = analyzer.analyze(candidate.cv_text, {
-        "required_skills": job.required_skills or [],
-        "nice_to_have_skills": job.nice_to_have_skills or [],
-        "experience_min_years": job.experience_min_years or 0,
-        "education_level": job.education_level or ""
-    })
+    new_analysis = _analyze_improved(models.improved_analyzer, candidate.cv_text, job.to_requirements())
     
     new_result = {
         "cv_score": new_analysis["cv_score"],
@@ -449,34 +961,43 @@ async def compare_analyzers(
 # ============ Routes de Liste et Recherche ============
 
 @router.get("/by-job/{job_id}", response_model=List[CandidateListResponse])
-async def get_candidates_by_job(
+def get_candidates_by_job(
     job_id: int,
-    skip: int = 0,
-    limit: int = 20,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=500),
     min_score: Optional[float] = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
     📋 Liste des candidats pour une offre d'emploi
     
+    Triés par score décroissant puis par id. La page suivante s'obtient
+    avec le curseur de l'en-tête X-Next-Cursor (absent sur la dernière page).
+    
     Args:
         job_id: ID de l'offre
-        skip: Nombre à ignorer (pagination)
+        skip: Nombre à ignorer (pagination par décalage, sans curseur)
         limit: Nombre maximum à retourner
         min_score: Score minimum (optionnel)
+        cursor: Curseur de la page suivante
     
     Returns:
         List[CandidateListResponse]: Liste des candidats
     
     Example:
         GET /api/candidates/by-job/1?min_score=65
+        GET /api/candidates/by-job/1?cursor=WzcxLjAsNDJd
     """
-    query = db.query(Candidate).filter(Candidate.job_offer_id == job_id)
+    query = db.query(Candidate).options(load_only(*LISTING_COLUMNS)).filter(Candidate.job_offer_id == job_id)
     
     if min_score:
-        query = query.filter(Candidate.cv_score >= min_score)
+        query = query.filter(Candidate.ranking_score >= min_score)
     
-    candidates = query.order_by(Candidate.cv_score.desc()).offset(skip).limit(limit).all()
+    candidates = paginate(
+        query, [(Candidate.ranking_score, True), (Candidate.id, False)], response, limit, cursor=cursor, skip=skip
+    )
     
     return [
         CandidateListResponse(
@@ -494,7 +1015,7 @@ async def get_candidates_by_job(
 
 
 @router.get("/ranking/{job_id}", response_model=List[CandidateRankingResponse])
-async def get_candidates_ranking(
+def get_candidates_ranking(
     job_id: int,
     top_n: int = 10,
     db: Session = Depends(get_db)
@@ -513,8 +1034,9 @@ async def get_candidates_ranking(
         GET /api/candidates/ranking/1?top_n=5
     """
     candidates = db.query(Candidate)\
+        .options(load_only(*LISTING_COLUMNS))\
         .filter(Candidate.job_offer_id == job_id)\
-        .order_by(Candidate.cv_score.desc())\
+        .order_by(Candidate.ranking_score.desc(), Candidate.id)\
         .limit(top_n)\
         .all()
     
@@ -526,7 +1048,7 @@ async def get_candidates_ranking(
             email=c.email,
             final_score=c.final_score,
             cv_score=c.cv_score,
-            category="A" if c.cv_score >= 80 else "B" if c.cv_score >= 65 else "C" if c.cv_score >= 50 else "D",
+            category="A" if c.ranking_score >= 80 else "B" if c.ranking_score >= 65 else "C" if c.ranking_score >= 50 else "D",
             recommendation=c.get_recommendation()
         )
         for idx, c in enumerate(candidates)
@@ -534,7 +1056,7 @@ async def get_candidates_ranking(
 
 
 @router.get("/{candidate_id}")
-async def get_candidate(
+def get_candidate(
     candidate_id: int,
     db: Session = Depends(get_db)
 ):
@@ -556,28 +1078,35 @@ async def get_candidate(
 
 
 @router.get("/")
-async def list_candidates(
-    skip: int = 0,
-    limit: int = 100,
+def list_candidates(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
     📋 Liste tous les candidats
     
+    Triés par id. La page suivante s'obtient avec le curseur de l'en-tête
+    X-Next-Cursor (absent sur la dernière page).
+    
     Args:
-        skip: Nombre à ignorer
+        skip: Nombre à ignorer (pagination par décalage, sans curseur)
         limit: Nombre maximum
+        cursor: Curseur de la page suivante
     
     Returns:
         List: Liste des candidats
     """
-    candidates = db.query(Candidate).offset(skip).limit(limit).all()
+    query = db.query(Candidate).options(load_only(*LISTING_COLUMNS))
+    candidates = paginate(query, [(Candidate.id, False)], response, limit, cursor=cursor, skip=skip)
     
     return [c.to_dict() for c in candidates]
 
 
 @router.put("/{candidate_id}")
-async def update_candidate(
+def update_candidate(
     candidate_id: int,
     data: dict,
     db: Session = Depends(get_db)
@@ -610,9 +1139,11 @@ async def update_candidate(
 
 
 @router.delete("/{candidate_id}")
-async def delete_candidate(
+def delete_candidate(
     candidate_id: int,
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    models: ModelRegistry = Depends(get_model_registry)
 ):
     """
     🗑️ Supprime un candidat
@@ -628,15 +1159,15 @@ async def delete_candidate(
     if not candidate:
         raise HTTPException(status_code=404, detail=f"Candidat #{candidate_id} introuvable")
     
-    # Supprimer le fichier CV
-    cv_path = UPLOAD_DIR / candidate.cv_filename
-    if cv_path.exists():
-        cv_path.unlink()
-        logger.info(f"🗑️ Fichier CV supprimé : {candidate.cv_filename}")
+    # Supprimer le fichier CV (sauf s'il sert à une autre candidature)
+    cv_store.release_file(db, candidate.cv_filename, UPLOAD_DIR, exclude_candidate_id=candidate.id)
     
+    RecruitmentStats.remove_candidate(db, candidate)
     db.delete(candidate)
     db.commit()
     
+    background_tasks.add_task(_unindex_candidates, models, [candidate_id])
+    
     return {
         "message": f"Candidat #{candidate_id} supprimé avec succès",
         "candidate_id": candidate_id
@@ -646,7 +1177,7 @@ async def delete_candidate(
 # ============ Routes de Statistiques ============
 
 @router.get("/stats/job/{job_id}")
-async def get_job_statistics(
+def get_job_statistics(
     job_id: int,
     db: Session = Depends(get_db)
 ):
@@ -684,7 +1215,7 @@ async def get_job_statistics(
 
 
 @router.get("/stats/comparison/{candidate_id}")
-async def compare_candidate(
+def compare_candidate(
     candidate_id: int,
     db: Session = Depends(get_db)
 ):
@@ -719,7 +1250,7 @@ async def compare_candidate(
 
 
 @router.get("/stats/global")
-async def get_global_statistics(db: Session = Depends(get_db)):
+def get_global_statistics(db: Session = Depends(get_db)):
     """
     📊 Statistiques globales du système
     
@@ -742,10 +1273,35 @@ async def get_global_statistics(db: Session = Depends(get_db)):
 
 # ============ Routes d'Export ============
 
+def _export_query(db: Session, job_id: int):
+    """
+    Candidats d'une offre pour l'export, lus par paquets (yield_per)
+    Seules les données extraites sont chargées en plus des colonnes de liste
+    """
+    return db.query(Candidate)\
+        .options(undefer(Candidate.extracted_data))\
+        .filter(Candidate.job_offer_id == job_id)\
+        .order_by(Candidate.ranking_score.desc(), Candidate.id)\
+        .yield_per(EXPORT_BATCH_SIZE)
+
+
+def _has_candidates(db: Session, job_id: int) -> bool:
+    return db.query(Candidate.id).filter(Candidate.job_offer_id == job_id).first() is not None
+
+
+def _excel_download(path: Path, job_title: str) -> FileResponse:
+    return FileResponse(
+        path=str(path),
+        filename=f"candidats_{job_title.replace(' ', '_')}.xlsx",
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+
+
 @router.get("/export/excel/{job_id}")
-async def export_candidates_to_excel(
+def export_candidates_to_excel(
     job_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    models: ModelRegistry = Depends(get_model_registry)
 ):
     """
     📥 Exporte les candidats en fichier Excel
@@ -757,6 +1313,9 @@ async def export_candidates_to_excel(
     - Graphiques de distribution
     - Formatage professionnel
     
+    Le fichier est réutilisé tant que les candidats de l'offre n'ont pas
+    changé. Pour les offres volumineuses, préférer POST /export/excel/{job_id}/async.
+    
     Args:
         job_id: ID de l'offre
     
@@ -771,33 +1330,222 @@ async def export_candidates_to_excel(
     if not job:
         raise HTTPException(status_code=404, detail=f"Offre #{job_id} introuvable")
     
-    # Récupérer les candidats
-    candidates = db.query(Candidate)\
-        .filter(Candidate.job_offer_id == job_id)\
-        .order_by(Candidate.cv_score.desc())\
-        .all()
-    
-    if not candidates:
+    if not _has_candidates(db, job_id):
         raise HTTPException(status_code=404, detail="Aucun candidat pour cette offre")
     
-    # Générer le fichier Excel
+    exporter = models.excel_exporter
+    fingerprint = export_jobs.export_fingerprint(db, job)
+    
+    filepath = export_jobs.find_cached_export(exporter.output_dir, job_id, fingerprint)
+    if filepath is not None:
+        logger.info(f"♻️  Export Excel réutilisé : {filepath}")
+        return _excel_download(filepath, job.title)
+    
+    # Générer le fichier Excel (candidats lus et écrits au fil de l'eau)
     try:
-        filepath = excel_exporter.export_candidates(candidates, job.title)
+        filepath = run_cpu_bound(
+            export_jobs.build_export, exporter, db, _export_query(db, job_id), job, fingerprint
+        )
         
         logger.info(f"✅ Export Excel généré : {filepath}")
         
-        return FileResponse(
-            path=filepath,
-            filename=Path(filepath).name,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
+        return _excel_download(filepath, job.title)
     except Exception as e:
         logger.error(f"❌ Erreur export Excel : {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Erreur lors de l'export : {str(e)}")
 
 
+@router.post("/export/excel/{job_id}/async", status_code=202)
+def start_excel_export(
+    job_id: int,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    models: ModelRegistry = Depends(get_model_registry)
+):
+    """
+    📥 Lance l'export Excel en tâche de fond
+    
+    Si les candidats de l'offre n'ont pas changé depuis le dernier export,
+    le fichier existant est réutilisé et l'export est immédiatement terminé.
+    
+    Args:
+        job_id: ID de l'offre
+    
+    Returns:
+        dict: Export à suivre avec GET /export/jobs/{export_id}
+    
+    Example:
+        curl -X POST "http://localhost:8000/api/candidates/export/excel/1/async"
+    """
+    job = db.query(JobOffer).filter(JobOffer.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Offre #{job_id} introuvable")
+    
+    if not _has_candidates(db, job_id):
+        raise HTTPException(status_code=404, detail="Aucun candidat pour cette offre")
+    
+    fingerprint = export_jobs.export_fingerprint(db, job)
+    export = export_jobs.create_export(job_id, fingerprint)
+    
+    if export["created"]:
+        filepath = export_jobs.find_cached_export(models.excel_exporter.output_dir, job_id, fingerprint)
+        if filepath is not None:
+            export_jobs.update_export(
+                export["export_id"],
+                status="completed",
+                cached=True,
+                filename=filepath.name,
+                completed_at=datetime.now().isoformat()
+            )
+        else:
+            background_tasks.add_task(_run_excel_export, export["export_id"], job_id, fingerprint, models)
+            logger.info(f"📤 Export {export['export_id']} en file pour offre #{job_id}")
+    
+    return _export_status(export["export_id"])
+
+
+@router.get("/export/jobs/{export_id}")
+def get_export_status(export_id: str):
+    """
+    📥 Suivi d'un export Excel
+    
+    Args:
+        export_id: Identifiant retourné par POST /export/excel/{job_id}/async
+    
+    Returns:
+        dict: Statut de l'export (download_url une fois terminé)
+    """
+    return _export_status(export_id)
+
+
+@router.get("/export/jobs/{export_id}/download")
+def download_export(
+    export_id: str,
+    db: Session = Depends(get_db),
+    models: ModelRegistry = Depends(get_model_registry)
+):
+    """
+    📥 Télécharge le fichier d'un export terminé
+    
+    Args:
+        export_id: Identifiant de l'export
+    
+    Returns:
+        FileResponse: Fichier Excel
+    """
+    export = export_jobs.get_export(export_id)
+    if not export:
+        raise HTTPException(status_code=404, detail=f"Export {export_id} introuvable")
+    
+    if export["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Export non disponible (statut : {export['status']})")
+    
+    filepath = Path(models.excel_exporter.output_dir) / export["filename"]
+    if not filepath.exists():
+        raise HTTPException(status_code=410, detail="Fichier d'export expiré, relancer l'export")
+    
+    job = db.query(JobOffer).filter(JobOffer.id == export["job_offer_id"]).first()
+    return _excel_download(filepath, job.title if job else f"offre_{export['job_offer_id']}")
+
+
+def _export_status(export_id: str) -> dict:
+    export = export_jobs.get_export(export_id)
+    if not export:
+        raise HTTPException(status_code=404, detail=f"Export {export_id} introuvable")
+    
+    export.pop("fingerprint", None)
+    export["download_url"] = (
+        f"/api/candidates/export/jobs/{export_id}/download" if export["status"] == "completed" else None
+    )
+    return export
+
+
+def _run_excel_export(export_id: str, job_id: int, fingerprint: str, models: ModelRegistry):
+    """
+    Génère un export Excel dans le cache
+    
+    Exécuté en tâche de fond (thread), avec sa propre session DB.
+    """
+    export_jobs.update_export(export_id, status="processing")
+    db = SessionLocal()
+    
+    try:
+        job = db.query(JobOffer).filter(JobOffer.id == job_id).first()
+        if not job:
+            raise ValueError(f"Offre #{job_id} introuvable")
+        
+        filepath = export_jobs.build_export(models.excel_exporter, db, _export_query(db, job_id), job, fingerprint)
+        
+        export_jobs.update_export(
+            export_id,
+            status="completed",
+            filename=filepath.name,
+            completed_at=datetime.now().isoformat()
+        )
+        logger.info(f"✅ Export {export_id} terminé : {filepath.name}")
+    
+    except Exception as e:
+        logger.error(f"❌ Erreur lors de l'export {export_id} : {e}", exc_info=True)
+        export_jobs.update_export(
+            export_id,
+            status="failed",
+            error=str(e),
+            completed_at=datetime.now().isoformat()
+        )
+    finally:
+        db.close()
+
+
+@router.get("/export/csv/{job_id}")
+def export_candidates_to_csv(
+    job_id: int,
+    db: Session = Depends(get_db),
+    models: ModelRegistry = Depends(get_model_registry)
+):
+    """
+    📥 Exporte les candidats en CSV (réponse en flux)
+    
+    Mêmes colonnes que la feuille Candidats de l'export Excel. Le fichier
+    est envoyé au fur et à mesure de la lecture en base : aucun fichier
+    intermédiaire, mémoire constante quel que soit le nombre de candidats.
+    
+    Args:
+        job_id: ID de l'offre
+    
+    Returns:
+        StreamingResponse: Fichier CSV à télécharger
+    
+    Example:
+        GET /api/candidates/export/csv/1
+    """
+    job = db.query(JobOffer).filter(JobOffer.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Offre #{job_id} introuvable")
+    
+    if not _has_candidates(db, job_id):
+        raise HTTPException(status_code=404, detail="Aucun candidat pour cette offre")
+    
+    exporter = models.excel_exporter
+    
+    def csv_chunks():
+        # Session propre au flux : celle de la requête est fermée avant l'envoi
+        stream_db = SessionLocal()
+        try:
+            yield from exporter.stream_candidates_csv(_export_query(stream_db, job_id))
+        finally:
+            stream_db.close()
+    
+    filename = f"candidats_offre_{job_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    
+    return StreamingResponse(
+        csv_chunks(),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 @router.get("/{candidate_id}/download-cv")
-async def download_cv(
+def download_cv(
     candidate_id: int,
     db: Session = Depends(get_db)
 ):
@@ -10,6 +10,7 @@ import logging
 
 from app.database import get_db
 from app.modules.chatbot.interviewer import Interviewer
+from app.modules.model_registry import ModelRegistry, get_model_registry
 from app.models.interview import InterviewSession, InterviewStatus
 
 logger = logging.getLogger(__name__)
@@ -32,12 +33,24 @@ class SubmitResponseRequest(BaseModel):
     response_time: Optional[int] = 0
 
 
+# ============ Dépendances ============
+
+def get_interviewer(
+    db: Session = Depends(get_db),
+    models: ModelRegistry = Depends(get_model_registry)
+) -> Interviewer:
+    """Interviewer lié à la session DB de la requête, avec la banque de questions partagée"""
+    return Interviewer(
+        db, dataset_loader=models.dataset_loader, evaluation_service=models.evaluation_service
+    )
+
+
 # ============ Endpoints ============
 
 @router.post("/start", status_code=status.HTTP_201_CREATED)
 def start_interview(
     request: StartInterviewRequest,
-    db: Session = Depends(get_db)
+    interviewer: Interviewer = Depends(get_interviewer)
 ):
     """
     🚀 Démarrer un nouvel entretien
@@ -49,7 +62,6 @@ def start_interview(
         session_id et première question
     """
     try:
-        interviewer = Interviewer(db)
         result = interviewer.start_interview(
             candidate_id=request.candidate_id,
             job_offer_id=request.job_offer_id
@@ -73,7 +85,7 @@ def start_interview(
 def submit_response(
     session_id: str,
     request: SubmitResponseRequest,
-    db: Session = Depends(get_db)
+    interviewer: Interviewer = Depends(get_interviewer)
 ):
     """
     💬 Soumettre une réponse à une question
@@ -87,7 +99,6 @@ def submit_response(
         Analyse de la réponse et prochaine question
     """
     try:
-        interviewer = Interviewer(db)
         result = interviewer.submit_response(
             session_id=session_id,
             question_id=request.question_id,
@@ -112,7 +123,7 @@ def submit_response(
 @router.get("/{session_id}/status")
 def get_session_status(
     session_id: str,
-    db: Session = Depends(get_db)
+    interviewer: Interviewer = Depends(get_interviewer)
 ):
     """
     📊 Obtenir l'état actuel d'une session
@@ -123,7 +134,6 @@ def get_session_status(
         État de la session (phase, questions, scores)
     """
     try:
-        interviewer = Interviewer(db)
         result = interviewer.get_session_status(session_id)
         return result
     
@@ -143,7 +153,7 @@ def get_session_status(
 @router.get("/{session_id}/results")
 def get_session_results(
     session_id: str,
-    db: Session = Depends(get_db)
+    interviewer: Interviewer = Depends(get_interviewer)
 ):
     """
     🎯 Obtenir les résultats finaux
@@ -154,7 +164,6 @@ def get_session_results(
         Résultats complets: scores, feedback, détails
     """
     try:
-        interviewer = Interviewer(db)
         result = interviewer.get_session_results(session_id)
         return result
     
@@ -174,7 +183,7 @@ def get_session_results(
 @router.put("/{session_id}/abandon")
 def abandon_session(
     session_id: str,
-    db: Session = Depends(get_db)
+    interviewer: Interviewer = Depends(get_interviewer)
 ):
     """
     🚫 Abandonner une session
@@ -185,7 +194,6 @@ def abandon_session(
         Confirmation de l'abandon
     """
     try:
-        interviewer = Interviewer(db)
         result = interviewer.abandon_session(session_id)
         return result
     
@@ -284,7 +292,7 @@ def list_sessions(
 @router.get("/{session_id}/next-question")
 def get_next_question(
     session_id: str,
-    db: Session = Depends(get_db)
+    interviewer: Interviewer = Depends(get_interviewer)
 ):
     """
     ➡️ Obtenir la prochaine question
@@ -295,7 +303,6 @@ def get_next_question(
         Prochaine question
     """
     try:
-        interviewer = Interviewer(db)
         result = interviewer.get_next_question(session_id)
         return result
     
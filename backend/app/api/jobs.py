@@ -3,15 +3,18 @@ Routes API pour la gestion des offres d'emploi
 Module 1 : Générateur d'annonces
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from sqlalchemy.orm import Session, load_only
 from typing import List, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 
 from app.database import get_db
+from app.api.pagination import paginate
 from app.models.job_offer import JobOffer
+from app.models.candidate import Candidate
 from app.modules.job_generator.generator import JobOfferGenerator
+from app.modules.model_registry import ModelRegistry, get_model_registry
 
 # Créer le routeur
 router = APIRouter()
@@ -231,18 +234,24 @@ async def generate_linkedin_post(
 
 @router.get("/", response_model=List[JobOfferResponse])
 async def list_job_offers(
-    skip: int = 0,
-    limit: int = 10,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=500),
     is_active: bool = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
     📋 Liste toutes les offres d'emploi
     
+    Triées par id (ordre de création). La page suivante s'obtient avec le
+    curseur de l'en-tête X-Next-Cursor (absent sur la dernière page).
+    
     Args:
-        skip: Nombre d'offres à sauter (pagination)
+        skip: Nombre d'offres à sauter (pagination par décalage, sans curseur)
         limit: Nombre maximum d'offres à retourner
         is_active: Filtrer par statut actif/inactif
+        cursor: Curseur de la page suivante
         db: Session de base de données
     
     Returns:
@@ -257,8 +266,8 @@ async def list_job_offers(
     if is_active is not None:
         query = query.filter(JobOffer.is_active == is_active)
     
-    # Pagination
-    jobs = query.offset(skip).limit(limit).all()
+    # Pagination (curseur sur l'id, ou décalage)
+    jobs = paginate(query, [(JobOffer.id, False)], response, limit, cursor=cursor, skip=skip)
     
     return jobs
 
@@ -362,6 +371,84 @@ async def delete_job_offer(
     }
 
 
+@router.get("/{job_id}/matching-candidates")
+def get_matching_candidates(
+    job_id: int,
+    limit: int = Query(50, ge=1, le=500),
+    min_score: float = Query(0.0, ge=0, le=100),
+    db: Session = Depends(get_db),
+    models: ModelRegistry = Depends(get_model_registry)
+):
+    """
+    🎯 Meilleurs candidats déjà en base pour une offre (toutes offres confondues)
+    
+    Les candidats ne sont pas ré-analysés : leurs données extraites sont
+    indexées (compétence -> candidats) et scorées en une passe vectorisée,
+    avec les mêmes règles que l'analyseur de CV.
+    
+    Args:
+        job_id: ID de l'offre d'emploi
+        limit: Nombre maximum de candidats
+        min_score: Score minimum (0-100)
+        db: Session de base de données
+    
+    Returns:
+        dict: Candidats triés par score de matching
+    
+    Exemple:
+        GET /api/jobs/1/matching-candidates?limit=20&min_score=60
+    """
+    job = db.query(JobOffer).filter(JobOffer.id == job_id).first()
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Offre d'emploi non trouvée")
+    
+    job_requirements = job.to_requirements()
+    
+    skill_index = models.candidate_skill_index
+    skill_index.refresh(db)
+    
+    # Les candidats supprimés depuis leur indexation sont écartés puis
+    # exclus de l'index : un second passage complète la liste
+    for _ in range(2):
+        matches = skill_index.top_matches(job_requirements, limit=limit, min_score=min_score)
+        candidates = {
+            c.id: c for c in db.query(Candidate).options(load_only(
+                Candidate.id, Candidate.first_name, Candidate.last_name,
+                Candidate.email, Candidate.job_offer_id, Candidate.cv_score
+            )).filter(Candidate.id.in_([m["candidate_id"] for m in matches])).all()
+        }
+        removed = [m["candidate_id"] for m in matches if m["candidate_id"] not in candidates]
+        if not removed:
+            break
+        skill_index.mark_removed(removed)
+    
+    analyzer = models.improved_analyzer
+    results = []
+    for match in matches:
+        candidate = candidates.get(match["candidate_id"])
+        if candidate is None:
+            continue
+        results.append({
+            "candidate_id": candidate.id,
+            "name": f"{candidate.first_name} {candidate.last_name}",
+            "email": candidate.email,
+            "applied_job_offer_id": candidate.job_offer_id,
+            "cv_score": candidate.cv_score,
+            **match,
+            "category": analyzer.get_category(match["match_score"]),
+            "recommendation": analyzer.get_recommendation(match["match_score"])
+        })
+    
+    return {
+        "job_id": job.id,
+        "job_title": job.title,
+        "indexed_candidates": len(skill_index),
+        "total": len(results),
+        "candidates": results
+    }
+
+
 @router.get("/{job_id}/linkedin-post")
 async def get_linkedin_post(
     job_id: int,
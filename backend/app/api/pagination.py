@@ -0,0 +1,104 @@
+"""
+Pagination par curseur (keyset) des routes de liste
+
+Au lieu de OFFSET (qui relit toutes les lignes sautées), la page suivante
+est filtrée sur la clé de tri de la dernière ligne renvoyée :
+    WHERE (ranking_score, id) après (71.0, 42) ORDER BY ranking_score DESC, id
+Le coût d'une page ne dépend plus de sa profondeur.
+
+Les clés de tri ne doivent jamais être NULL (`score < NULL` n'est jamais
+vrai, et la place des NULL dans le tri dépend de la base) : une colonne
+nullable est triée sur une expression comme Candidate.ranking_score.
+
+Le curseur de la page suivante est renvoyé dans l'en-tête X-Next-Cursor
+(absent sur la dernière page) ; le corps de la réponse reste une liste,
+et l'ancien paramètre `skip` reste accepté.
+"""
+
+import base64
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# (colonne, ordre décroissant) ; clés non NULL, la dernière unique (id)
+SortKey = Tuple[Any, bool]
+
+
+def encode_cursor(values: Sequence) -> str:
+    """Curseur opaque (base64 url-safe) à partir des valeurs de tri"""
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List:
+    """Valeurs de tri d'un curseur (400 si le curseur est invalide)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Curseur de pagination invalide")
+
+    if not isinstance(values, list) or len(values) != size or None in values:
+        raise HTTPException(status_code=400, detail="Curseur de pagination invalide")
+    return values
+
+
+def _after(keys: Sequence[SortKey], values: Sequence):
+    """
+    Lignes situées après `values` dans l'ordre de tri :
+    (a, b) après (x, y)  <=>  a > x OR (a = x AND b > y)   (< pour un tri décroissant)
+    """
+    conditions = []
+    for position, (column, descending) in enumerate(keys):
+        value = values[position]
+        equal_prefix = [previous == previous_value for (previous, _), previous_value in zip(keys[:position], values)]
+        conditions.append(and_(*equal_prefix, column < value if descending else column > value))
+    return or_(*conditions)
+
+
+def paginate(
+    query: Query,
+    keys: Sequence[SortKey],
+    response: Response,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0
+) -> list:
+    """
+    Applique le tri, le curseur (ou `skip` sans curseur) et la limite
+
+    Args:
+        query: Requête filtrée, sans ORDER BY
+        keys: Clés de tri [(colonne, décroissant)], la dernière unique
+        response: Réponse FastAPI (reçoit l'en-tête X-Next-Cursor)
+        limit: Taille de la page (aucune ligne si limit <= 0)
+        cursor: Curseur renvoyé par la page précédente
+        skip: Ancienne pagination par décalage (ignorée avec un curseur)
+
+    Returns:
+        list: Lignes de la page
+    """
+    if limit <= 0:
+        return []
+
+    if cursor:
+        query = query.filter(_after(keys, decode_cursor(cursor, len(keys))))
+
+    query = query.order_by(*[column.desc() if descending else column.asc() for column, descending in keys])
+
+    if skip and not cursor:
+        query = query.offset(skip)
+
+    # Une ligne de plus pour savoir s'il reste une page
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, column.key) for column, _ in keys])
+
+    return rows
@@ -54,7 +54,11 @@ class Settings(BaseSettings):
     use_gpu: bool = False
     
     # ============ File Upload ============
-    max_upload_size_mb: int = 10
+    max_upload_size_mb: int = 10  # Par fichier (PDF seul ou contenu d'une archive)
+    max_batch_upload_size_mb: int = 200  # Requête complète de /upload-batch
+    max_batch_extracted_size_mb: int = 1000  # Total des PDF d'un lot (archives ZIP décompressées)
+    max_batch_files: int = 500  # Nombre de PDF d'un lot (archives ZIP comprises)
+    pdf_fast_extraction: bool = True  # PyPDF2 d'abord, pdfplumber pour les pages dégradées
     allowed_extensions: list = ["pdf", "docx", "jpg", "jpeg", "png"]
     
     # ============ Scoring Configuration ============
@@ -72,6 +76,10 @@ class Settings(BaseSettings):
     technical_questions: int = 6
     behavioral_questions: int = 4
     adaptive_difficulty: bool = True
+    ml_evaluation: bool = False  # Evaluator (spaCy, BERT, SentenceTransformer) au lieu de l'heuristique
+    evaluation_batch_size: int = 16  # Réponses analysées ensemble au plus
+    evaluation_batch_wait_ms: float = 2.0  # Attente des réponses simultanées avant l'analyse d'un lot
+    evaluation_timeout_s: float = 10.0  # Au-delà, la réponse est analysée par l'heuristique
     
     # ============ Cache Configuration ============
     enable_cache: bool = True
@@ -80,6 +88,9 @@ class Settings(BaseSettings):
     # ============ Performance ============
     max_workers: int = 4
     batch_size: int = 10
+    embeddings_dir: str = "data/embeddings"
+    export_cache_max_mb: int = 500  # Taille maximale des exports Excel conservés
+    export_cache_max_age_hours: int = 24
     
     # ============ Templates ============
     templates_dir: str = "data/templates"
@@ -65,6 +65,19 @@ async def lifespan(app: FastAPI):
         if connections_ok["postgresql"]:
             Base.metadata.create_all(bind=engine)
             print("[OK] Base de donnees PostgreSQL initialisee")
+            
+            # Statistiques matérialisées des offres sans ligne job_statistics
+            try:
+                from app.database import SessionLocal
+                from app.modules.cv_analyzer.statistics import RecruitmentStats
+                db = SessionLocal()
+                try:
+                    RecruitmentStats.ensure_job_statistics(db)
+                finally:
+                    db.close()
+                print("[OK] Statistiques des offres synchronisees")
+            except Exception as e:
+                print(f"[WARN] Erreur synchronisation statistiques : {e}")
         
         # Initialiser le générateur d'annonces (Module 1)
         try:
@@ -74,6 +87,34 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             print(f"[WARN] Erreur initialisation Module 1 : {e}")
         
+        # Charger les modèles partagés (analyseurs, spaCy, SentenceTransformer, questions)
+        try:
+            from app.modules.model_registry import get_model_registry
+            get_model_registry().warm_up()
+            print("[OK] Registre des modeles NLP charge")
+        except Exception as e:
+            print(f"[WARN] Erreur chargement des modeles : {e}")
+        
+        # Questions d'entretien canoniques (banque JSON enregistrée une seule fois)
+        if connections_ok["postgresql"]:
+            try:
+                from app.database import SessionLocal
+                from app.modules.chatbot import question_store
+                from app.modules.model_registry import get_model_registry
+                db = SessionLocal()
+                try:
+                    registry = get_model_registry()
+                    evaluation_service = registry.evaluation_service
+                    total = question_store.sync_questions(
+                        db, registry.dataset_loader,
+                        evaluator=evaluation_service.evaluator if evaluation_service else None
+                    )
+                finally:
+                    db.close()
+                print(f"[OK] Banque de questions synchronisee ({total} questions)")
+            except Exception as e:
+                print(f"[WARN] Erreur synchronisation des questions : {e}")
+        
         # Message de démarrage
         print(f"[OK] Application demarree en mode {settings.environment}")
         print(f"[INFO] Documentation disponible sur: http://localhost:{settings.port}/docs")
@@ -89,6 +130,15 @@ async def lifespan(app: FastAPI):
     print("\n" + "="*50)
     print("[STOP] SYSTEM SHUTDOWN")
     print("="*50)
+    
+    # Arrêter les exécuteurs d'analyse (CVs, réponses d'entretien)
+    from app.modules.cv_analyzer.batch_processor import shutdown_process_pool
+    from app.modules.cv_analyzer.offload import shutdown_cpu_executor
+    from app.modules.chatbot.evaluation_service import shutdown_evaluation_service
+    shutdown_process_pool()
+    shutdown_cpu_executor()
+    shutdown_evaluation_service()
+    
     print("[OK] Arret propre de l'application")
     print("="*50 + "\n")
 
@@ -105,6 +155,40 @@ app = FastAPI(
 )
 
 
+# ============ Limite de taille des uploads ============
+
+# Marge pour l'enveloppe multipart (délimiteurs, en-têtes, champs du formulaire)
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+UPLOAD_SIZE_LIMITS_MB = {
+    "/api/candidates/upload-cv": settings.max_upload_size_mb,
+    "/api/candidates/upload-batch": settings.max_batch_upload_size_mb,
+}
+
+
+# Déclaré avant CORSMiddleware (le dernier middleware ajouté est le plus
+# externe) : la réponse 413 reçoit les en-têtes CORS, le frontend peut lire
+# le message au lieu d'une erreur réseau
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    """
+    Refuse (413) un upload trop volumineux d'après son Content-Length,
+    avant que le corps ne soit lu, mis en mémoire ou écrit sur disque
+    """
+    limit_mb = UPLOAD_SIZE_LIMITS_MB.get(request.url.path)
+    content_length = request.headers.get("content-length")
+    
+    if request.method == "POST" and limit_mb and content_length and content_length.isdigit():
+        if int(content_length) > limit_mb * 1024 * 1024 + MULTIPART_OVERHEAD_BYTES:
+            logger.warning(f"⛔ Upload refusé ({int(content_length)} octets) : {request.url.path}")
+            return JSONResponse(
+                status_code=413,
+                content={"detail": f"Fichier trop volumineux (maximum {limit_mb} Mo)"}
+            )
+    
+    return await call_next(request)
+
+
 # ============ Configuration CORS ============
 
 app.add_middleware(
@@ -113,6 +197,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Pagination par curseur
 )
 
 
@@ -225,7 +310,8 @@ async def root():
                 "endpoints": [
                     "POST /api/jobs/create",
                     "POST /api/jobs/generate-linkedin-post",
-                    "GET /api/jobs/"
+                    "GET /api/jobs/",
+                    "GET /api/jobs/{job_id}/matching-candidates"
                 ]
             },
             "module_2": {
@@ -233,6 +319,8 @@ async def root():
                 "status": "✅ Actif",
                 "endpoints": [
                     "POST /api/candidates/upload-cv",
+                    "POST /api/candidates/upload-batch",
+                    "GET /api/candidates/search",
                     "GET /api/candidates/{candidate_id}/analysis"
                 ]
             },
@@ -4,5 +4,7 @@ Package des modèles de base de données
 
 from app.models.job_offer import JobOffer
 from app.models.candidate import Candidate
+from app.models.job_statistics import JobStatistics
+from app.models.cv_blob import CVBlob
 
-__all__ = ["JobOffer", "Candidate"]
\ No newline at end of file
+__all__ = ["JobOffer", "Candidate", "JobStatistics", "CVBlob"]
\ No newline at end of file
@@ -2,8 +2,9 @@
 Modèle de données pour les candidats
 """
 
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, JSON, Enum as SQLEnum, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, JSON, Enum as SQLEnum, ForeignKey, Index, literal_column
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from datetime import datetime
 import enum
@@ -43,10 +44,12 @@ class Candidate(Base):
     # ============ CV ============
     cv_filename = Column(String(500))
     cv_mongodb_id = Column(String(100))  # ID du document dans MongoDB
-    cv_text = Column(Text)  # Texte extrait du CV
+    # Colonnes lourdes différées (groupe "cv_content") : jamais lues par les
+    # listes, chargées ensemble au premier accès ou via undefer_group
+    cv_text = deferred(Column(Text), group="cv_content")  # Texte extrait du CV
     
     # ============ Données extraites du CV (JSON) ============
-    extracted_data = Column(JSON, default={})
+    extracted_data = deferred(Column(JSON, default={}), group="cv_content")
     # Structure:
     # {
     #     "skills": ["Python", "Django"],
@@ -103,6 +106,22 @@ class Candidate(Base):
     def __repr__(self):
         return f"<Candidate(id={self.id}, name='{self.first_name} {self.last_name}', email='{self.email}')>"
     
+    @hybrid_property
+    def ranking_score(self):
+        """
+        Score de classement : cv_score, absent compté comme 0
+        
+        Jamais NULL : clé de tri et de pagination par curseur (un curseur
+        sur un score NULL ne trouverait aucune ligne après lui).
+        """
+        return self.cv_score if self.cv_score is not None else 0.0
+    
+    @ranking_score.inplace.expression
+    @classmethod
+    def _ranking_score_expression(cls):
+        # 0 littéral : même expression dans l'index et dans les requêtes
+        return func.coalesce(cls.cv_score, literal_column("0"))
+    
     def to_dict(self):
         """
         Convertit l'objet en dictionnaire
@@ -133,4 +152,25 @@ class Candidate(Base):
         elif self.final_score >= 50:
             return "Candidat moyen - Liste de réserve"
         else:
-            return "Candidat insuffisant pour ce poste"
\ No newline at end of file
+            return "Candidat insuffisant pour ce poste"
+
+
+# Classement des candidats d'une offre (rang, percentile, tri par score)
+Index("ix_candidates_job_offer_ranking", Candidate.job_offer_id, Candidate.ranking_score.desc())
+
+
+# Colonnes lues par les listes de candidats (to_dict, get_recommendation)
+LISTING_COLUMNS = (
+    Candidate.id,
+    Candidate.first_name,
+    Candidate.last_name,
+    Candidate.email,
+    Candidate.phone,
+    Candidate.cv_score,
+    Candidate.interview_score,
+    Candidate.final_score,
+    Candidate.application_status,
+    Candidate.final_ranking,
+    Candidate.applied_at,
+    Candidate.job_offer_id
+)
@@ -0,0 +1,36 @@
+"""
+Modèle de données pour les CVs stockés par contenu (sha256)
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class CVBlob(Base):
+    """
+    Table des fichiers CV dédoublonnés
+
+    Un PDF est enregistré une seule fois sous `{sha256}.pdf`, quel que soit le
+    nombre de candidatures qui l'utilisent. Le texte extrait et les données
+    extraites (ImprovedCVAnalyzer.extract) sont conservés : un nouvel envoi du
+    même fichier ne relance que le scoring propre à l'offre.
+    """
+    __tablename__ = "cv_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    filename = Column(String(500), nullable=False)  # Nom dans UPLOAD_DIR
+    original_filename = Column(String(500))  # Nom du premier envoi
+    size_bytes = Column(Integer, nullable=False, default=0)
+
+    # ============ Résultats d'extraction ============
+    cv_text = Column(Text)
+    extracted_data = Column(JSON)  # None tant que l'analyseur amélioré n'a pas tourné
+    analyzer_version = Column(String(20))  # ANALYZER_VERSION de extracted_data
+
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<CVBlob(sha256='{self.sha256[:12]}', filename='{self.filename}')>"
@@ -2,7 +2,7 @@
 """
 Modèles pour le système d'entretien chatbot
 """
-from sqlalchemy import Column, String, Integer, Float, DateTime, Text, ForeignKey, Enum as SQLEnum, Boolean
+from sqlalchemy import Column, String, Integer, Float, DateTime, Text, ForeignKey, Enum as SQLEnum, Boolean, Index, JSON, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -44,6 +44,10 @@ class QuestionDifficulty(str, enum.Enum):
 class InterviewSession(Base):
     """Session d'entretien pour un candidat"""
     __tablename__ = "interview_sessions"
+    __table_args__ = (
+        # Session en cours d'un candidat pour une offre (Interviewer.start_interview)
+        Index("ix_interview_sessions_candidate_job_status", "candidate_id", "job_offer_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     candidate_id = Column(Integer, ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False)
@@ -54,11 +58,23 @@ class InterviewSession(Base):
     current_phase = Column(SQLEnum(InterviewPhase), default=InterviewPhase.WELCOME, nullable=False)
     current_question_index = Column(Integer, default=0, nullable=False)
     
+    # Ids des questions de la session, dans l'ordre où elles sont posées
+    # (question suivante = question_ids[questions_answered], lue par clé primaire)
+    question_ids = Column(JSON, nullable=True)
+    
     # Scores
     technical_score = Column(Float, default=0.0)
     behavioral_score = Column(Float, default=0.0)
     overall_score = Column(Float, default=0.0)
     
+    # Sommes courantes (score × poids) et nombres de réponses par catégorie,
+    # mises à jour à chaque réponse (Interviewer._update_scores)
+    # NULL : session antérieure aux compteurs, recalculée à sa prochaine réponse
+    technical_score_sum = Column(Float, default=0.0)
+    technical_count = Column(Integer, default=0)
+    behavioral_score_sum = Column(Float, default=0.0)
+    behavioral_count = Column(Integer, default=0)
+    
     # Feedback IA
     ai_feedback = Column(Text, nullable=True)
     
@@ -127,18 +143,31 @@ class InterviewSession(Base):
 
 
 class InterviewQuestion(Base):
-    """Question d'entretien"""
+    """
+    Question d'entretien
+    
+    Les questions de la banque JSON sont enregistrées une seule fois
+    (text_hash renseigné, question_store) et partagées par toutes les
+    sessions ; les anciennes sessions gardent leurs copies par offre.
+    """
     __tablename__ = "interview_questions"
+    __table_args__ = (
+        UniqueConstraint("text_hash", name="uq_interview_questions_text_hash"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     
     # Contenu
     text = Column(Text, nullable=False)
+    text_hash = Column(String(64), nullable=True)  # sha256 du texte normalisé (questions canoniques)
     category = Column(SQLEnum(QuestionCategory), nullable=False)
     difficulty = Column(SQLEnum(QuestionDifficulty), default=QuestionDifficulty.MEDIUM)
     
     # Mots-clés attendus pour l'analyse
-    expected_keywords = Column(JSONB, nullable=True)  # Liste de mots-clés
+    expected_keywords = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True)  # Liste de mots-clés
+    # Vecteurs spaCy des mots-clés (même ordre), calculés à l'enregistrement de la question
+    keyword_vectors = Column(JSON, nullable=True)  # Liste de listes de floats
+    keyword_vectors_model = Column(String(100), nullable=True)  # Pipeline spaCy des vecteurs (Evaluator.vector_model)
     
     # Pondération
     weight = Column(Float, default=1.0)
@@ -95,4 +95,16 @@ class JobOffer(Base):
             "linkedin_post": self.linkedin_post,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "total_applications": self.total_applications
-        }
\ No newline at end of file
+        }
+    
+    def to_requirements(self):
+        """
+        Exigences de l'offre au format attendu par ImprovedCVAnalyzer.analyze
+        et CandidateSkillIndex.top_matches
+        """
+        return {
+            "required_skills": self.required_skills or [],
+            "nice_to_have_skills": self.nice_to_have_skills or [],
+            "experience_min_years": self.experience_min_years or 0,
+            "education_level": self.education_level or ""
+        }
@@ -0,0 +1,45 @@
+"""
+Modèle de données pour les statistiques matérialisées par offre
+"""
+
+from sqlalchemy import Column, Integer, Float, DateTime, JSON, ForeignKey
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class JobStatistics(Base):
+    """
+    Table des statistiques agrégées des candidats d'une offre
+
+    Mise à jour de façon incrémentale à chaque création ou suppression de
+    candidat (RecruitmentStats.record_candidates, remove_candidate) :
+    les routes de statistiques la lisent sans parcourir les candidats.
+    """
+    __tablename__ = "job_statistics"
+
+    job_offer_id = Column(Integer, ForeignKey("job_offers.id"), primary_key=True)
+
+    # ============ Effectifs ============
+    total_candidates = Column(Integer, nullable=False, default=0)
+    scored_count = Column(Integer, nullable=False, default=0)  # cv_score non nul
+
+    # ============ Scores (cv_score absent compté comme 0, défaut de la colonne) ============
+    score_sum = Column(Float, nullable=False, default=0.0)
+    score_sum_squares = Column(Float, nullable=False, default=0.0)
+    # Histogramme des scores non nuls au dixième de point : {"71.0": 3, ...}
+    score_histogram = Column(JSON, default={})
+
+    # ============ Catégories ============
+    count_a = Column(Integer, nullable=False, default=0)  # ≥ 80
+    count_b = Column(Integer, nullable=False, default=0)  # 65-79
+    count_c = Column(Integer, nullable=False, default=0)  # 50-64
+    count_d = Column(Integer, nullable=False, default=0)  # < 50
+
+    # ============ Compétences ============
+    skill_counts = Column(JSON, default={})
+
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<JobStatistics(job_offer_id={self.job_offer_id}, total={self.total_candidates})>"
@@ -0,0 +1,173 @@
+"""
+Module 4 - Évaluation ML des réponses par micro-lots
+Les réponses soumises en même temps (routes synchrones, un thread par
+requête) sont regroupées pendant quelques millisecondes puis analysées
+ensemble par Evaluator.analyze_responses (nlp.pipe, pipeline de sentiment
+et encode sur tout le lot)
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+from typing import Dict, List, Optional
+
+from app.config import get_settings
+from app.modules.chatbot.evaluator import Evaluator
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_STOP = object()
+
+
+class EvaluationServiceClosed(RuntimeError):
+    """Réponse soumise après l'arrêt du service"""
+
+
+class EvaluationService:
+    """
+    File d'attente des réponses à analyser, vidée par un thread unique
+
+    Le thread attend une première réponse, collecte les suivantes pendant
+    max_wait_ms au plus (ou jusqu'à max_batch_size réponses), puis analyse
+    le lot. Les appelants attendent leur propre résultat (Future).
+    """
+
+    def __init__(self, evaluator: Evaluator, max_batch_size: int = 16, max_wait_ms: float = 2.0):
+        self.evaluator = evaluator
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.answers = 0
+        self.batches = 0
+        self._closed = False
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="interview-eval", daemon=True)
+        self._thread.start()
+
+    def evaluate(
+        self,
+        question_text: str,
+        response_text: str,
+        expected_keywords: List[str],
+        keyword_vectors: Optional[List[List[float]]] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, float]:
+        """
+        Analyse d'une réponse (bloquant, regroupée avec les réponses simultanées)
+
+        Args:
+            keyword_vectors: Vecteurs stockés des mots-clés (question_store.stored_keyword_vectors)
+            timeout: Attente maximale en secondes (None : sans limite)
+
+        Returns:
+            Dict des scores (mêmes clés que Evaluator.analyze_response)
+
+        Raises:
+            EvaluationServiceClosed: Service arrêté
+            TimeoutError: Analyse non terminée dans le délai (la réponse est retirée du lot)
+        """
+        if self._closed:
+            raise EvaluationServiceClosed("Service d'évaluation arrêté")
+
+        future: Future = Future()
+        self._queue.put((future, (question_text, response_text, expected_keywords, keyword_vectors)))
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()  # Ignorée par le thread si son lot n'a pas commencé
+            raise
+
+    def close(self):
+        """Arrête le thread après les réponses déjà en file ; les suivantes sont refusées"""
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+        # Réponses soumises pendant l'arrêt : jamais analysées
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP and item[0].set_running_or_notify_cancel():
+                item[0].set_exception(EvaluationServiceClosed("Service d'évaluation arrêté"))
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._process(batch)
+
+    def _process(self, batch: list):
+        batch = [(future, args) for future, args in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        try:
+            analyses = self.evaluator.analyze_responses([args for _, args in batch])
+        except Exception as e:
+            logger.error(f"❌ Erreur analyse d'un lot de {len(batch)} réponses : {e}")
+            for future, _ in batch:
+                future.set_exception(e)
+            return
+
+        self.answers += len(batch)
+        self.batches += 1
+        for (future, _), analysis in zip(batch, analyses):
+            future.set_result(analysis)
+
+
+_service: Optional[EvaluationService] = None
+_service_lock = threading.Lock()
+
+
+def get_evaluation_service() -> EvaluationService:
+    """
+    Retourne le service partagé, modèles chargés et préchauffés
+    (taille des lots : settings.evaluation_batch_size,
+    attente : settings.evaluation_batch_wait_ms)
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            evaluator = Evaluator()
+            evaluator.warm_up()
+            _service = EvaluationService(
+                evaluator,
+                max_batch_size=settings.evaluation_batch_size,
+                max_wait_ms=settings.evaluation_batch_wait_ms
+            )
+            logger.info(
+                f"⚙️  Évaluation ML démarrée (lots de {settings.evaluation_batch_size} réponses, "
+                f"{settings.evaluation_batch_wait_ms} ms d'attente)"
+            )
+        return _service
+
+
+def shutdown_evaluation_service():
+    """Arrête le service (appelé à l'arrêt de l'application)"""
+    global _service
+    with _service_lock:
+        if _service is not None:
+            _service.close()
+            _service = None
+            logger.info("✅ Évaluation ML arrêtée")
@@ -2,9 +2,15 @@
 """
 Service d'analyse ML des réponses d'entretien
 Utilise spaCy, BERT et Sentence Transformers
+
+Les réponses sont analysées par lots (analyze_responses) : un seul passage
+nlp.pipe, pipeline de sentiment et encode pour tout le lot. Les appels
+unitaires sont des lots d'une réponse (scores identiques).
 """
 import spacy
-from typing import Dict, List, Tuple
+from spacy.attrs import IDX, LENGTH, ORTH
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
 import re
 
 # Lazy loading des modèles pour optimiser le démarrage
@@ -62,76 +68,254 @@ class Evaluator:
         self.nlp = get_nlp()
         self.sentiment_analyzer = get_sentiment_analyzer()
         self.sentence_model = get_sentence_model()
+        # Vecteurs des mots-clés déjà analysés (mots-clés fixes par question)
+        self._keyword_vectors: Dict[str, np.ndarray] = {}
+    
+    @property
+    def vector_model(self) -> Optional[str]:
+        """
+        Identifiant du pipeline spaCy des vecteurs de mots-clés stockés
+        (None sans vecteurs statiques : Doc.vector dépend alors du contexte)
+        """
+        if not self.nlp.vocab.vectors.size:
+            return None
+        meta = self.nlp.meta
+        return f"{meta.get('lang', '')}_{meta.get('name', '')}-{meta.get('version', '')}"
     
     def analyze_response(
         self,
         question_text: str,
         response_text: str,
-        expected_keywords: List[str]
+        expected_keywords: List[str],
+        keyword_vectors: Optional[List[List[float]]] = None
     ) -> Dict[str, float]:
         """
         Analyser une réponse complètement
         
+        Args:
+            keyword_vectors: Vecteurs stockés des mots-clés (InterviewQuestion.keyword_vectors)
+        
         Returns:
             Dict avec tous les scores (keyword, sentiment, relevance, confidence)
         """
-        analysis = {
-            "keyword_score": self.calculate_keyword_score(response_text, expected_keywords),
-            "sentiment_score": self.calculate_sentiment(response_text),
-            "relevance_score": self.calculate_relevance(question_text, response_text),
-            "confidence_score": self.calculate_confidence(response_text)
-        }
+        return self.analyze_responses([(question_text, response_text, expected_keywords, keyword_vectors)])[0]
+    
+    def analyze_responses(self, items: List[Tuple]) -> List[Dict[str, float]]:
+        """
+        Analyser un lot de réponses (un passage de chaque modèle pour tout le lot)
+        
+        Args:
+            items: (question_text, response_text, expected_keywords[, keyword_vectors]) par réponse
+        
+        Returns:
+            Une analyse par réponse, dans l'ordre
+        """
+        if not items:
+            return []
+        
+        questions = [item[0] for item in items]
+        responses = [item[1] for item in items]
+        keywords = [item[2] for item in items]
+        vectors = [item[3] if len(item) > 3 else None for item in items]
+        
+        keyword_scores = self.calculate_keyword_scores(responses, keywords, vectors)
+        sentiment_scores = self.calculate_sentiments(responses)
+        relevance_scores = self.calculate_relevances(questions, responses)
+        
+        analyses = []
+        for i, response_text in enumerate(responses):
+            analysis = {
+                "keyword_score": keyword_scores[i],
+                "sentiment_score": sentiment_scores[i],
+                "relevance_score": relevance_scores[i],
+                "confidence_score": self.calculate_confidence(response_text)
+            }
+            
+            # Score global
+            analysis["overall_score"] = self._calculate_overall_score(analysis)
+            analyses.append(analysis)
         
-        # Score global
-        analysis["overall_score"] = self._calculate_overall_score(analysis)
+        return analyses
+    
+    def warm_up(self):
+        """
+        Premier passage de chaque modèle (initialisations paresseuses de spaCy,
+        torch...) pour que la première réponse d'un candidat n'en paie pas le coût
+        """
+        self.analyze_responses([(
+            "Présentez-vous en quelques mots.",
+            "Je suis développeur Python depuis cinq ans et j'aime travailler en équipe.",
+            ["python", "équipe"]
+        )])
+    
+    def _docs(self, texts: Iterable[str]):
+        """
+        Docs spaCy pour Doc.vector et les tokens : le tokenizer suffit avec
+        des vecteurs statiques (moyenne des vecteurs des tokens), sinon
+        pipeline complet (vecteur tiré du tenseur tok2vec)
+        """
+        if self.nlp.vocab.vectors.size:
+            return self.nlp.tokenizer.pipe(texts)
+        return self.nlp.pipe(texts)
+    
+    def keyword_vectors(self, keywords: List[str]) -> np.ndarray:
+        """
+        Vecteurs des mots-clés (une ligne par mot-clé), chaque mot-clé analysé
+        une seule fois par processus
         
-        return analysis
+        Returns:
+            np.ndarray (nombre de mots-clés × dimension des vecteurs)
+        """
+        keys = [keyword.lower() for keyword in keywords]
+        missing = list(dict.fromkeys(key for key in keys if key not in self._keyword_vectors))
+        for key, doc in zip(missing, self._docs(missing)):
+            self._keyword_vectors[key] = np.asarray(doc.vector, dtype=np.float32)
+        if not keys:
+            return np.zeros((0, self.nlp.vocab.vectors_length), dtype=np.float32)
+        return np.stack([self._keyword_vectors[key] for key in keys])
     
     def calculate_keyword_score(
         self,
         response_text: str,
-        expected_keywords: List[str]
+        expected_keywords: List[str],
+        keyword_vectors: Optional[List[List[float]]] = None
     ) -> float:
         """
         Calculer le score de matching avec les mots-clés attendus
-        Utilise spaCy pour la similarité sémantique
+        Utilise les vecteurs spaCy pour la similarité sémantique
         
         Returns:
             Score 0-100
         """
-        if not expected_keywords or not response_text:
-            return 0.0
+        return self.calculate_keyword_scores([response_text], [expected_keywords], [keyword_vectors])[0]
+    
+    def calculate_keyword_scores(
+        self,
+        responses: List[str],
+        keywords_list: List[List[str]],
+        vectors_list: Optional[List[Optional[List[List[float]]]]] = None
+    ) -> List[float]:
+        """
+        Scores de mots-clés d'un lot de réponses
+        Réponses analysées en un seul passage (_docs) ; mots-clés comparés par
+        une similarité cosinus vectorisée avec leurs vecteurs stockés (ou mis
+        en cache par le processus)
+        
+        Returns:
+            Score 0-100 par réponse
+        """
+        scores = [0.0] * len(responses)
+        vectors_list = vectors_list or [None] * len(responses)
+        scored = [
+            i for i, (response_text, expected_keywords) in enumerate(zip(responses, keywords_list))
+            if expected_keywords and response_text
+        ]
+        if not scored:
+            return scores
         
         try:
-            # Tokenize response
-            response_doc = self.nlp(response_text.lower())
+            # Tokenize responses
+            response_texts = [responses[i].lower() for i in scored]
+            response_docs = list(self._docs(response_texts))
+            response_vectors = self._doc_vectors(response_docs)
             
-            matches = 0
-            for keyword in expected_keywords:
-                keyword_doc = self.nlp(keyword.lower())
-                
-                # Calcul de similarité
-                similarity = response_doc.similarity(keyword_doc)
-                
-                # Seuil de matching
-                if similarity > 0.7:
-                    matches += 1
-                # Match partiel
-                elif similarity > 0.5:
-                    matches += 0.5
-                # Chercher aussi dans les tokens individuels
-                elif any(keyword.lower() in token.text.lower() for token in response_doc):
-                    matches += 0.75
-            
-            # Score proportionnel au nombre de keywords matchés
-            score = (matches / len(expected_keywords)) * 100
-            return min(100, score)
+            for i, response_lower, response_doc, response_vector in zip(
+                scored, response_texts, response_docs, response_vectors
+            ):
+                scores[i] = self._keyword_matches_score(
+                    response_lower, response_doc, response_vector, keywords_list[i],
+                    self._question_keyword_vectors(keywords_list[i], vectors_list[i])
+                )
+            return scores
             
         except Exception as e:
             print(f"⚠️  Erreur calcul keyword score: {e}")
             # Fallback: simple recherche de mots
-            matches = sum(1 for kw in expected_keywords if kw.lower() in response_text.lower())
-            return (matches / len(expected_keywords)) * 100
+            for i in scored:
+                response_lower = responses[i].lower()
+                matches = sum(1 for kw in keywords_list[i] if kw.lower() in response_lower)
+                scores[i] = (matches / len(keywords_list[i])) * 100
+            return scores
+    
+    def _doc_vectors(self, docs: List) -> List[np.ndarray]:
+        """
+        Doc.vector de chaque doc : moyenne des vecteurs statiques des tokens,
+        lus pour tout le lot en une opération (sans objet Token par token)
+        """
+        vectors = self.nlp.vocab.vectors
+        if not vectors.size or vectors.mode != "default" or any(doc.user_hooks for doc in docs):
+            return [np.asarray(doc.vector, dtype=np.float32) for doc in docs]
+        
+        keys = [doc.to_array(getattr(vectors, "attr", ORTH)) for doc in docs]
+        lengths = np.array([len(doc_keys) for doc_keys in keys])
+        result = np.zeros((len(docs), vectors.shape[1]), dtype=np.float32)
+        if not lengths.sum():
+            return list(result)
+        
+        rows = vectors.find(keys=np.concatenate(keys))
+        token_vectors = np.asarray(vectors.data, dtype=np.float32)[rows]
+        token_vectors[rows < 0] = 0.0  # Token sans vecteur : vecteur nul
+        
+        non_empty = lengths > 0
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))[non_empty]
+        result[non_empty] = np.add.reduceat(token_vectors, starts, axis=0) / lengths[non_empty, None]
+        return list(result)
+    
+    def _question_keyword_vectors(self, keywords: List[str], stored: Optional[List[List[float]]]) -> np.ndarray:
+        """Vecteurs stockés de la question s'ils correspondent au modèle, sinon calculés"""
+        if stored is not None and len(stored) == len(keywords):
+            vectors = np.asarray(stored, dtype=np.float32)
+            if vectors.ndim == 2 and vectors.shape[1] == self.nlp.vocab.vectors_length:
+                return vectors
+        return self.keyword_vectors(keywords)
+    
+    def _keyword_matches_score(
+        self,
+        response_lower: str,
+        response_doc,
+        response_vector: np.ndarray,
+        expected_keywords: List[str],
+        keyword_vectors: np.ndarray
+    ) -> float:
+        """Score 0-100 d'une réponse déjà analysée par spaCy (response_doc = nlp(response_lower))"""
+        # Similarité cosinus de chaque mot-clé avec la réponse (comme Doc.similarity)
+        norms = np.linalg.norm(keyword_vectors, axis=1) * np.linalg.norm(response_vector)
+        similarities = np.divide(
+            keyword_vectors @ response_vector, norms,
+            out=np.zeros(len(expected_keywords), dtype=np.float32), where=norms > 0
+        )
+        
+        token_text = None
+        matches = 0
+        for keyword, similarity in zip(expected_keywords, similarities):
+            needle = keyword.lower()
+            # Doc.similarity vaut 1 pour deux textes identiques, même sans vecteurs
+            if needle == response_lower:
+                similarity = 1.0
+            
+            # Seuil de matching
+            if similarity > 0.7:
+                matches += 1
+            # Match partiel
+            elif similarity > 0.5:
+                matches += 0.5
+            # Chercher aussi dans les tokens individuels
+            elif needle.split() == [needle]:
+                if token_text is None:
+                    token_text = self._token_text(response_lower, response_doc)
+                if needle in token_text:
+                    matches += 0.75
+        
+        # Score proportionnel au nombre de keywords matchés
+        score = (matches / len(expected_keywords)) * 100
+        return min(100, score)
+    
+    def _token_text(self, text: str, doc) -> str:
+        """
+        Tokens du doc (analyse de text), un par ligne : un mot-clé sans espace
+        présent dans ce texte est contenu dans un token
+        """
+        return "\n".join(text[start:start + length] for start, length in doc.to_array([IDX, LENGTH]).tolist())
     
     def calculate_sentiment(self, response_text: str) -> float:
         """
@@ -141,39 +325,52 @@ class Evaluator:
         Returns:
             Score -1 à 1 (négatif à positif)
         """
-        if not response_text or len(response_text) < 10:
-            return 0.0
+        return self.calculate_sentiments([response_text])[0]
+    
+    def calculate_sentiments(self, responses: List[str]) -> List[float]:
+        """
+        Sentiments d'un lot de réponses (un appel du pipeline BERT)
+        
+        Returns:
+            Score -1 à 1 par réponse
+        """
+        scores = [0.0] * len(responses)
+        scored = [i for i, text in enumerate(responses) if text and len(text) >= 10]
+        if not scored or self.sentiment_analyzer is None:
+            return scores
         
         try:
-            if self.sentiment_analyzer is None:
-                return 0.0
-            
             # Tronquer si trop long (BERT a une limite)
-            text = response_text[:512]
-            
-            result = self.sentiment_analyzer(text)[0]
-            
-            # Le modèle retourne des scores pour 1-5 étoiles
-            # On normalise vers -1 (négatif) à 1 (positif)
-            label_to_score = {
-                '1 star': -1.0,
-                '2 stars': -0.5,
-                '3 stars': 0.0,
-                '4 stars': 0.5,
-                '5 stars': 1.0
-            }
+            results = self.sentiment_analyzer([responses[i][:512] for i in scored])
             
-            # Prendre le label avec le plus haut score
-            top_label = max(result, key=lambda x: x['score'])
-            sentiment_score = label_to_score.get(top_label['label'], 0.0)
-            
-            # Pondérer par la confiance du modèle
-            return sentiment_score * top_label['score']
+            for i, result in zip(scored, results):
+                scores[i] = self._sentiment_from_labels(result)
+            return scores
             
         except Exception as e:
             print(f"⚠️  Erreur calcul sentiment: {e}")
             # Fallback: analyse basique de mots positifs/négatifs
-            return self._simple_sentiment(response_text)
+            for i in scored:
+                scores[i] = self._simple_sentiment(responses[i])
+            return scores
+    
+    def _sentiment_from_labels(self, result: List[Dict]) -> float:
+        """Score -1 à 1 à partir des scores du modèle pour 1-5 étoiles"""
+        # On normalise vers -1 (négatif) à 1 (positif)
+        label_to_score = {
+            '1 star': -1.0,
+            '2 stars': -0.5,
+            '3 stars': 0.0,
+            '4 stars': 0.5,
+            '5 stars': 1.0
+        }
+        
+        # Prendre le label avec le plus haut score
+        top_label = max(result, key=lambda x: x['score'])
+        sentiment_score = label_to_score.get(top_label['label'], 0.0)
+        
+        # Pondérer par la confiance du modèle
+        return sentiment_score * top_label['score']
     
     def _simple_sentiment(self, text: str) -> float:
         """Analyse de sentiment simple (fallback)"""
@@ -207,28 +404,48 @@ class Evaluator:
         Returns:
             Score 0-100
         """
-        if not question_text or not response_text:
-            return 0.0
+        return self.calculate_relevances([question_text], [response_text])[0]
+    
+    def calculate_relevances(self, questions: List[str], responses: List[str]) -> List[float]:
+        """
+        Pertinences d'un lot (questions et réponses encodées en un seul appel)
+        
+        Returns:
+            Score 0-100 par réponse
+        """
+        scores = [0.0] * len(responses)
+        scored = [i for i, (q, r) in enumerate(zip(questions, responses)) if q and r]
+        if not scored:
+            return scores
+        
+        if self.sentence_model is None:
+            for i in scored:
+                scores[i] = 50.0  # Score neutre par défaut
+            return scores
         
         try:
-            if self.sentence_model is None:
-                return 50.0  # Score neutre par défaut
-            
-            # Encoder question et réponse
-            question_emb = self.sentence_model.encode([question_text])
-            response_emb = self.sentence_model.encode([response_text])
+            # Encoder questions et réponses
+            embeddings = self.sentence_model.encode(
+                [questions[i] for i in scored] + [responses[i] for i in scored]
+            )
+            question_emb = np.asarray(embeddings[:len(scored)], dtype=np.float32)
+            response_emb = np.asarray(embeddings[len(scored):], dtype=np.float32)
             
-            # Similarité cosine
-            from sklearn.metrics.pairwise import cosine_similarity
-            similarity = cosine_similarity(question_emb, response_emb)[0][0]
+            # Similarité cosine (ligne à ligne)
+            norms = np.linalg.norm(question_emb, axis=1) * np.linalg.norm(response_emb, axis=1)
+            similarities = np.einsum("ij,ij->i", question_emb, response_emb) / np.maximum(norms, 1e-12)
             
             # Convertir en score 0-100
-            return float(similarity * 100)
+            for i, similarity in zip(scored, similarities):
+                scores[i] = float(similarity * 100)
+            return scores
             
         except Exception as e:
             print(f"⚠️  Erreur calcul relevance: {e}")
             # Fallback: longueur de réponse
-            return min(100, len(response_text.split()) * 5)
+            for i in scored:
+                scores[i] = min(100, len(responses[i].split()) * 5)
+            return scores
     
     def calculate_confidence(self, response_text: str) -> float:
         """
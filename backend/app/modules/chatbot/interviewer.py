@@ -2,30 +2,49 @@
 Service d'orchestration des entretiens chatbot
 Version avec chargement dynamique depuis JSON
 """
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import Dict, List, Optional
 from datetime import datetime
 import logging
 
+from app.config import get_settings
 from app.models.interview import (
     InterviewSession, InterviewQuestion, InterviewResponse,
-    InterviewStatus, InterviewPhase, QuestionCategory, QuestionDifficulty
+    InterviewStatus, InterviewPhase, QuestionCategory
 )
 from app.models.candidate import Candidate
 from app.models.job_offer import JobOffer
+from app.modules.chatbot import question_store
 from app.modules.chatbot.dataset_loader import DatasetLoader
+from app.modules.chatbot.evaluation_service import EvaluationService
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 
 class Interviewer:
     """Service principal pour gérer les entretiens"""
     
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        dataset_loader: Optional[DatasetLoader] = None,
+        evaluation_service: Optional[EvaluationService] = None
+    ):
+        """
+        Args:
+            db: Session de base de données
+            dataset_loader: Banque de questions déjà chargée (registre des modèles)
+                            Si None, le JSON est relu depuis le disque
+            evaluation_service: Évaluation ML par micro-lots (registre des modèles)
+                                Si None, analyse heuristique des mots-clés
+        """
         self.db = db
-        # ✅ CHARGER LE DATASET JSON
-        self.dataset_loader = DatasetLoader()
-        logger.info("✅ Interviewer initialisé avec dataset JSON")
+        # ✅ CHARGER LE DATASET JSON (une seule fois via le registre)
+        self.dataset_loader = dataset_loader or DatasetLoader()
+        self.evaluation_service = evaluation_service
+        logger.debug("✅ Interviewer initialisé avec dataset JSON")
     
     def start_interview(
         self,
@@ -65,35 +84,25 @@ class Interviewer:
         custom_questions = self._load_questions_from_dataset(job_offer)
         logger.info(f"✅ {len(custom_questions)} questions chargées")
         
-        # Créer session
+        # ✅ QUESTIONS CANONIQUES (enregistrées une seule fois, partagées par les sessions)
+        question_ids = question_store.question_ids(
+            self.db, custom_questions,
+            evaluator=self.evaluation_service.evaluator if self.evaluation_service else None
+        )
+        
+        # Créer session (une seule insertion, une seule transaction)
         session = InterviewSession(
             candidate_id=candidate_id,
             job_offer_id=job_offer_id,
             status=InterviewStatus.IN_PROGRESS,
             current_phase=InterviewPhase.WELCOME,
             started_at=datetime.now(),
-            questions_total=len(custom_questions),
-            questions_answered=0
+            questions_total=len(question_ids),
+            questions_answered=0,
+            question_ids=question_ids
         )
         
         self.db.add(session)
-        self.db.commit()
-        self.db.refresh(session)
-        
-        # ✅ SAUVEGARDER LES QUESTIONS EN DB
-        for q_data in custom_questions:
-            question = InterviewQuestion(
-                text=q_data['text'],
-                category=QuestionCategory[q_data['category'].upper()],
-                difficulty=QuestionDifficulty[q_data.get('difficulty', 'medium').upper()],
-                expected_keywords=q_data.get('keywords', []),
-                weight=q_data.get('weight', 1.0),
-                job_offer_id=job_offer_id,
-                job_title=job_offer.title,
-                is_generic=False
-            )
-            self.db.add(question)
-        
         self.db.commit()
         logger.info(f"✅ Session #{session.id} créée avec questions personnalisées")
         
@@ -123,16 +132,15 @@ class Interviewer:
                 "answered": session.questions_answered
             }
         
-        # ✅ CHARGER DEPUIS LA DB (PAS HARDCODÉ)
-        questions = self.db.query(InterviewQuestion).filter(
-            InterviewQuestion.job_offer_id == session.job_offer_id,
-            InterviewQuestion.is_generic == False
-        ).order_by(InterviewQuestion.id).all()
+        # ✅ QUESTION SUIVANTE PAR CLÉ PRIMAIRE (ordre propre à la session)
+        question_ids = self._session_question_ids(session)
         
-        if not questions or session.questions_answered >= len(questions):
+        if session.questions_answered >= len(question_ids):
             return self._complete_interview(session)
         
-        current = questions[session.questions_answered]
+        current = self.db.get(InterviewQuestion, question_ids[session.questions_answered])
+        if current is None:
+            return self._complete_interview(session)
         
         self._update_phase(session, current.category)
         self.db.commit()
@@ -144,7 +152,7 @@ class Interviewer:
             "category": current.category.value,
             "difficulty": current.difficulty.value,
             "current_question": session.questions_answered + 1,
-            "total_questions": len(questions),
+            "total_questions": len(question_ids),
             "phase": session.current_phase.value
         }
     
@@ -169,7 +177,7 @@ class Interviewer:
         if not session or not question:
             raise ValueError("Session ou question non trouvée")
         
-        analysis = self._analyze_response(response_text, question.expected_keywords or [])
+        analysis = self._analyze_response(response_text, question.expected_keywords or [], question=question)
         feedback = self._generate_feedback(analysis)
         
         response = InterviewResponse(
@@ -186,9 +194,12 @@ class Interviewer:
             responded_at=datetime.now()
         )
         
+        # Verrou (FOR UPDATE) après l'analyse : compteurs et sommes courantes à jour
+        self.db.refresh(session, with_for_update=True)
+        
         self.db.add(response)
         session.questions_answered += 1
-        self._update_scores(session)
+        self._update_scores(session, question, analysis["overall_score"])
         self.db.commit()
         
         next_q = self.get_next_question(session_id)
@@ -261,6 +272,33 @@ class Interviewer:
             "responses_by_category": stats
         }
     
+    def recompute_scores(self, session_id: str) -> Dict:
+        """
+        Recalcul complet des scores d'une session depuis ses réponses (audit)
+        
+        Returns:
+            dict: Scores recalculés et écart du score global avec les
+                  sommes courantes
+        """
+        session = self.db.query(InterviewSession).filter(
+            InterviewSession.id == int(session_id)
+        ).with_for_update().first()
+        
+        if not session:
+            raise ValueError(f"Session {session_id} non trouvée")
+        
+        previous_overall = session.overall_score or 0.0
+        self._recompute_scores(session)
+        self.db.commit()
+        
+        return {
+            "session_id": str(session.id),
+            "technical_score": round(session.technical_score, 2),
+            "behavioral_score": round(session.behavioral_score, 2),
+            "overall_score": round(session.overall_score, 2),
+            "drift": round(session.overall_score - previous_overall, 4)
+        }
+    
     def abandon_session(self, session_id: str) -> Dict:
         """Abandonner"""
         session = self.db.query(InterviewSession).filter(
@@ -311,6 +349,24 @@ class Interviewer:
         
         return all_q[:10]
     
+    def _session_question_ids(self, session: InterviewSession) -> List[int]:
+        """
+        Ids ordonnés des questions de la session
+        
+        Les sessions créées avant la colonne question_ids reçoivent une fois
+        les `questions_total` premières questions de l'offre (celles que
+        l'ancienne lecture par offre leur posait).
+        """
+        if session.question_ids is None:
+            rows = self.db.query(InterviewQuestion.id).filter(
+                InterviewQuestion.job_offer_id == session.job_offer_id,
+                InterviewQuestion.is_generic == False
+            ).order_by(InterviewQuestion.id).limit(session.questions_total).all()
+            session.question_ids = [row.id for row in rows]
+            logger.info(f"🔁 Session #{session.id} : {len(rows)} questions rattachées")
+        
+        return session.question_ids
+    
     def _update_phase(self, session: InterviewSession, category: QuestionCategory):
         """Mettre à jour la phase"""
         if category == QuestionCategory.WELCOME:
@@ -320,8 +376,25 @@ class Interviewer:
         elif category == QuestionCategory.BEHAVIORAL:
             session.current_phase = InterviewPhase.BEHAVIORAL
     
-    def _analyze_response(self, response: str, keywords: List[str]) -> Dict:
-        """Analyser la réponse"""
+    def _analyze_response(
+        self,
+        response: str,
+        keywords: List[str],
+        question: Optional[InterviewQuestion] = None
+    ) -> Dict:
+        """Analyser la réponse (Evaluator par micro-lots si activé, sinon heuristique)"""
+        if self.evaluation_service is not None:
+            try:
+                return self.evaluation_service.evaluate(
+                    question.text if question else "", response, keywords,
+                    keyword_vectors=question_store.stored_keyword_vectors(
+                        question, self.evaluation_service.evaluator
+                    ) if question else None,
+                    timeout=settings.evaluation_timeout_s
+                )
+            except Exception as e:
+                logger.warning(f"⚠️  Évaluation ML indisponible, analyse heuristique : {e!r}")
+        
         response_lower = response.lower()
         
         keyword_count = sum(1 for kw in keywords if kw.lower() in response_lower)
@@ -353,27 +426,47 @@ class Interviewer:
         else:
             return "Développez davantage."
     
-    def _update_scores(self, session: InterviewSession):
-        """Mettre à jour les scores"""
-        responses = self.db.query(InterviewResponse).filter(
-            InterviewResponse.session_id == session.id
-        ).all()
-        
-        if not responses:
+    def _update_scores(self, session: InterviewSession, question: InterviewQuestion, response_score: float):
+        """Ajouter une réponse aux sommes courantes de la session (temps constant)"""
+        if session.technical_count is None or session.behavioral_count is None:
+            # Session antérieure aux compteurs : recalcul complet, une seule fois
+            self._recompute_scores(session)
             return
         
-        tech = [r.overall_response_score * r.question.weight 
-                for r in responses 
-                if r.question.category == QuestionCategory.TECHNICAL]
+        weighted = response_score * question.weight
+        
+        if question.category == QuestionCategory.TECHNICAL:
+            session.technical_score_sum += weighted
+            session.technical_count += 1
+        elif question.category == QuestionCategory.BEHAVIORAL:
+            session.behavioral_score_sum += weighted
+            session.behavioral_count += 1
         
-        beh = [r.overall_response_score * r.question.weight 
-               for r in responses 
-               if r.question.category == QuestionCategory.BEHAVIORAL]
+        self._apply_running_scores(session)
+    
+    def _recompute_scores(self, session: InterviewSession):
+        """Sommes et nombres de réponses recalculés en une requête agrégée"""
+        self.db.flush()  # Réponse en cours d'ajout comprise (autoflush désactivé)
+        rows = self.db.query(
+            InterviewQuestion.category,
+            func.sum(InterviewResponse.overall_response_score * InterviewQuestion.weight),
+            func.count(InterviewResponse.id)
+        ).join(InterviewResponse.question).filter(
+            InterviewResponse.session_id == session.id
+        ).group_by(InterviewQuestion.category).all()
         
-        if tech:
-            session.technical_score = sum(tech) / len(tech)
-        if beh:
-            session.behavioral_score = sum(beh) / len(beh)
+        totals = {category: (total or 0.0, count) for category, total, count in rows}
+        session.technical_score_sum, session.technical_count = totals.get(QuestionCategory.TECHNICAL, (0.0, 0))
+        session.behavioral_score_sum, session.behavioral_count = totals.get(QuestionCategory.BEHAVIORAL, (0.0, 0))
+        
+        self._apply_running_scores(session)
+    
+    def _apply_running_scores(self, session: InterviewSession):
+        """Moyennes pondérées par catégorie et score global (60% tech, 40% comportemental)"""
+        if session.technical_count:
+            session.technical_score = session.technical_score_sum / session.technical_count
+        if session.behavioral_count:
+            session.behavioral_score = session.behavioral_score_sum / session.behavioral_count
         
         session.overall_score = (session.technical_score * 0.6) + (session.behavioral_score * 0.4)
     
@@ -0,0 +1,210 @@
+"""
+Module 4 - Questions d'entretien canoniques
+Une ligne interview_questions par question de la banque JSON (text_hash)
+
+Les questions sont enregistrées une seule fois (au démarrage, puis à la
+première apparition d'une question absente) et référencées par les sessions
+(interview_sessions.question_ids) : démarrer un entretien ne crée plus de
+copie des questions.
+
+Avec l'évaluation ML, les vecteurs spaCy des mots-clés attendus sont
+calculés à l'enregistrement (keyword_vectors) : l'analyse d'une réponse ne
+réanalyse plus les mots-clés.
+"""
+
+import hashlib
+import logging
+import re
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import insert, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.interview import InterviewQuestion, QuestionCategory, QuestionDifficulty
+from app.modules.chatbot.dataset_loader import DatasetLoader
+from app.modules.chatbot.evaluator import Evaluator
+
+logger = logging.getLogger(__name__)
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def question_hash(text: str) -> str:
+    """sha256 du texte normalisé (espaces réduits, minuscules)"""
+    normalized = WHITESPACE_PATTERN.sub(" ", text).strip().lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _keyword_vector_columns(keywords: List[str], evaluator: Optional[Evaluator]) -> Dict:
+    """Colonnes keyword_vectors / keyword_vectors_model (aucune sans vecteurs statiques)"""
+    model = evaluator.vector_model if evaluator is not None else None
+    if model is None:
+        return {}
+    return {
+        "keyword_vectors": evaluator.keyword_vectors(keywords).tolist(),
+        "keyword_vectors_model": model
+    }
+
+
+def _question_row(q_data: Dict, text_hash: str, evaluator: Optional[Evaluator] = None) -> Dict:
+    """Colonnes d'une question canonique à partir d'une entrée de la banque JSON"""
+    keywords = q_data.get("keywords", [])
+    return {
+        "text": q_data["text"],
+        "text_hash": text_hash,
+        "category": QuestionCategory[q_data["category"].upper()],
+        "difficulty": QuestionDifficulty[q_data.get("difficulty", "medium").upper()],
+        "expected_keywords": keywords,
+        "weight": q_data.get("weight", 1.0),
+        "job_title": q_data.get("job_title"),
+        "is_generic": True,
+        **_keyword_vector_columns(keywords, evaluator)
+    }
+
+
+def stored_keyword_vectors(question: InterviewQuestion, evaluator: Evaluator) -> Optional[List[List[float]]]:
+    """Vecteurs stockés des mots-clés, s'ils viennent du pipeline de l'évaluateur"""
+    if question.keyword_vectors_model is None or question.keyword_vectors_model != evaluator.vector_model:
+        return None
+    return question.keyword_vectors
+
+
+def _ids_by_hash(db: Session, hashes: Iterable[str]) -> Dict[str, int]:
+    """Ids des questions canoniques existantes, par text_hash"""
+    hashes = list(set(hashes))
+    if not hashes:
+        return {}
+    rows = db.query(InterviewQuestion.id, InterviewQuestion.text_hash)\
+        .filter(InterviewQuestion.text_hash.in_(hashes)).all()
+    return {row.text_hash: row.id for row in rows}
+
+
+def question_ids(db: Session, questions: List[Dict], evaluator: Optional[Evaluator] = None) -> List[int]:
+    """
+    Ids canoniques des questions, dans l'ordre donné
+
+    Une requête pour les questions déjà enregistrées ; les absentes sont
+    insérées d'un bloc et validées dans leur propre transaction (partagées
+    par toutes les sessions). Un démarrage simultané qui les insère en
+    premier gagne.
+
+    Args:
+        questions: Entrées de la banque JSON (text, category, keywords...)
+        evaluator: Évaluateur ML (vecteurs des mots-clés des questions insérées)
+
+    Returns:
+        List[int]: Ids de interview_questions
+    """
+    hashes = [question_hash(q_data["text"]) for q_data in questions]
+    ids = _ids_by_hash(db, hashes)
+
+    missing = {}
+    for text_hash, q_data in zip(hashes, questions):
+        if text_hash not in ids and text_hash not in missing:
+            missing[text_hash] = _question_row(q_data, text_hash, evaluator)
+
+    if missing:
+        try:
+            db.execute(insert(InterviewQuestion), list(missing.values()))
+            db.commit()
+            logger.info(f"📥 {len(missing)} question(s) canonique(s) enregistrée(s)")
+        except IntegrityError:
+            db.rollback()
+            logger.info("♻️  Questions déjà enregistrées par un autre démarrage")
+        ids = _ids_by_hash(db, hashes)
+
+    return [ids[text_hash] for text_hash in hashes]
+
+
+# Colonnes reprises de la banque JSON à chaque synchronisation
+BANK_COLUMNS = ("text", "category", "difficulty", "expected_keywords", "weight", "job_title")
+
+
+def update_changed_questions(db: Session, questions: List[Dict]) -> int:
+    """
+    Met à jour les questions canoniques dont les données (mots-clés, poids,
+    catégorie, difficulté...) diffèrent de la banque JSON ; les vecteurs des
+    mots-clés modifiés sont effacés (recalculés par refresh_keyword_vectors)
+
+    Returns:
+        int: Nombre de questions mises à jour
+    """
+    bank_rows = {}
+    for q_data in questions:
+        text_hash = question_hash(q_data["text"])
+        bank_rows.setdefault(text_hash, _question_row(q_data, text_hash))
+    if not bank_rows:
+        return 0
+
+    stored = db.query(InterviewQuestion.id, InterviewQuestion.text_hash, *[
+        getattr(InterviewQuestion, column) for column in BANK_COLUMNS
+    ]).filter(InterviewQuestion.text_hash.in_(list(bank_rows))).all()
+
+    changes = []
+    for row in stored:
+        bank_row = bank_rows[row.text_hash]
+        changed = {column: bank_row[column] for column in BANK_COLUMNS if getattr(row, column) != bank_row[column]}
+        if not changed:
+            continue
+        if "expected_keywords" in changed:
+            changed.update(keyword_vectors=None, keyword_vectors_model=None)
+        changes.append({"id": row.id, **changed})
+
+    if not changes:
+        return 0
+
+    db.execute(update(InterviewQuestion), changes)
+    db.commit()
+    logger.info(f"✏️  {len(changes)} question(s) canonique(s) mise(s) à jour depuis la banque")
+    return len(changes)
+
+
+def refresh_keyword_vectors(db: Session, evaluator: Evaluator) -> int:
+    """
+    Calcule les vecteurs des mots-clés des questions canoniques qui n'en ont
+    pas, ou dont les vecteurs viennent d'un autre pipeline spaCy
+
+    Returns:
+        int: Nombre de questions mises à jour
+    """
+    model = evaluator.vector_model
+    if model is None:
+        return 0
+
+    rows = db.query(InterviewQuestion.id, InterviewQuestion.expected_keywords).filter(
+        InterviewQuestion.text_hash.isnot(None),
+        or_(InterviewQuestion.keyword_vectors_model.is_(None),
+            InterviewQuestion.keyword_vectors_model != model)
+    ).all()
+    if not rows:
+        return 0
+
+    db.execute(update(InterviewQuestion), [
+        {"id": row.id, **_keyword_vector_columns(row.expected_keywords or [], evaluator)}
+        for row in rows
+    ])
+    db.commit()
+    logger.info(f"🧮 Vecteurs des mots-clés calculés pour {len(rows)} question(s) ({model})")
+    return len(rows)
+
+
+def sync_questions(db: Session, dataset_loader: DatasetLoader, evaluator: Optional[Evaluator] = None) -> int:
+    """
+    Enregistre toutes les questions de la banque JSON (au démarrage), met à
+    jour celles qui ont changé et, avec un évaluateur ML, calcule les
+    vecteurs de leurs mots-clés
+
+    Returns:
+        int: Nombre de questions de la banque
+    """
+    bank = dataset_loader.questions_bank
+    questions = list(bank.get("welcome", [])) + list(bank.get("behavioral", []))
+    for job_title, job_questions in bank.get("technical", {}).items():
+        questions.extend({**q_data, "job_title": job_title} for q_data in job_questions)
+
+    question_ids(db, questions, evaluator)
+    update_changed_questions(db, questions)
+    if evaluator is not None:
+        refresh_keyword_vectors(db, evaluator)
+    return len(questions)
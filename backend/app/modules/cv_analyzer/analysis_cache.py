@@ -0,0 +1,132 @@
+"""
+Module 3 - Cache des analyses de CV
+Résultats d'ImprovedCVAnalyzer indexés par le contenu du CV et les exigences de l'offre
+Redis si disponible, sinon cache LRU en mémoire
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.config import get_settings
+from app.database import get_redis
+from app.modules.cv_analyzer.improved_analyzer import ANALYZER_VERSION
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+KEY_PREFIX = "cv_analysis"
+LRU_MAX_SIZE = 1024
+
+# Fallback en mémoire : clé -> (expiration, JSON)
+_lru: "OrderedDict[str, tuple]" = OrderedDict()
+_lru_lock = threading.Lock()
+
+
+def make_cache_key(cv_text: str, job_requirements: Dict) -> str:
+    """
+    Construit la clé de cache
+
+    sha256(texte du CV) + hash des exigences de l'offre (required_skills,
+    nice_to_have_skills, experience_min_years, education_level) + version
+    de l'analyseur
+
+    Args:
+        cv_text: Texte du CV
+        job_requirements: Exigences au format ImprovedCVAnalyzer.analyze
+
+    Returns:
+        str: Clé de cache
+    """
+    cv_hash = hashlib.sha256((cv_text or "").encode("utf-8")).hexdigest()
+    job_payload = json.dumps(
+        {
+            "required_skills": job_requirements.get("required_skills", []),
+            "nice_to_have_skills": job_requirements.get("nice_to_have_skills", []),
+            "experience_min_years": job_requirements.get("experience_min_years", 0),
+            "education_level": job_requirements.get("education_level", "")
+        },
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    job_hash = hashlib.sha256(job_payload.encode("utf-8")).hexdigest()[:16]
+
+    return f"{KEY_PREFIX}:{ANALYZER_VERSION}:{cv_hash}:{job_hash}"
+
+
+def get_cached_analysis(cv_text: str, job_requirements: Dict) -> Optional[Dict]:
+    """
+    Retourne l'analyse en cache ou None
+
+    Returns:
+        dict: Analyse (nouvelle copie à chaque appel) ou None
+    """
+    if not settings.enable_cache:
+        return None
+
+    key = make_cache_key(cv_text, job_requirements)
+    payload = None
+
+    redis_client = get_redis()
+    if redis_client is not None:
+        try:
+            payload = redis_client.get(key)
+        except Exception as e:
+            logger.warning(f"⚠️  Redis indisponible pour le cache d'analyse : {e}")
+
+    if payload is None:
+        payload = _lru_get(key)
+
+    if payload is None:
+        return None
+
+    logger.debug(f"♻️  Analyse servie depuis le cache : {key}")
+    return json.loads(payload)
+
+
+def set_cached_analysis(cv_text: str, job_requirements: Dict, analysis: Dict):
+    """
+    Enregistre une analyse dans le cache (TTL : settings.cache_ttl)
+    """
+    if not settings.enable_cache:
+        return
+
+    key = make_cache_key(cv_text, job_requirements)
+    payload = json.dumps(analysis, ensure_ascii=False)
+
+    redis_client = get_redis()
+    if redis_client is not None:
+        try:
+            redis_client.set(key, payload, ex=settings.cache_ttl)
+            return
+        except Exception as e:
+            logger.warning(f"⚠️  Redis indisponible pour le cache d'analyse : {e}")
+
+    _lru_set(key, payload)
+
+
+# ============ Cache LRU en mémoire ============
+
+def _lru_get(key: str) -> Optional[str]:
+    with _lru_lock:
+        entry = _lru.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at < time.monotonic():
+            del _lru[key]
+            return None
+        _lru.move_to_end(key)
+        return payload
+
+
+def _lru_set(key: str, payload: str):
+    with _lru_lock:
+        _lru[key] = (time.monotonic() + settings.cache_ttl, payload)
+        _lru.move_to_end(key)
+        while len(_lru) > LRU_MAX_SIZE:
+            _lru.popitem(last=False)
@@ -0,0 +1,139 @@
+"""
+Module 3 - Traitement des CVs par lots
+Extraction PDF + analyse exécutées dans un pool de processus
+"""
+
+import logging
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Pool partagé par toute l'application (créé à la demande)
+_process_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# Modules NLP propres à chaque processus worker
+_worker_parser = None
+_worker_analyzer = None
+
+# Suivi des lots en cours (en mémoire, par processus uvicorn)
+_batches: Dict[str, Dict] = {}
+_batches_lock = threading.Lock()
+
+
+# ============ Côté worker ============
+
+def _init_worker():
+    """Initialise le parser et l'analyseur une seule fois par processus"""
+    global _worker_parser, _worker_analyzer
+    from app.modules.cv_analyzer.parser import CVParser
+    from app.modules.cv_analyzer.improved_analyzer import ImprovedCVAnalyzer
+
+    _worker_parser = CVParser()
+    _worker_analyzer = ImprovedCVAnalyzer()
+
+
+def analyze_cv_file(file_path: str, job_requirements: Dict) -> Dict:
+    """
+    Extrait le texte d'un PDF et l'analyse (exécuté dans un processus worker)
+
+    Args:
+        file_path: Chemin du PDF sauvegardé
+        job_requirements: Exigences de l'offre (format ImprovedCVAnalyzer.analyze)
+
+    Returns:
+        dict: {"file_path", "cv_text", "analysis"} ou {"file_path", "error"}
+    """
+    if _worker_parser is None:
+        _init_worker()
+
+    try:
+        cv_text = _worker_parser.extract_text_from_pdf(file_path)
+        analysis = _worker_analyzer.analyze(cv_text, job_requirements)
+        return {"file_path": file_path, "cv_text": cv_text, "analysis": analysis}
+    except Exception as e:
+        return {"file_path": file_path, "error": str(e)}
+
+
+# ============ Pool de processus ============
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Retourne le pool de processus partagé (taille : settings.max_workers)
+    """
+    global _process_pool
+    with _pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=settings.max_workers,
+                initializer=_init_worker
+            )
+            logger.info(f"⚙️  Pool de processus démarré ({settings.max_workers} workers)")
+        return _process_pool
+
+
+def shutdown_process_pool():
+    """Arrête le pool de processus (appelé à l'arrêt de l'application)"""
+    global _process_pool
+    with _pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+            logger.info("✅ Pool de processus arrêté")
+
+
+# ============ Suivi des lots ============
+
+def create_batch(job_offer_id: int, total_files: int) -> str:
+    """Enregistre un nouveau lot et retourne son identifiant"""
+    batch_id = uuid.uuid4().hex
+    with _batches_lock:
+        _batches[batch_id] = {
+            "batch_id": batch_id,
+            "job_offer_id": job_offer_id,
+            "status": "pending",
+            "total_files": total_files,
+            "processed": 0,
+            "created": 0,
+            "failed": 0,
+            "errors": [],
+            "created_at": datetime.now().isoformat(),
+            "completed_at": None
+        }
+    return batch_id
+
+
+def update_batch(batch_id: str, **changes):
+    """Met à jour les compteurs d'un lot"""
+    with _batches_lock:
+        batch = _batches.get(batch_id)
+        if batch is None:
+            return
+        errors = changes.pop("errors", None)
+        if errors:
+            batch["errors"].extend(errors)
+        for key, value in changes.items():
+            if key in ("processed", "created", "failed"):
+                batch[key] += value
+            else:
+                batch[key] = value
+
+
+def get_batch(batch_id: str) -> Optional[Dict]:
+    """Retourne une copie de l'état d'un lot"""
+    with _batches_lock:
+        batch = _batches.get(batch_id)
+        return {**batch, "errors": list(batch["errors"])} if batch else None
+
+
+def iter_chunks(items: List, size: int):
+    """Découpe une liste en morceaux de taille fixe"""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
@@ -0,0 +1,293 @@
+"""
+Module 3 - Stockage des CVs par contenu
+Fichiers nommés `{sha256}.pdf` + table cv_blobs (texte et données extraites)
+
+Un candidat qui postule à plusieurs offres, ou renvoie le même PDF, ne crée
+ni nouvelle copie sur disque ni nouvelle extraction : seul le scoring propre
+à l'offre est recalculé.
+
+Les fichiers sont copiés par blocs : taille limitée (settings.max_upload_size_mb)
+et sha256 calculés pendant la copie, contenu éventuellement gardé en mémoire
+pour le parser.
+
+Un même fichier peut être envoyé pendant que le dernier candidat qui le
+référence est supprimé : chaque envoi garde sa propre copie (hold_path)
+jusqu'à la validation du candidat, puis la remet en place
+(finalize_upload). La mise en place et la suppression d'un fichier
+(release_file) se font sous un verrou commun au dossier.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, NamedTuple, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.candidate import Candidate
+from app.models.cv_blob import CVBlob
+from app.modules.cv_analyzer.improved_analyzer import ANALYZER_VERSION
+
+try:
+    import fcntl
+except ImportError:  # Windows : verrou limité au processus
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+CHUNK_SIZE = 1024 * 1024  # Lecture des fichiers envoyés par blocs de 1 Mo
+HASH_FILENAME_PATTERN = re.compile(r"^([0-9a-f]{64})\.pdf$")
+LOCK_FILENAME = ".cv_store.lock"
+
+_store_lock = threading.Lock()
+
+
+class UploadTooLargeError(ValueError):
+    """Fichier envoyé plus gros que la limite autorisée"""
+
+
+class StoredUpload(NamedTuple):
+    """Fichier envoyé, enregistré sous `{sha256}.pdf`"""
+    sha256: str
+    filename: str
+    size_bytes: int
+    content: Optional[bytes]  # Contenu gardé en mémoire (keep_content=True)
+    created: bool  # Fichier écrit par cet appel (False : contenu déjà stocké)
+    hold_path: str  # Copie propre à l'envoi, jusqu'à finalize_upload / discard_upload
+
+
+def max_upload_bytes() -> int:
+    """Taille maximale d'un fichier envoyé (settings.max_upload_size_mb)"""
+    return settings.max_upload_size_mb * 1024 * 1024
+
+
+# ============ Fichiers ============
+
+def content_filename(sha256: str) -> str:
+    """Nom du fichier d'un contenu dans le dossier des CVs"""
+    return f"{sha256}.pdf"
+
+
+def blob_hash(filename: str) -> Optional[str]:
+    """sha256 d'un nom de fichier `{sha256}.pdf` (None pour les anciens noms horodatés)"""
+    match = HASH_FILENAME_PATTERN.match(filename or "")
+    return match.group(1) if match else None
+
+
+@contextmanager
+def _file_lock(upload_dir: Path):
+    """Verrou exclusif sur le dossier des CVs (threads et workers uvicorn)"""
+    with _store_lock:
+        if fcntl is None:
+            yield
+            return
+
+        with open(upload_dir / LOCK_FILENAME, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _is_referenced(db: Session, filename: str, exclude_candidate_id: Optional[int] = None) -> bool:
+    """Un candidat validé utilise ce fichier"""
+    others = db.query(Candidate.id).filter(Candidate.cv_filename == filename)
+    if exclude_candidate_id is not None:
+        others = others.filter(Candidate.id != exclude_candidate_id)
+    return others.first() is not None
+
+
+def save_upload(
+    source: BinaryIO,
+    upload_dir: Path,
+    max_bytes: Optional[int] = None,
+    keep_content: bool = False
+) -> StoredUpload:
+    """
+    Copie un fichier envoyé dans le dossier des CVs en calculant son sha256
+
+    Le contenu est écrit par blocs dans un fichier temporaire, lié sous
+    `{sha256}.pdf` s'il n'existe pas encore. Le fichier temporaire est
+    conservé (hold_path) : l'appelant le remet en place avec finalize_upload
+    une fois le candidat validé, ou le supprime avec discard_upload.
+    La copie s'arrête dès que la limite de taille est dépassée.
+
+    Args:
+        source: Fichier ouvert en lecture binaire (UploadFile.file, membre ZIP...)
+        upload_dir: Dossier des CVs
+        max_bytes: Taille maximale (défaut : settings.max_upload_size_mb)
+        keep_content: Garder le contenu en mémoire (passé ensuite au parser)
+
+    Returns:
+        StoredUpload: sha256, nom du fichier, taille, contenu éventuel, fichier créé, copie
+
+    Raises:
+        UploadTooLargeError: Si le fichier dépasse max_bytes (rien n'est conservé)
+    """
+    max_bytes = max_upload_bytes() if max_bytes is None else max_bytes
+    digest = hashlib.sha256()
+    content = bytearray() if keep_content else None
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=upload_dir, suffix=".part")
+
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(
+                        f"Fichier trop volumineux (maximum {max_bytes // (1024 * 1024)} Mo)"
+                    )
+                digest.update(chunk)
+                buffer.write(chunk)
+                if content is not None:
+                    content += chunk
+
+        sha256 = digest.hexdigest()
+        filename = content_filename(sha256)
+        target = upload_dir / filename
+
+        with _file_lock(upload_dir):
+            created = not target.exists()
+            if created:
+                os.link(tmp_path, target)
+        if not created:
+            logger.info(f"♻️  CV déjà stocké : {filename}")
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return StoredUpload(
+        sha256, filename, size, bytes(content) if content is not None else None, created, tmp_path
+    )
+
+
+def finalize_upload(stored: StoredUpload, upload_dir: Path):
+    """
+    Remet la copie d'un envoi en place sous `{sha256}.pdf`, après la
+    validation du candidat qui le référence
+
+    Le contenu est identique : remplacer le fichier existant est sans effet,
+    et le restaure s'il a été supprimé entre-temps (release_file).
+    """
+    if not os.path.exists(stored.hold_path):
+        return
+    with _file_lock(upload_dir):
+        os.replace(stored.hold_path, upload_dir / stored.filename)
+        # rename() ne fait rien si les deux noms désignent déjà le même fichier
+        Path(stored.hold_path).unlink(missing_ok=True)
+
+
+def discard_upload(db: Session, stored: StoredUpload, upload_dir: Path):
+    """
+    Abandonne un envoi non validé : supprime sa copie, et le fichier
+    `{sha256}.pdf` qu'il a créé si aucun candidat ne l'utilise
+
+    Sans effet sur un envoi déjà passé par finalize_upload.
+    """
+    if not os.path.exists(stored.hold_path):
+        return
+    Path(stored.hold_path).unlink(missing_ok=True)
+    if not stored.created:
+        return
+
+    with _file_lock(upload_dir):
+        if not _is_referenced(db, stored.filename):
+            (upload_dir / stored.filename).unlink(missing_ok=True)
+
+
+def release_file(db: Session, filename: str, upload_dir: Path, exclude_candidate_id: Optional[int] = None):
+    """
+    Supprime le fichier CV (et sa ligne cv_blobs) s'il n'est plus utilisé
+    par aucun autre candidat
+
+    Un envoi du même contenu en cours garde sa copie et remet le fichier
+    en place à sa validation (finalize_upload).
+
+    Args:
+        filename: Nom du fichier du candidat supprimé
+        exclude_candidate_id: Candidat en cours de suppression
+    """
+    if not filename:
+        return
+
+    with _file_lock(upload_dir):
+        if _is_referenced(db, filename, exclude_candidate_id):
+            logger.info(f"📎 Fichier CV conservé (partagé) : {filename}")
+            return
+
+        sha256 = blob_hash(filename)
+        if sha256:
+            db.query(CVBlob).filter(CVBlob.sha256 == sha256).delete(synchronize_session=False)
+
+        cv_path = upload_dir / filename
+        if cv_path.exists():
+            cv_path.unlink()
+            logger.info(f"🗑️ Fichier CV supprimé : {filename}")
+
+
+# ============ Résultats d'extraction ============
+
+def get_blobs(db: Session, hashes: Iterable[str]) -> Dict[str, CVBlob]:
+    """Lignes cv_blobs existantes, par sha256"""
+    hashes = list(set(hashes))
+    if not hashes:
+        return {}
+    return {blob.sha256: blob for blob in db.query(CVBlob).filter(CVBlob.sha256.in_(hashes))}
+
+
+def cached_extraction(blob: Optional[CVBlob]) -> Optional[Dict]:
+    """Données extraites réutilisables (None si absentes ou d'une ancienne version)"""
+    if blob is None or blob.extracted_data is None or blob.analyzer_version != ANALYZER_VERSION:
+        return None
+    return blob.extracted_data
+
+
+def save_blob(
+    db: Session,
+    sha256: str,
+    size_bytes: int,
+    cv_text: str,
+    extracted_data: Optional[Dict] = None,
+    original_filename: Optional[str] = None
+):
+    """
+    Enregistre (ou complète) le texte et les données extraites d'un contenu
+
+    Validé dans sa propre transaction, avant la création du candidat : un
+    candidat refusé (email en double) n'empêche pas la réutilisation.
+    Un envoi simultané du même fichier qui crée la ligne en premier gagne.
+    """
+    try:
+        blob = db.query(CVBlob).filter(CVBlob.sha256 == sha256).first()
+        if blob is None:
+            blob = CVBlob(
+                sha256=sha256,
+                filename=content_filename(sha256),
+                original_filename=original_filename,
+                size_bytes=size_bytes
+            )
+            db.add(blob)
+
+        blob.cv_text = cv_text
+        if extracted_data is not None:
+            blob.extracted_data = extracted_data
+            blob.analyzer_version = ANALYZER_VERSION
+
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        logger.info(f"♻️  Extraction déjà enregistrée : {sha256[:12]}")
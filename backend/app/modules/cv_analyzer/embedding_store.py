@@ -0,0 +1,213 @@
+"""
+Module 3 - Cache persistant des embeddings de compétences
+Matrice float32 sur disque (memory-mappée) + index texte -> ligne
+
+Les mêmes compétences ("Python", "Docker", "React"...) reviennent dans
+presque tous les CVs : chaque texte n'est encodé qu'une fois par le
+SentenceTransformer, puis relu depuis le disque. Le fichier est mappé en
+lecture seule, les workers uvicorn partagent donc les mêmes pages mémoire.
+
+Fichiers (dans settings.embeddings_dir) :
+    {name}.meta.json  : modèle et dimension des vecteurs
+    {name}.f32        : vecteurs normalisés (float32, une ligne par texte)
+    {name}.keys       : un texte par ligne (JSON), ligne i <-> vecteur i
+    {name}.lock       : verrou des ajouts entre processus
+"""
+
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, List
+
+import numpy as np
+
+from app.config import get_settings
+
+try:
+    import fcntl
+except ImportError:  # Windows : verrou limité au processus
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+DTYPE = np.float32
+
+
+class EmbeddingStore:
+    """
+    Cache d'embeddings partagé entre requêtes, redémarrages et workers
+
+    Les textes absents sont encodés en un seul batch puis ajoutés en fin de
+    fichier ; les vecteurs déjà écrits ne sont jamais modifiés.
+    """
+
+    def __init__(self, model, model_name: str, directory: str = None, name: str = "skills"):
+        """
+        Args:
+            model: SentenceTransformer chargé
+            model_name: Nom du modèle (un changement de modèle vide le cache)
+            directory: Dossier des fichiers (défaut : settings.embeddings_dir)
+            name: Préfixe des fichiers
+        """
+        self.model = model
+        self.model_name = model_name
+        self.dim = int(model.get_sentence_embedding_dimension())
+
+        directory = directory or settings.embeddings_dir
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, name)
+        self.meta_path = f"{base}.meta.json"
+        self.vectors_path = f"{base}.f32"
+        self.keys_path = f"{base}.keys"
+        self.lock_path = f"{base}.lock"
+
+        self._index: Dict[str, int] = {}
+        self._vectors = np.empty((0, self.dim), dtype=DTYPE)
+        self._keys_offset = 0
+        self._lock = threading.Lock()
+
+        with self._lock, self._file_lock():
+            self._check_meta()
+            self._refresh()
+
+        logger.info(f"🗄️  Cache d'embeddings '{name}' : {len(self._index)} vecteurs ({self.dim} dims)")
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Retourne les vecteurs normalisés (norme L2) des textes, dans l'ordre
+
+        Args:
+            texts: Textes à encoder (doublons autorisés)
+
+        Returns:
+            np.ndarray: Matrice (len(texts), dim) en float32
+        """
+        if not texts:
+            return np.empty((0, self.dim), dtype=DTYPE)
+
+        rows = [self._index.get(text) for text in texts]
+
+        if None in rows:
+            with self._lock:
+                self._add_missing(texts)
+            rows = [self._index[text] for text in texts]
+
+        # Les vecteurs sont remappés avant la mise à jour de l'index :
+        # toute ligne connue de l'index existe dans self._vectors
+        return np.array(self._vectors[rows], dtype=DTYPE)
+
+    # ============ Ajout des textes manquants ============
+
+    def _add_missing(self, texts: List[str]):
+        """
+        Encode les textes absents (un seul batch) et les ajoute au fichier
+        """
+        # Un autre worker a peut-être déjà ajouté ces textes
+        self._refresh()
+        missing = [t for t in dict.fromkeys(texts) if t not in self._index]
+        if not missing:
+            return
+
+        with self._file_lock():
+            self._refresh()
+            missing = [t for t in missing if t not in self._index]
+            if not missing:
+                return
+
+            vectors = self._encode_normalized(missing)
+            row_bytes = self.dim * DTYPE().itemsize
+
+            # Vecteurs d'abord, puis les clés : un arrêt entre les deux laisse
+            # des lignes orphelines, écrasées au prochain ajout (truncate)
+            with open(self.vectors_path, "r+b" if os.path.exists(self.vectors_path) else "wb") as f:
+                f.truncate(len(self._index) * row_bytes)
+                f.seek(0, os.SEEK_END)
+                f.write(vectors.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+            with open(self.keys_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(t, ensure_ascii=False) + "\n" for t in missing))
+
+            self._refresh()
+
+        logger.debug(f"🗄️  {len(missing)} embeddings ajoutés au cache ({len(self._index)} au total)")
+
+    def _encode_normalized(self, texts: List[str]) -> np.ndarray:
+        embeddings = np.asarray(
+            self.model.encode(texts, batch_size=64, convert_to_numpy=True), dtype=DTYPE
+        )
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return embeddings / norms
+
+    # ============ Synchronisation avec le disque ============
+
+    def _refresh(self):
+        """
+        Lit les clés ajoutées depuis la dernière lecture (par ce processus
+        ou un autre) et remappe la matrice si elle a grandi
+        """
+        if not os.path.exists(self.keys_path):
+            return
+
+        with open(self.keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            chunk = f.read()
+
+        # Ignorer une ligne en cours d'écriture
+        complete = chunk[:chunk.rfind(b"\n") + 1]
+        if not complete:
+            return
+
+        # Découpage sur b"\n" seulement : str.splitlines() couperait aussi les
+        # clés contenant U+2028, U+2029 ou \x85 (laissés tels quels par json.dumps)
+        new_keys = [json.loads(line.decode("utf-8")) for line in complete.split(b"\n")[:-1]]
+        total = len(self._index) + len(new_keys)
+
+        self._vectors = np.memmap(self.vectors_path, dtype=DTYPE, mode="r", shape=(total, self.dim))
+
+        index = dict(self._index)
+        for key in new_keys:
+            index[key] = len(index)
+        self._index = index
+        self._keys_offset += len(complete)
+
+    def _check_meta(self):
+        """
+        Vide le cache si le modèle ou la dimension ont changé
+        """
+        meta = {"model": self.model_name, "dim": self.dim}
+
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                if json.load(f) == meta:
+                    return
+            logger.warning(f"⚠️  Modèle d'embeddings changé, cache réinitialisé : {self.meta_path}")
+
+        for path in (self.vectors_path, self.keys_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    @contextmanager
+    def _file_lock(self):
+        """Verrou exclusif entre processus (workers uvicorn, scripts)"""
+        if fcntl is None:
+            yield
+            return
+
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -1,22 +1,75 @@
 """
 Module d'export Excel pour les candidats
 Génère des fichiers Excel avec données et graphiques
+
+Export en flux : les candidats sont lus un par un (requête yield_per) et
+écrits au fil de l'eau (openpyxl en mode write-only), en un seul passage
+qui alimente aussi les statistiques. La mémoire utilisée ne dépend plus
+du nombre de candidats.
 """
 
+import csv
+import io
 import logging
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional
 from pathlib import Path
 from datetime import datetime
-import pandas as pd
-from openpyxl import load_workbook
-from openpyxl.chart import BarChart, PieChart, Reference
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.chart import BarChart, Reference
 from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl.utils import get_column_letter
 
 from app.models.candidate import Candidate
 
 logger = logging.getLogger(__name__)
 
+# ============ Colonnes des feuilles ============
+
+# (en-tête, largeur) : les largeurs sont fixées avant l'écriture (mode write-only)
+CANDIDATE_COLUMNS = [
+    ("ID", 8),
+    ("Nom", 28),
+    ("Email", 32),
+    ("Téléphone", 16),
+    ("Score CV", 10),
+    ("Score Final", 12),
+    ("Catégorie", 16),
+    ("Compétences", 13),
+    ("Expérience (ans)", 17),
+    ("Formation", 22),
+    ("Langues", 9),
+    ("Statut", 12),
+    ("Date candidature", 17),
+    ("Recommandation", 50),
+]
+
+DETAILS_COLUMNS = [
+    ("Candidat", 28),
+    ("Email", 32),
+    ("Téléphone", 16),
+    ("Score Global", 13),
+    ("Score Compétences", 18),
+    ("Score Expérience", 17),
+    ("Score Formation", 16),
+    ("Score Langues", 14),
+    ("Compétences", 50),
+    ("Expérience", 12),
+    ("Recommandation", 50),
+]
+
+SCORE_COLUMN = 4  # "Score CV" (index dans CANDIDATE_COLUMNS)
+CSV_FLUSH_ROWS = 500
+
+HEADER_FILL = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+HEADER_FONT = Font(bold=True, color="FFFFFF")
+HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='center')
+SCORE_FILLS = {
+    "high": PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid"),
+    "good": PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid"),
+    "low": PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid"),
+}
+
 
 class ExcelExporter:
     """
@@ -30,71 +83,129 @@ class ExcelExporter:
     
     def export_candidates(
         self,
-        candidates: List[Candidate],
-        job_title: str = "Offre d'emploi"
+        candidates: Iterable[Candidate],
+        job_title: str = "Offre d'emploi",
+        output_path: Optional[Path] = None
     ) -> str:
         """
-        Exporte les candidats en fichier Excel
+        Exporte les candidats en fichier Excel (en flux)
         
         Args:
-            candidates: Liste des candidats
+            candidates: Candidats à exporter (liste ou requête yield_per)
             job_title: Titre de l'offre
+            output_path: Fichier à écrire (défaut : nom horodaté dans output_dir)
         
         Returns:
             str: Chemin du fichier généré
         """
-        if not candidates:
-            raise ValueError("Aucun candidat à exporter")
+        # Nom du fichier
+        if output_path is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_path = self.output_dir / f"candidats_{job_title.replace(' ', '_')}_{timestamp}.xlsx"
+        filepath = Path(output_path)
+        filename = filepath.name
+        
+        wb = Workbook(write_only=True)
         
-        logger.info(f"📤 Export de {len(candidates)} candidats...")
+        # Feuille 1 : Données / Feuille 2 : Statistiques / Feuille 3 : Détails
+        ws_candidates = self._create_sheet(wb, 'Candidats', CANDIDATE_COLUMNS)
+        ws_stats = wb.create_sheet('Statistiques')
+        ws_details = self._create_sheet(wb, 'Détails', DETAILS_COLUMNS)
         
-        # Préparer les données
-        data = []
+        stats = {"count": 0, "sum": 0.0, "min": None, "max": None, "categories": [0, 0, 0, 0]}
         for c in candidates:
-            extracted = c.extracted_data or {}
+            row = self._candidate_values(c)
+            row[SCORE_COLUMN] = self._score_cell(ws_candidates, row[SCORE_COLUMN])
+            ws_candidates.append(row)
+            ws_details.append(self._details_values(c))
+            self._update_stats(stats, c.cv_score or 0.0)
             
-            data.append({
-                "ID": c.id,
-                "Nom": f"{c.first_name} {c.last_name}",
-                "Email": c.email,
-                "Téléphone": c.phone,
-                "Score CV": c.cv_score,
-                "Score Final": c.final_score,
-                "Catégorie": self._get_category(c.cv_score),
-                "Compétences": len(extracted.get('skills', [])),
-                "Expérience (ans)": extracted.get('experience_years', 0),
-                "Formation": self._format_education(extracted.get('education', [])),
-                "Langues": len(extracted.get('languages', [])),
-                "Statut": c.application_status.value if c.application_status else "pending",
-                "Date candidature": c.applied_at.strftime("%d/%m/%Y") if c.applied_at else "",
-                "Recommandation": c.get_recommendation()
-            })
+            if stats["count"] % 10000 == 0:
+                logger.info(f"📤 {stats['count']} candidats exportés...")
         
-        # Créer le DataFrame
-        df = pd.DataFrame(data)
+        if not stats["count"]:
+            wb.close()
+            raise ValueError("Aucun candidat à exporter")
         
-        # Nom du fichier
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"candidats_{job_title.replace(' ', '_')}_{timestamp}.xlsx"
-        filepath = self.output_dir / filename
+        self._add_statistics_sheet(ws_stats, stats)
+        self._add_chart(ws_stats)
         
-        # Écrire dans Excel
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-            # Feuille 1 : Données
-            df.to_excel(writer, sheet_name='Candidats', index=False)
-            
-            # Feuille 2 : Statistiques
-            self._add_statistics_sheet(writer, df)
+        wb.save(filepath)
+        
+        logger.info(f"✅ Export terminé : {filename} ({stats['count']} candidats)")
+        
+        return str(filepath)
+    
+    def stream_candidates_csv(self, candidates: Iterable[Candidate]) -> Iterator[str]:
+        """
+        Exporte les candidats en CSV, morceau par morceau (pour StreamingResponse)
+        
+        Mêmes colonnes que la feuille Candidats ; BOM UTF-8 en tête pour
+        qu'Excel détecte l'encodage.
+        
+        Args:
+            candidates: Candidats à exporter (liste ou requête yield_per)
+        
+        Yields:
+            str: Blocs de lignes CSV
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        
+        buffer.write("\ufeff")
+        writer.writerow([header for header, _ in CANDIDATE_COLUMNS])
+        
+        for count, c in enumerate(candidates, start=1):
+            writer.writerow(self._candidate_values(c))
             
-            # Feuille 3 : Détails
-            self._add_details_sheet(writer, candidates)
+            if count % CSV_FLUSH_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
         
-        # Ajouter le formatage et les graphiques
-        self._format_excel(filepath, df)
+        yield buffer.getvalue()
+    
+    # ============ Lignes ============
+    
+    def _candidate_values(self, c: Candidate) -> List:
+        """Ligne de la feuille Candidats (et du CSV)"""
+        extracted = c.extracted_data or {}
         
-        logger.info(f"✅ Export terminé : {filename}")
+        return [
+            c.id,
+            f"{c.first_name} {c.last_name}",
+            c.email,
+            c.phone,
+            c.cv_score,
+            c.final_score,
+            self._get_category(c.cv_score or 0.0),
+            len(extracted.get('skills', [])),
+            extracted.get('experience_years', 0),
+            self._format_education(extracted.get('education', [])),
+            len(extracted.get('languages', [])),
+            c.application_status.value if c.application_status else "pending",
+            c.applied_at.strftime("%d/%m/%Y") if c.applied_at else "",
+            c.get_recommendation()
+        ]
+    
+    def _details_values(self, c: Candidate) -> List:
+        """Ligne de la feuille Détails"""
+        extracted = c.extracted_data or {}
+        breakdown = c.score_breakdown or {}
         
-        return str(filepath)
+        return [
+            f"{c.first_name} {c.last_name}",
+            c.email,
+            c.phone,
+            c.cv_score,
+            breakdown.get('skills', 0),
+            breakdown.get('experience', 0),
+            breakdown.get('education', 0),
+            breakdown.get('languages', 0),
+            ", ".join(extracted.get('skills', [])[:10]),
+            f"{extracted.get('experience_years', 0)} ans",
+            c.get_recommendation()
+        ]
     
     def _get_category(self, score: float) -> str:
         """Détermine la catégorie"""
@@ -128,116 +239,76 @@ class ExcelExporter:
         else:
             return 1
     
-    def _add_statistics_sheet(self, writer, df):
-        """Ajoute une feuille de statistiques"""
-        stats_data = {
-            "Métrique": [
-                "Nombre total de candidats",
-                "Score moyen",
-                "Score minimum",
-                "Score maximum",
-                "Catégorie A (≥80)",
-                "Catégorie B (65-79)",
-                "Catégorie C (50-64)",
-                "Catégorie D (<50)"
-            ],
-            "Valeur": [
-                len(df),
-                round(df['Score CV'].mean(), 1),
-                df['Score CV'].min(),
-                df['Score CV'].max(),
-                len(df[df['Score CV'] >= 80]),
-                len(df[(df['Score CV'] >= 65) & (df['Score CV'] < 80)]),
-                len(df[(df['Score CV'] >= 50) & (df['Score CV'] < 65)]),
-                len(df[df['Score CV'] < 50])
-            ]
-        }
-        
-        stats_df = pd.DataFrame(stats_data)
-        stats_df.to_excel(writer, sheet_name='Statistiques', index=False)
+    # ============ Mise en forme ============
     
-    def _add_details_sheet(self, writer, candidates):
-        """Ajoute une feuille avec détails complets"""
-        details_data = []
+    def _create_sheet(self, wb: Workbook, title: str, columns: List):
+        """Feuille write-only avec largeurs de colonnes et en-têtes formatés"""
+        ws = wb.create_sheet(title)
         
-        for c in candidates:
-            extracted = c.extracted_data or {}
-            breakdown = c.score_breakdown or {}
-            
-            details_data.append({
-                "Candidat": f"{c.first_name} {c.last_name}",
-                "Email": c.email,
-                "Téléphone": c.phone,
-                "Score Global": c.cv_score,
-                "Score Compétences": breakdown.get('skills', 0),
-                "Score Expérience": breakdown.get('experience', 0),
-                "Score Formation": breakdown.get('education', 0),
-                "Score Langues": breakdown.get('languages', 0),
-                "Compétences": ", ".join(extracted.get('skills', [])[:10]),
-                "Expérience": f"{extracted.get('experience_years', 0)} ans",
-                "Recommandation": c.get_recommendation()
-            })
+        for index, (_, width) in enumerate(columns, start=1):
+            ws.column_dimensions[get_column_letter(index)].width = width
         
-        details_df = pd.DataFrame(details_data)
-        details_df.to_excel(writer, sheet_name='Détails', index=False)
+        ws.append([self._header_cell(ws, header) for header, _ in columns])
+        return ws
     
-    def _format_excel(self, filepath, df):
-        """Ajoute le formatage et les graphiques"""
-        wb = load_workbook(filepath)
-        
-        # Formater la feuille Candidats
-        ws = wb['Candidats']
-        
-        # En-têtes en gras avec fond bleu
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF")
-        
-        for cell in ws[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-        
-        # Colorer les scores
-        for row in ws.iter_rows(min_row=2, max_row=len(df)+1, min_col=5, max_col=5):
-            for cell in row:
-                if cell.value:
-                    if cell.value >= 80:
-                        cell.fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-                    elif cell.value >= 65:
-                        cell.fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-                    elif cell.value < 50:
-                        cell.fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-        
-        # Ajuster la largeur des colonnes
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # Ajouter un graphique dans Statistiques
-        self._add_chart(wb)
+    def _header_cell(self, ws, value: str) -> WriteOnlyCell:
+        """En-têtes en gras avec fond bleu"""
+        cell = WriteOnlyCell(ws, value=value)
+        cell.fill = HEADER_FILL
+        cell.font = HEADER_FONT
+        cell.alignment = HEADER_ALIGNMENT
+        return cell
+    
+    def _score_cell(self, ws, score) -> WriteOnlyCell:
+        """Cellule de score colorée selon la catégorie"""
+        cell = WriteOnlyCell(ws, value=score)
+        if score:
+            if score >= 80:
+                cell.fill = SCORE_FILLS["high"]
+            elif score >= 65:
+                cell.fill = SCORE_FILLS["good"]
+            elif score < 50:
+                cell.fill = SCORE_FILLS["low"]
+        return cell
+    
+    def _update_stats(self, stats: Dict, score: float):
+        """Statistiques cumulées au fil de l'export"""
+        stats["count"] += 1
+        stats["sum"] += score
+        stats["min"] = score if stats["min"] is None else min(stats["min"], score)
+        stats["max"] = score if stats["max"] is None else max(stats["max"], score)
+        stats["categories"][0 if score >= 80 else 1 if score >= 65 else 2 if score >= 50 else 3] += 1
+    
+    def _add_statistics_sheet(self, ws, stats: Dict):
+        """Remplit la feuille de statistiques"""
+        count_a, count_b, count_c, count_d = stats["categories"]
+        stats_data = [
+            ("Nombre total de candidats", stats["count"]),
+            ("Score moyen", round(stats["sum"] / stats["count"], 1)),
+            ("Score minimum", stats["min"]),
+            ("Score maximum", stats["max"]),
+            ("Catégorie A (≥80)", count_a),
+            ("Catégorie B (65-79)", count_b),
+            ("Catégorie C (50-64)", count_c),
+            ("Catégorie D (<50)", count_d),
+        ]
         
-        wb.save(filepath)
+        ws.column_dimensions['A'].width = 28
+        ws.append([self._header_cell(ws, "Métrique"), self._header_cell(ws, "Valeur")])
+        for metric, value in stats_data:
+            ws.append([metric, value])
     
-    def _add_chart(self, wb):
+    def _add_chart(self, ws):
         """Ajoute un graphique de distribution"""
-        ws = wb['Statistiques']
-        
         # Graphique en barres pour les catégories
         chart = BarChart()
         chart.title = "Distribution des candidats par catégorie"
         chart.x_axis.title = "Catégorie"
         chart.y_axis.title = "Nombre de candidats"
         
-        data = Reference(ws, min_col=2, min_row=5, max_row=8)
-        cats = Reference(ws, min_col=1, min_row=5, max_row=8)
+        # Lignes 6 à 9 : catégories A à D
+        data = Reference(ws, min_col=2, min_row=6, max_row=9)
+        cats = Reference(ws, min_col=1, min_row=6, max_row=9)
         
         chart.add_data(data, titles_from_data=False)
         chart.set_categories(cats)
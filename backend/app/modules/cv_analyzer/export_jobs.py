@@ -0,0 +1,204 @@
+"""
+Module 3 - Exports Excel en tâche de fond et cache des fichiers générés
+
+Un export est identifié par une empreinte de l'offre (id, nombre de
+candidats, dernière modification d'un candidat ou de l'offre) : tant que
+rien ne change, le fichier déjà généré est réutilisé au lieu d'être
+reconstruit. Les fichiers sont supprimés au-delà d'un âge ou d'une taille
+totale maximale (settings.export_cache_max_age_hours / export_cache_max_mb).
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.candidate import Candidate
+from app.models.job_offer import JobOffer
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Suivi des exports (en mémoire, par processus uvicorn)
+_exports: Dict[str, Dict] = {}
+_exports_lock = threading.Lock()
+
+# Un seul processus d'éviction à la fois
+_eviction_lock = threading.Lock()
+
+
+# ============ Cache des fichiers ============
+
+def export_fingerprint(db: Session, job: JobOffer) -> str:
+    """
+    Empreinte du contenu d'un export : change dès qu'un candidat de l'offre
+    est ajouté, modifié ou supprimé, ou que l'offre elle-même est modifiée
+    """
+    count, last_update = db.query(
+        func.count(Candidate.id),
+        func.max(Candidate.updated_at)
+    ).filter(Candidate.job_offer_id == job.id).one()
+
+    raw = f"{job.id}|{count}|{last_update}|{job.updated_at}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def cached_export_path(output_dir: Path, job_id: int, fingerprint: str) -> Path:
+    """Chemin du fichier d'export correspondant à une empreinte"""
+    return Path(output_dir) / f"candidats_offre_{job_id}_{fingerprint}.xlsx"
+
+
+def find_cached_export(output_dir: Path, job_id: int, fingerprint: str) -> Optional[Path]:
+    """Fichier déjà généré pour cette empreinte (None sinon)"""
+    path = cached_export_path(output_dir, job_id, fingerprint)
+    if not path.exists():
+        return None
+
+    # Réutilisé : l'âge repart de zéro pour l'éviction
+    try:
+        os.utime(path)
+    except OSError:
+        return None
+    return path
+
+
+def build_export(exporter, db: Session, query, job: JobOffer, fingerprint: str) -> Path:
+    """
+    Génère l'export dans le cache (écriture dans un fichier temporaire puis
+    renommage atomique : un fichier du cache est toujours complet)
+    """
+    path = cached_export_path(exporter.output_dir, job.id, fingerprint)
+    temporary = path.with_name(f".{path.stem}.{uuid.uuid4().hex[:8]}.tmp")
+
+    try:
+        exporter.export_candidates(query, job.title, output_path=temporary)
+        os.replace(temporary, path)
+    finally:
+        if temporary.exists():
+            temporary.unlink()
+
+    evict_exports(exporter.output_dir, keep=path)
+    return path
+
+
+def evict_exports(
+    output_dir: Path,
+    max_bytes: Optional[int] = None,
+    max_age_seconds: Optional[float] = None,
+    keep: Optional[Path] = None
+) -> int:
+    """
+    Supprime les exports trop anciens, puis les plus anciens tant que la
+    taille totale dépasse la limite
+
+    Args:
+        output_dir: Dossier des exports
+        max_bytes: Taille totale maximale (défaut : settings.export_cache_max_mb)
+        max_age_seconds: Âge maximal (défaut : settings.export_cache_max_age_hours)
+        keep: Fichier à conserver quoi qu'il arrive (export qui vient d'être généré)
+
+    Returns:
+        int: Nombre de fichiers supprimés
+    """
+    if max_bytes is None:
+        max_bytes = settings.export_cache_max_mb * 1024 * 1024
+    if max_age_seconds is None:
+        max_age_seconds = settings.export_cache_max_age_hours * 3600
+
+    with _eviction_lock:
+        files = []
+        for path in Path(output_dir).glob("*.xlsx"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        # Plus récent d'abord
+        files.sort(key=lambda item: item[0], reverse=True)
+
+        now = time.time()
+        total = 0
+        removed = 0
+        for mtime, size, path in files:
+            if keep is not None and path == Path(keep):
+                total += size
+                continue
+            if now - mtime > max_age_seconds or total + size > max_bytes:
+                try:
+                    path.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+                continue
+            total += size
+
+    if removed:
+        logger.info(f"🧹 {removed} export(s) supprimé(s) du cache")
+    return removed
+
+
+# ============ Suivi des exports ============
+
+def create_export(job_offer_id: int, fingerprint: str) -> Dict:
+    """
+    Enregistre un nouvel export, ou retourne celui déjà en cours pour la
+    même empreinte (deux demandes simultanées ne génèrent qu'un fichier)
+
+    Returns:
+        dict: État de l'export ("created": False s'il existait déjà)
+    """
+    with _exports_lock:
+        _prune_exports()
+
+        for export in _exports.values():
+            if export["fingerprint"] == fingerprint and export["status"] in ("pending", "processing"):
+                return {**export, "created": False}
+
+        export_id = uuid.uuid4().hex
+        _exports[export_id] = {
+            "export_id": export_id,
+            "job_offer_id": job_offer_id,
+            "fingerprint": fingerprint,
+            "status": "pending",
+            "cached": False,
+            "filename": None,
+            "error": None,
+            "created_at": datetime.now().isoformat(),
+            "completed_at": None
+        }
+        return {**_exports[export_id], "created": True}
+
+
+def update_export(export_id: str, **changes):
+    """Met à jour l'état d'un export"""
+    with _exports_lock:
+        export = _exports.get(export_id)
+        if export is not None:
+            export.update(changes)
+
+
+def get_export(export_id: str) -> Optional[Dict]:
+    """Retourne une copie de l'état d'un export"""
+    with _exports_lock:
+        export = _exports.get(export_id)
+        return dict(export) if export else None
+
+
+def _prune_exports():
+    """Oublie les exports terminés depuis plus longtemps que la durée du cache"""
+    max_age_seconds = settings.export_cache_max_age_hours * 3600
+    now = datetime.now()
+    for export_id in list(_exports):
+        completed_at = _exports[export_id]["completed_at"]
+        if completed_at and (now - datetime.fromisoformat(completed_at)).total_seconds() > max_age_seconds:
+            del _exports[export_id]
@@ -4,11 +4,22 @@ Extraction d'informations structurées depuis le texte du CV
 Utilise : spaCy, BERT, Regex
 """
 
-import re
 import logging
 from typing import List, Dict, Optional
 from datetime import datetime
 
+from app.modules.cv_analyzer.patterns import (
+    DATE_RANGE_TEXT_PATTERN,
+    EMAIL_PATTERN,
+    EXPERIENCE_TEXT_PATTERN,
+    PHONE_PATTERNS,
+    PHONE_SEPARATORS_PATTERN,
+    UPPERCASE_NAME_PATTERN,
+    extract_degrees,
+    extract_language_levels,
+    lower_text,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -76,27 +87,20 @@ class CVExtractor:
         }
         
         # ========== EMAIL ==========
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        if emails:
-            contact["email"] = emails[0]
+        email = EMAIL_PATTERN.search(text)
+        if email:
+            contact["email"] = email.group(0)
             logger.debug(f"  ✉️  Email trouvé : {contact['email']}")
         
         # ========== TÉLÉPHONE ==========
         # Patterns français : 06 12 34 56 78, 0612345678, +33612345678
         # ========== TÉLÉPHONE ==========
         # Patterns français : 06 12 34 56 78, 0612345678, +33612345678
-        phone_patterns = [
-            r'(?:\+33|0)[1-9](?:[\s.-]?\d{2}){4}',  # Format avec espaces
-            r'(?:\+33|0)\d{9}',  # Format sans espaces
-            r'\d{2}[\s.-]\d{2}[\s.-]\d{2}[\s.-]\d{2}[\s.-]\d{2}'  # Format strict
-        ]
-        
-        for pattern in phone_patterns:
-            phones = re.findall(pattern, text)
-            if phones:
+        for pattern in PHONE_PATTERNS:
+            phone_match = pattern.search(text)
+            if phone_match:
                 # Nettoyer le numéro
-                phone = re.sub(r'[\s.-]', '', phones[0])
+                phone = PHONE_SEPARATORS_PATTERN.sub('', phone_match.group(0))
                 # Normaliser : retirer le +33 et ajouter 0
                 if phone.startswith('+33'):
                     phone = '0' + phone[3:]
@@ -108,8 +112,7 @@ class CVExtractor:
         
         # ========== NOM ==========
         # On cherche un nom en MAJUSCULES au début du CV
-        name_pattern = r'^([A-ZÀÂÄÉÈÊËÏÎÔÙÛÜŸÇ]+ [A-ZÀÂÄÉÈÊËÏÎÔÙÛÜŸÇ]+)'
-        name_match = re.search(name_pattern, text, re.MULTILINE)
+        name_match = UPPERCASE_NAME_PATTERN.search(text)
         
         if name_match:
             contact["name"] = name_match.group(1).title()
@@ -140,8 +143,8 @@ class CVExtractor:
         """
         found_skills = []
         
-        # Convertir le texte en minuscules pour la recherche
-        text_lower = text.lower()
+        # Texte en minuscules (calculé une fois par CV)
+        text_lower = lower_text(text)
         
         for skill in self.tech_skills:
             # Recherche insensible à la casse
@@ -171,8 +174,7 @@ class CVExtractor:
         - "2019-2024" (calcule la différence)
         """
         # Pattern 1 : "X ans d'expérience"
-        pattern1 = r"(\d+)\s+ans?\s+d['\']expérience"
-        match1 = re.search(pattern1, text, re.IGNORECASE)
+        match1 = EXPERIENCE_TEXT_PATTERN.search(text)
         
         if match1:
             years = int(match1.group(1))
@@ -180,8 +182,7 @@ class CVExtractor:
             return years
         
         # Pattern 2 : Dates "2019-2024"
-        pattern2 = r'(\d{4})\s*[-–]\s*(\d{4}|aujourd\'hui|présent)'
-        matches2 = re.findall(pattern2, text, re.IGNORECASE)
+        matches2 = DATE_RANGE_TEXT_PATTERN.findall(text)
         
         if matches2:
             total_years = 0
@@ -217,29 +218,8 @@ class CVExtractor:
                 {"degree": "Licence", "field": "Mathématiques", "year": "2017"}
             ]
         """
-        education = []
-        
-        # Diplômes courants
-        degrees = [
-            "Master", "Licence", "Bachelor", "Doctorat", "PhD",
-            "BTS", "DUT", "Ingénieur", "MBA", "BAC"
-        ]
-        
-        # Rechercher chaque diplôme
-        for degree in degrees:
-            # Pattern : "Master Informatique 2019"
-            pattern = rf'{degree}[^\n]{{0,100}}?(\d{{4}})?'
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            
-            for match in matches:
-                edu_text = match.group(0)
-                year_match = re.search(r'\d{4}', edu_text)
-                
-                education.append({
-                    "degree": degree,
-                    "field": edu_text.replace(degree, "").replace(year_match.group(0) if year_match else "", "").strip()[:50],
-                    "year": year_match.group(0) if year_match else ""
-                })
+        # Une seule recherche pour tous les diplômes (patterns.DEGREES)
+        education = extract_degrees(text)
         
         logger.debug(f"  🎓 {len(education)} formations trouvées")
         
@@ -255,34 +235,8 @@ class CVExtractor:
         Returns:
             list: [{"language": "Anglais", "level": "Courant"}]
         """
-        languages_list = []
-        
-        # Langues courantes
-        langs = ["Anglais", "Français", "Espagnol", "Allemand", "Italien", 
-                 "Portugais", "Chinois", "Japonais", "Arabe"]
-        
-        # Niveaux
-        levels = ["Débutant", "Intermédiaire", "Courant", "Bilingue", "Natif",
-                  "A1", "A2", "B1", "B2", "C1", "C2"]
-        
-        for lang in langs:
-            if lang.lower() in text.lower():
-                # Chercher le niveau associé
-                pattern = rf'{lang}[^\n]{{0,50}}'
-                match = re.search(pattern, text, re.IGNORECASE)
-                
-                level = "Non spécifié"
-                if match:
-                    context = match.group(0)
-                    for lvl in levels:
-                        if lvl.lower() in context.lower():
-                            level = lvl
-                            break
-                
-                languages_list.append({
-                    "language": lang,
-                    "level": level
-                })
+        # Une seule recherche pour toutes les langues (patterns.LANGUAGES)
+        languages_list = extract_language_levels(text)
         
         logger.debug(f"  🌍 {len(languages_list)} langues trouvées")
         
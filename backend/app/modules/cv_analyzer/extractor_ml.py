@@ -3,13 +3,23 @@ Module 3 - CV Extractor avec Modèle NER Fine-tuné
 Extraction d'informations avec spaCy custom model
 """
 
-import re
 import logging
 import spacy
 from typing import List, Dict, Optional
 from datetime import datetime
 from pathlib import Path
 
+from app.modules.cv_analyzer.patterns import (
+    DATE_RANGE_TEXT_PATTERN,
+    EMAIL_PATTERN,
+    EXPERIENCE_TEXT_PATTERN_ML,
+    PHONE_PATTERNS,
+    PHONE_SEPARATORS_PATTERN,
+    UPPERCASE_NAME_PATTERN,
+    extract_degrees,
+    extract_language_levels,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -61,23 +71,16 @@ class CVExtractorML:
         }
         
         # ========== EMAIL ==========
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        if emails:
-            contact["email"] = emails[0]
+        email = EMAIL_PATTERN.search(text)
+        if email:
+            contact["email"] = email.group(0)
             logger.debug(f"  ✉️  Email trouvé : {contact['email']}")
         
         # ========== TÉLÉPHONE ==========
-        phone_patterns = [
-            r'(?:\+33|0)[1-9](?:[\s.-]?\d{2}){4}',
-            r'(?:\+33|0)\d{9}',
-            r'\d{2}[\s.-]\d{2}[\s.-]\d{2}[\s.-]\d{2}[\s.-]\d{2}'
-        ]
-        
-        for pattern in phone_patterns:
-            phones = re.findall(pattern, text)
-            if phones:
-                phone = re.sub(r'[\s.-]', '', phones[0])
+        for pattern in PHONE_PATTERNS:
+            phone_match = pattern.search(text)
+            if phone_match:
+                phone = PHONE_SEPARATORS_PATTERN.sub('', phone_match.group(0))
                 if phone.startswith('+33'):
                     phone = '0' + phone[3:]
                 if len(phone) == 10 and phone.isdigit():
@@ -96,8 +99,7 @@ class CVExtractorML:
         
         # Fallback : chercher nom en MAJUSCULES
         if not contact["name"]:
-            name_pattern = r'^([A-ZÀÂÄÉÈÊËÏÎÔÙÛÜŸÇ]+ [A-ZÀÂÄÉÈÊËÏÎÔÙÛÜŸÇ]+)'
-            name_match = re.search(name_pattern, text, re.MULTILINE)
+            name_match = UPPERCASE_NAME_PATTERN.search(text)
             if name_match:
                 contact["name"] = name_match.group(1).title()
                 logger.debug(f"  👤 Nom trouvé (regex) : {contact['name']}")
@@ -173,8 +175,7 @@ class CVExtractorML:
         Extrait le nombre d'années d'expérience
         """
         # Pattern 1 : "X ans d'expérience"
-        pattern1 = r"(\d+)\s+ans?\s+d['\u2019']exp[ée]rience"
-        match1 = re.search(pattern1, text, re.IGNORECASE)
+        match1 = EXPERIENCE_TEXT_PATTERN_ML.search(text)
         
         if match1:
             years = int(match1.group(1))
@@ -182,8 +183,7 @@ class CVExtractorML:
             return years
         
         # Pattern 2 : Dates "2019-2024"
-        pattern2 = r'(\d{4})\s*[-–]\s*(\d{4}|aujourd\'hui|présent)'
-        matches2 = re.findall(pattern2, text, re.IGNORECASE)
+        matches2 = DATE_RANGE_TEXT_PATTERN.findall(text)
         
         if matches2:
             total_years = 0
@@ -209,26 +209,8 @@ class CVExtractorML:
         """
         Extrait les formations
         """
-        education = []
-        
-        degrees = [
-            "Master", "Licence", "Bachelor", "Doctorat", "PhD",
-            "BTS", "DUT", "Ingénieur", "MBA", "BAC"
-        ]
-        
-        for degree in degrees:
-            pattern = rf'{degree}[^\n]{{0,100}}?(\d{{4}})?'
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            
-            for match in matches:
-                edu_text = match.group(0)
-                year_match = re.search(r'\d{4}', edu_text)
-                
-                education.append({
-                    "degree": degree,
-                    "field": edu_text.replace(degree, "").replace(year_match.group(0) if year_match else "", "").strip()[:50],
-                    "year": year_match.group(0) if year_match else ""
-                })
+        # Une seule recherche pour tous les diplômes (patterns.DEGREES)
+        education = extract_degrees(text)
         
         logger.debug(f"  🎓 {len(education)} formations trouvées")
         
@@ -238,31 +220,8 @@ class CVExtractorML:
         """
         Extrait les langues parlées
         """
-        languages_list = []
-        
-        langs = ["Anglais", "Français", "Espagnol", "Allemand", "Italien", 
-                 "Portugais", "Chinois", "Japonais", "Arabe"]
-        
-        levels = ["Débutant", "Intermédiaire", "Courant", "Bilingue", "Natif",
-                  "A1", "A2", "B1", "B2", "C1", "C2"]
-        
-        for lang in langs:
-            if lang.lower() in text.lower():
-                pattern = rf'{lang}[^\n]{{0,50}}'
-                match = re.search(pattern, text, re.IGNORECASE)
-                
-                level = "Non spécifié"
-                if match:
-                    context = match.group(0)
-                    for lvl in levels:
-                        if lvl.lower() in context.lower():
-                            level = lvl
-                            break
-                
-                languages_list.append({
-                    "language": lang,
-                    "level": level
-                })
+        # Une seule recherche pour toutes les langues (patterns.LANGUAGES)
+        languages_list = extract_language_levels(text)
         
         logger.debug(f"  🌍 {len(languages_list)} langues trouvées")
         
@@ -5,12 +5,30 @@ Version universelle : Tech + Marketing + Business + Design
 """
 
 import re
+from datetime import datetime
 from typing import Dict, List, Any, Optional
 from rapidfuzz import fuzz
 import logging
 
+from app.modules.cv_analyzer.patterns import (
+    CAPITALIZED_NAME_LINE_PATTERN,
+    DATE_RANGE_PATTERN,
+    EMAIL_PATTERN,
+    EXPERIENCE_YEARS_PATTERNS,
+    FRENCH_PHONE_PATTERNS,
+    PHONE_SEPARATORS_PATTERN,
+    UPPERCASE_NAME_LINE_PATTERN,
+    KeywordSearch,
+    line_context,
+    lower_text,
+)
+
 logger = logging.getLogger(__name__)
 
+# Version de l'algorithme d'analyse
+# À incrémenter à chaque changement d'extraction ou de scoring (invalide le cache)
+ANALYZER_VERSION = "1.1"
+
 # ============ LISTE DES COMPÉTENCES PROFESSIONNELLES ============
 
 PROFESSIONAL_SKILLS = {
@@ -141,6 +159,116 @@ EDUCATION_SCORES = {
     "bac": 40
 }
 
+# ============ Mots-clés de l'extraction (recherche groupée) ============
+
+# Mots exclus d'un nom de candidat
+NAME_EXCLUDED_WORDS = re.compile("|".join([
+    'CURRICULUM', 'VITAE', 'CV', 'PROFIL', 'COMPETENCES', 'COMPÉTENCES',
+    'EXPERIENCE', 'EXPÉRIENCE', 'FORMATION', 'LANGUES', 'CONTACT',
+    'EMAIL', 'TELEPHONE', 'TÉLÉPHONE', 'DEVELOPPEUR', 'DÉVELOPPEUR',
+    'ENGINEER', 'INGENIEUR', 'INGÉNIEUR', 'DATA', 'SCIENTIST',
+    'FRONTEND', 'BACKEND', 'FULLSTACK', 'FULL', 'STACK', 'SENIOR',
+    'JUNIOR', 'DESIGNER', 'ANALYST', 'MANAGER', 'DEVELOPER',
+    'ARCHITECTE', 'CONSULTANT', 'CHEF', 'DIRECTEUR', 'RESPONSABLE',
+    'MARKETING', 'DIGITAL'
+]))
+NAME_FORBIDDEN_CHARS = re.compile(r'[@#$%&*()\[\]]')
+
+# Diplômes : (diplôme, mots-clés par ordre de priorité)
+DEGREE_KEYWORDS = [
+    ("Doctorat", ["doctorat", "phd"]),
+    ("Master", ["master", "mastère"]),
+    ("Ingénieur", ["ingénieur", "ingenieur", "diplôme d'ingénieur"]),
+    ("Licence", ["licence", "bachelor", "bac+3"]),
+    ("BTS/DUT", ["bts", "dut", "bac+2"]),
+    ("Bac", ["baccalauréat", "bac"])
+]
+DEGREE_SEARCH = KeywordSearch(keyword for _, keywords in DEGREE_KEYWORDS for keyword in keywords)
+
+LANGUAGE_NAMES = {
+    "français": "Français",
+    "francais": "Français",
+    "anglais": "Anglais",
+    "arabe": "Arabe",
+    "allemand": "Allemand",
+    "espagnol": "Espagnol",
+    "italien": "Italien",
+    "chinois": "Chinois",
+    "japonais": "Japonais"
+}
+LANGUAGE_SEARCH = KeywordSearch(LANGUAGE_NAMES)
+
+# Niveaux de langue, du plus élevé au plus bas (le premier trouvé l'emporte)
+LANGUAGE_LEVEL_PATTERNS = [
+    (level, re.compile("|".join(keywords)))
+    for level, keywords in [
+        ("Courant", ["courant", "c2", "bilingue", "natif"]),
+        ("Avancé", ["avancé", "avance", "c1"]),
+        ("Intermédiaire", ["intermédiaire", "intermediaire", "b2", "b1"]),
+        ("Basique", ["basique", "débutant", "debutant", "a2", "a1"])
+    ]
+]
+
+
+# ============ AUTOMATE DE RECHERCHE DES COMPÉTENCES ============
+
+# Positions de frontière de mot (même sémantique que \b dans re)
+_WORD_BOUNDARY = re.compile(r'\b')
+
+
+def _build_skill_trie(skills) -> Dict:
+    """
+    Construit un trie caractère par caractère des compétences
+    La clé None d'un nœud contient la compétence complète
+    """
+    trie = {}
+    for skill in skills:
+        node = trie
+        for char in skill:
+            node = node.setdefault(char, {})
+        node[None] = skill
+    return trie
+
+
+# Construit une seule fois à l'import
+_SKILL_TRIE = _build_skill_trie(PROFESSIONAL_SKILLS)
+
+
+def find_professional_skills(text_lower: str) -> set:
+    """
+    Trouve toutes les compétences de PROFESSIONAL_SKILLS en un seul passage
+    
+    Équivalent à une recherche re.search délimitée par \\b pour chaque
+    compétence : le trie n'est parcouru qu'à partir des frontières de mot
+    et une correspondance n'est retenue que si elle finit sur une frontière.
+    
+    Args:
+        text_lower: Texte du CV en minuscules
+    
+    Returns:
+        set: Compétences trouvées (forme brute de PROFESSIONAL_SKILLS)
+    """
+    boundaries = {m.start() for m in _WORD_BOUNDARY.finditer(text_lower)}
+    length = len(text_lower)
+    found = set()
+    
+    for start in boundaries:
+        if start >= length:
+            continue
+        node = _SKILL_TRIE.get(text_lower[start])
+        pos = start + 1
+        
+        while node is not None:
+            skill = node.get(None)
+            if skill is not None and pos in boundaries:
+                found.add(skill)
+            if pos >= length:
+                break
+            node = node.get(text_lower[pos])
+            pos += 1
+    
+    return found
+
 
 class ImprovedCVAnalyzer:
     """Analyseur de CV amélioré - Universel (Tech, Marketing, Business)"""
@@ -160,25 +288,16 @@ class ImprovedCVAnalyzer:
         }
         
         # ========== EMAIL ==========
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        if emails:
-            contact["email"] = emails[0]
+        email = EMAIL_PATTERN.search(text)
+        if email:
+            contact["email"] = email.group(0)
             logger.debug(f"  ✉️  Email trouvé : {contact['email']}")
         
         # ========== TÉLÉPHONE ==========
-        phone_patterns = [
-            r'\+33\s*[1-9](?:[\s.-]?\d{2}){4}',  # +33 6 12 34 56 78
-            r'\+33[1-9]\d{8}',                    # +33612345678
-            r'0[1-9](?:[\s.-]?\d{2}){4}',        # 06 12 34 56 78
-            r'0[1-9]\d{8}'                        # 0612345678
-        ]
-        
-        for pattern in phone_patterns:
-            phones = re.findall(pattern, text)
-            if phones:
-                phone = phones[0]
-                phone_clean = re.sub(r'[\s.-]', '', phone)
+        for pattern in FRENCH_PHONE_PATTERNS:
+            phone = pattern.search(text)
+            if phone:
+                phone_clean = PHONE_SEPARATORS_PATTERN.sub('', phone.group(0))
                 
                 if phone_clean.startswith('+33'):
                     phone_clean = '0' + phone_clean[3:]
@@ -189,31 +308,17 @@ class ImprovedCVAnalyzer:
                     break
         
         # ========== NOM ==========
-        lines = text.split('\n')[:15]
-        
-        # Mots à exclure
-        exclude_words = [
-            'CURRICULUM', 'VITAE', 'CV', 'PROFIL', 'COMPETENCES', 'COMPÉTENCES',
-            'EXPERIENCE', 'EXPÉRIENCE', 'FORMATION', 'LANGUES', 'CONTACT',
-            'EMAIL', 'TELEPHONE', 'TÉLÉPHONE', 'DEVELOPPEUR', 'DÉVELOPPEUR',
-            'ENGINEER', 'INGENIEUR', 'INGÉNIEUR', 'DATA', 'SCIENTIST',
-            'FRONTEND', 'BACKEND', 'FULLSTACK', 'FULL', 'STACK', 'SENIOR',
-            'JUNIOR', 'DESIGNER', 'ANALYST', 'MANAGER', 'DEVELOPER',
-            'ARCHITECTE', 'CONSULTANT', 'CHEF', 'DIRECTEUR', 'RESPONSABLE',
-            'MARKETING', 'DIGITAL'
-        ]
+        lines = text.split('\n', 15)[:15]
         
         for line in lines:
             line = line.strip()
             
             # Pattern 1 : Capitalisé (Emma Rousseau)
-            name_pattern1 = r'^([A-ZÀÂÄÉÈÊËÏÎÔÙÛÜŸÇ][a-zàâäéèêëïîôùûüÿç]+(?:\s+[A-ZÀÂÄÉÈÊËÏÎÔÙÛÜŸÇ][a-zàâäéèêëïîôùûüÿç]+){1,2})(?:\s|$)'
-            match = re.match(name_pattern1, line)
+            match = CAPITALIZED_NAME_LINE_PATTERN.match(line)
             
             if not match:
                 # Pattern 2 : MAJUSCULES (EMMA ROUSSEAU)
-                name_pattern2 = r'^([A-ZÀÂÄÉÈÊËÏÎÔÙÛÜŸÇ]+(?:\s+[A-ZÀÂÄÉÈÊËÏÎÔÙÛÜŸÇ]+){1,2})(?:\s|$)'
-                match = re.match(name_pattern2, line)
+                match = UPPERCASE_NAME_LINE_PATTERN.match(line)
             
             if match:
                 name_candidate = match.group(1).strip()
@@ -223,8 +328,7 @@ class ImprovedCVAnalyzer:
                 if len(words) < 2 or len(words) > 3:
                     continue
                 
-                name_upper = name_candidate.upper()
-                if any(exclude_word in name_upper for exclude_word in exclude_words):
+                if NAME_EXCLUDED_WORDS.search(name_candidate.upper()):
                     continue
                 
                 if any(len(word) < 2 for word in words):
@@ -233,7 +337,7 @@ class ImprovedCVAnalyzer:
                 if any(char.isdigit() for char in name_candidate):
                     continue
                 
-                if any(char in name_candidate for char in ['@', '#', '$', '%', '&', '*', '(', ')', '[', ']']):
+                if NAME_FORBIDDEN_CHARS.search(name_candidate):
                     continue
                 
                 contact["name"] = name_candidate.title()
@@ -247,16 +351,13 @@ class ImprovedCVAnalyzer:
         Extrait TOUTES les compétences professionnelles
         Tech + Marketing + Business + Design
         """
-        text_lower = text.lower()
         found_skills = []
         
-        for skill in PROFESSIONAL_SKILLS:
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text_lower):
-                if '.' in skill:
-                    found_skills.append(skill)
-                else:
-                    found_skills.append(skill.title())
+        for skill in find_professional_skills(lower_text(text)):
+            if '.' in skill:
+                found_skills.append(skill)
+            else:
+                found_skills.append(skill.title())
         
         found_skills = sorted(list(set(found_skills)))
         
@@ -268,21 +369,14 @@ class ImprovedCVAnalyzer:
         """
         Extrait le nombre d'années d'expérience
         """
-        patterns = [
-            r'(\d+)\s*(?:ans?|années?)\s+(?:d\')?expérience',
-            r'expérience\s+(?:de\s+)?(\d+)\s*(?:ans?|années?)',
-            r'(\d+)\+?\s*(?:ans?|années?)\s+en'
-        ]
+        text_lower = lower_text(text)
         
         years = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text.lower())
-            years.extend([int(y) for y in matches])
+        for pattern in EXPERIENCE_YEARS_PATTERNS:
+            years.extend(int(y) for y in pattern.findall(text_lower))
         
         # Compter les périodes
-        from datetime import datetime
-        date_pattern = r'(\d{4})\s*[-–]\s*(?:(\d{4})|(?:aujourd\'hui|présent|actuel))'
-        matches = re.findall(date_pattern, text.lower())
+        matches = DATE_RANGE_PATTERN.findall(text_lower)
         
         if matches:
             total = 0
@@ -302,23 +396,15 @@ class ImprovedCVAnalyzer:
         Extrait les diplômes
         """
         education = []
-        text_lower = text.lower()
-        
-        degree_keywords = [
-            ("Doctorat", ["doctorat", "phd"]),
-            ("Master", ["master", "mastère"]),
-            ("Ingénieur", ["ingénieur", "ingenieur", "diplôme d'ingénieur"]),
-            ("Licence", ["licence", "bachelor", "bac+3"]),
-            ("BTS/DUT", ["bts", "dut", "bac+2"]),
-            ("Bac", ["baccalauréat", "bac"])
-        ]
-        
-        for degree_name, keywords in degree_keywords:
+        text_lower = lower_text(text)
+        positions = DEGREE_SEARCH.first_positions(text_lower)
+        
+        for degree_name, keywords in DEGREE_KEYWORDS:
             for keyword in keywords:
-                if keyword in text_lower:
-                    pattern = rf'{keyword}[^\n]{{0,100}}'
-                    match = re.search(pattern, text_lower)
-                    field = match.group(0).replace(keyword, "").strip()[:50] if match else ""
+                if keyword in positions:
+                    start = positions[keyword]
+                    context = line_context(text_lower, start, start + len(keyword), 100)
+                    field = context.replace(keyword, "").strip()[:50]
                     
                     education.append({
                         "degree": degree_name,
@@ -335,39 +421,17 @@ class ImprovedCVAnalyzer:
         Extrait les langues parlées
         """
         languages = []
-        text_lower = text.lower()
-        
-        lang_map = {
-            "français": "Français",
-            "francais": "Français",
-            "anglais": "Anglais",
-            "arabe": "Arabe",
-            "allemand": "Allemand",
-            "espagnol": "Espagnol",
-            "italien": "Italien",
-            "chinois": "Chinois",
-            "japonais": "Japonais"
-        }
-        
-        level_patterns = {
-            "Courant": ["courant", "c2", "bilingue", "natif"],
-            "Avancé": ["avancé", "avance", "c1"],
-            "Intermédiaire": ["intermédiaire", "intermediaire", "b2", "b1"],
-            "Basique": ["basique", "débutant", "debutant", "a2", "a1"]
-        }
-        
-        for key, value in lang_map.items():
-            if key in text_lower:
-                level = "Non spécifié"
-                pattern = rf'{key}[^\n]{{0,80}}'
-                match = re.search(pattern, text_lower)
-                
-                if match:
-                    context = match.group(0)
-                    for level_name, level_keywords in level_patterns.items():
-                        if any(kw in context for kw in level_keywords):
-                            level = level_name
-                            break
+        text_lower = lower_text(text)
+        positions = LANGUAGE_SEARCH.first_positions(text_lower)
+        
+        for key, value in LANGUAGE_NAMES.items():
+            if key in positions:
+                start = positions[key]
+                context = line_context(text_lower, start, start + len(key), 80)
+                level = next(
+                    (level_name for level_name, pattern in LANGUAGE_LEVEL_PATTERNS if pattern.search(context)),
+                    "Non spécifié"
+                )
                 
                 languages.append({"language": value, "level": level})
         
@@ -497,47 +561,67 @@ class ImprovedCVAnalyzer:
         else:
             return "D"
     
-    def analyze(self, cv_text: str, job_offer: Dict) -> Dict[str, Any]:
+    def extract(self, cv_text: str) -> Dict[str, Any]:
         """
-        Analyse complète du CV par rapport à l'offre
+        Extraction des données du CV (indépendante de l'offre)
         
         Args:
             cv_text: Texte du CV
-            job_offer: Dictionnaire avec les infos de l'offre
         
         Returns:
-            Analyse complète avec score réel
+            Données extraites (champ extracted_data de analyze)
         """
-        logger.info("📋 Début de l'analyse du CV...")
+        return {
+            "contact": self.extract_contact_info(cv_text),
+            "skills": self.extract_skills(cv_text),
+            "experience_years": self.extract_experience_years(cv_text),
+            "education": self.extract_education(cv_text),
+            "languages": self.extract_languages(cv_text),
+            "extraction_method": "Improved ML + Matching"
+        }
+    
+    def score(self, extracted_data: Dict[str, Any], job_offer: Dict) -> Dict[str, Any]:
+        """
+        Score des données extraites par rapport à l'offre
         
-        # Extraction des données
-        contact = self.extract_contact_info(cv_text)
-        skills = self.extract_skills(cv_text)
-        experience = self.extract_experience_years(cv_text)
-        education = self.extract_education(cv_text)
-        languages = self.extract_languages(cv_text)
+        Args:
+            extracted_data: Résultat de extract
+            job_offer: Dictionnaire avec les infos de l'offre
         
-        # Calcul du score de matching
+        Returns:
+            Analyse complète avec score réel (même format que analyze)
+        """
         score_data = self.calculate_match_score(
-            skills, experience, education, job_offer
+            extracted_data["skills"],
+            extracted_data["experience_years"],
+            extracted_data["education"],
+            job_offer
         )
         
         final_score = score_data["cv_score"]
         
         return {
-            "extracted_data": {
-                "contact": contact,
-                "skills": skills,
-                "experience_years": experience,
-                "education": education,
-                "languages": languages,
-                "extraction_method": "Improved ML + Matching"
-            },
+            "extracted_data": extracted_data,
             "cv_score": final_score,
             "score_breakdown": score_data["score_breakdown"],
             "recommendation": self.get_recommendation(final_score),
             "category": self.get_category(final_score)
         }
+    
+    def analyze(self, cv_text: str, job_offer: Dict) -> Dict[str, Any]:
+        """
+        Analyse complète du CV par rapport à l'offre
+        
+        Args:
+            cv_text: Texte du CV
+            job_offer: Dictionnaire avec les infos de l'offre
+        
+        Returns:
+            Analyse complète avec score réel
+        """
+        logger.info("📋 Début de l'analyse du CV...")
+        
+        return self.score(self.extract(cv_text), job_offer)
 
 
 # ============ Test ============
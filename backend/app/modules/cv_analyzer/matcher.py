@@ -17,18 +17,21 @@ class CVMatcher:
     Compare les compétences du CV avec celles de l'offre
     """
     
-    def __init__(self, use_bert: bool = True):
+    def __init__(self, use_bert: bool = True, model=None, embedding_store=None):
         """
         Initialise le matcher
         
         Args:
             use_bert: Si True, utilise BERT (nécessite sentence-transformers)
                      Si False, utilise simple string matching
+            model: SentenceTransformer déjà chargé à réutiliser (optionnel)
+            embedding_store: EmbeddingStore persistant du même modèle (optionnel)
         """
         self.use_bert = use_bert
-        self.model = None
+        self.model = model
+        self.embedding_store = embedding_store
         
-        if use_bert:
+        if use_bert and self.model is None:
             try:
                 from sentence_transformers import SentenceTransformer
                 self.model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
@@ -82,6 +85,53 @@ class CVMatcher:
         
         return float(similarity)
     
+    def compute_similarity_matrix(self, texts_a: List[str], texts_b: List[str]) -> np.ndarray:
+        """
+        Calcule toutes les similarités entre deux listes de textes
+        
+        Avec BERT, chaque texte unique est encodé une seule fois (un seul appel
+        batché à encode) puis la matrice est obtenue par un produit matriciel
+        de vecteurs normalisés (= similarité cosinus).
+        
+        Args:
+            texts_a: Textes en lignes (ex: compétences requises)
+            texts_b: Textes en colonnes (ex: compétences du CV)
+        
+        Returns:
+            np.ndarray: Matrice (len(texts_a), len(texts_b)) de similarités
+        """
+        if not texts_a or not texts_b:
+            return np.zeros((len(texts_a), len(texts_b)), dtype=np.float32)
+        
+        if not (self.use_bert and self.model):
+            return np.array(
+                [[self._compute_simple_similarity(b, a) for b in texts_b] for a in texts_a],
+                dtype=np.float32
+            )
+        
+        # Encoder chaque texte unique une seule fois
+        unique_texts = list(dict.fromkeys(list(texts_a) + list(texts_b)))
+        embeddings = self._encode_normalized(unique_texts)
+        row_of = {text: i for i, text in enumerate(unique_texts)}
+        
+        matrix_a = embeddings[[row_of[t] for t in texts_a]]
+        matrix_b = embeddings[[row_of[t] for t in texts_b]]
+        
+        return matrix_a @ matrix_b.T
+    
+    def _encode_normalized(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode des textes en un seul batch et normalise les vecteurs (norme L2)
+        Les vecteurs déjà calculés sont relus depuis le cache persistant
+        """
+        if self.embedding_store is not None:
+            return self.embedding_store.encode(texts)
+        
+        embeddings = np.asarray(self.model.encode(texts, convert_to_numpy=True), dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return embeddings / norms
+    
     def _compute_simple_similarity(self, text1: str, text2: str) -> float:
         """
         Calcule la similarité simple (sans BERT)
@@ -154,18 +204,20 @@ class CVMatcher:
         
         logger.info(f"🔍 Matching {len(cv_skills)} compétences CV avec {len(required_skills)} requises")
         
+        # Matrice (requises x CV) calculée en une fois
+        similarities = self.compute_similarity_matrix(required_skills, cv_skills)
+        
         # Pour chaque compétence requise
-        for req_skill in required_skills:
+        for row, req_skill in enumerate(required_skills):
             best_match = None
             best_score = 0.0
             
-            # Chercher la meilleure correspondance dans le CV
-            for cv_skill in cv_skills:
-                similarity = self.compute_similarity(cv_skill, req_skill)
-                
-                if similarity > best_score:
-                    best_score = similarity
-                    best_match = cv_skill
+            # Meilleure correspondance dans le CV (première en cas d'égalité)
+            if cv_skills:
+                best_index = int(np.argmax(similarities[row]))
+                if similarities[row, best_index] > 0:
+                    best_score = float(similarities[row, best_index])
+                    best_match = cv_skills[best_index]
             
             # Si similarité suffisante
             if best_score >= threshold:
@@ -0,0 +1,58 @@
+"""
+Module 3 - Exécuteur dédié aux traitements CPU (PDF, NLP, scoring)
+Évite que les analyses de CV monopolisent le pool de threads des routes
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_cpu_executor() -> ThreadPoolExecutor:
+    """
+    Retourne l'exécuteur partagé (taille : settings.max_workers)
+    Les modèles (spaCy, SentenceTransformer) restent chargés une seule fois
+    dans le processus, ce qui exclut un pool de processus ici.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.max_workers,
+                thread_name_prefix="cv-nlp"
+            )
+            logger.info(f"⚙️  Exécuteur NLP démarré ({settings.max_workers} threads)")
+        return _executor
+
+
+def run_cpu_bound(func: Callable, *args, **kwargs):
+    """
+    Exécute une étape coûteuse (pdfplumber, spaCy, BERT...) dans l'exécuteur dédié
+    et attend son résultat
+
+    À appeler depuis une route synchrone (def) : FastAPI l'exécute déjà hors de
+    la boucle d'événements, et l'exécuteur borne le nombre d'analyses simultanées.
+
+    Example:
+        cv_text = run_cpu_bound(cv_parser.extract_text_from_pdf, path)
+    """
+    return get_cpu_executor().submit(func, *args, **kwargs).result()
+
+
+def shutdown_cpu_executor():
+    """Arrête l'exécuteur (appelé à l'arrêt de l'application)"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+            logger.info("✅ Exécuteur NLP arrêté")
@@ -1,15 +1,148 @@
 """
 Module 3 - CV Parser
 Extraction de texte depuis les fichiers PDF
+
+Chemin rapide : PyPDF2 (lecture directe du flux de texte) page par page,
+avec repli sur pdfplumber (analyse de mise en page, plus lente) pour les
+pages dont le texte paraît dégradé (page vide, caractères non décodés,
+mots coupés ou colonnes mélangées). Les documents longs peuvent être
+découpés en tranches de pages traitées en parallèle dans le pool de
+processus partagé, en conservant l'ordre des pages.
+
+Le PDF est désigné par son chemin ou par son contenu (bytes) déjà en
+mémoire, tel que reçu lors de l'upload, sans relecture sur disque.
 """
 
+import io
 import pdfplumber
 import logging
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Iterable, List, Optional, Dict, Tuple, Union
 import re
 
+from PyPDF2 import PdfReader
+
+from app.config import get_settings
+
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Nombre de pages à partir duquel l'extraction est parallélisée
+PARALLEL_MIN_PAGES = 4
+
+# Chemin du PDF ou contenu du fichier
+PDFSource = Union[str, bytes]
+
+# ============ Détection d'un texte dégradé ============
+
+MIN_PAGE_CHARS = 20
+MIN_LETTER_RATIO = 0.5
+# Lettre majuscule isolée suivie de la suite du mot : "C isco", "D éveloppeur"
+SPLIT_WORD_PATTERN = re.compile(r"(?<![\w'’])[B-HJ-XZ] (?=[a-zà-ÿ]{2,})")
+# Titre en capitales collé en fin de ligne (deux colonnes lues ensemble) : "Python LANGUES"
+MERGED_COLUMN_PATTERN = re.compile(r"[a-zà-ÿ)] +[A-ZÀ-Ý]{5,} *$", re.MULTILINE)
+# PyPDF2 insère une espace avant les traits d'union : "Scikit -learn", "2019 -2024"
+PYPDF2_HYPHEN_PATTERN = re.compile(r"(?<=\w) +-(?=\w)")
+
+
+def looks_degraded(text: Optional[str]) -> bool:
+    """
+    Indique si le texte d'une page extrait par PyPDF2 doit être relu avec pdfplumber
+    """
+    if not text:
+        return True
+
+    compact = re.sub(r"\s+", "", text)
+    if len(compact) < MIN_PAGE_CHARS:
+        return True
+
+    # Glyphes non décodés
+    if "(cid:" in text or "\ufffd" in text:
+        return True
+
+    letters = sum(1 for char in compact if char.isalpha())
+    if letters / len(compact) < MIN_LETTER_RATIO:
+        return True
+
+    return bool(SPLIT_WORD_PATTERN.search(text) or MERGED_COLUMN_PATTERN.search(text))
+
+
+def _open_source(pdf_source: PDFSource):
+    """Chemin, ou flux en mémoire pour un contenu bytes (un flux par lecteur)"""
+    if isinstance(pdf_source, bytes):
+        return io.BytesIO(pdf_source)
+    return pdf_source
+
+
+def _source_name(pdf_source: PDFSource) -> str:
+    """Nom du PDF pour les logs"""
+    if isinstance(pdf_source, bytes):
+        return f"<{len(pdf_source)} octets en mémoire>"
+    return Path(pdf_source).name
+
+
+def extract_pages(pdf_path: PDFSource, page_numbers: Iterable[int], fast_path: bool = True) -> List[Tuple[Optional[str], str]]:
+    """
+    Extrait le texte d'une série de pages (exécutable dans un processus worker)
+
+    Args:
+        pdf_path: Chemin du PDF ou son contenu
+        page_numbers: Index des pages (à partir de 0)
+        fast_path: Essayer PyPDF2 avant pdfplumber
+
+    Returns:
+        list: (texte, moteur utilisé) pour chaque page, dans l'ordre demandé
+    """
+    reader = None
+    plumber = None
+    results = []
+
+    try:
+        if fast_path:
+            try:
+                reader = PdfReader(_open_source(pdf_path))
+            except Exception as e:
+                logger.debug(f"PyPDF2 indisponible pour {_source_name(pdf_path)} : {e}")
+
+        for page_number in page_numbers:
+            text = None
+            if reader is not None:
+                try:
+                    text = reader.pages[page_number].extract_text()
+                except Exception:
+                    text = None
+                if not looks_degraded(text):
+                    results.append((PYPDF2_HYPHEN_PATTERN.sub("-", text), "pypdf2"))
+                    continue
+
+            if plumber is None:
+                plumber = pdfplumber.open(_open_source(pdf_path))
+            results.append((plumber.pages[page_number].extract_text(), "pdfplumber"))
+    finally:
+        if plumber is not None:
+            plumber.close()
+
+    return results
+
+
+def _page_count(pdf_path: PDFSource) -> int:
+    try:
+        return len(PdfReader(_open_source(pdf_path)).pages)
+    except Exception:
+        with pdfplumber.open(_open_source(pdf_path)) as pdf:
+            return len(pdf.pages)
+
+
+def _split_pages(num_pages: int, parts: int) -> List[range]:
+    """Découpe les pages en tranches contiguës de tailles proches"""
+    size, extra = divmod(num_pages, parts)
+    ranges = []
+    start = 0
+    for part in range(parts):
+        end = start + size + (1 if part < extra else 0)
+        ranges.append(range(start, end))
+        start = end
+    return ranges
 
 
 class CVParser:
@@ -18,18 +151,32 @@ class CVParser:
     Extrait le texte brut depuis un fichier PDF
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        fast_path: Optional[bool] = None,
+        parallel: bool = False,
+        parallel_min_pages: int = PARALLEL_MIN_PAGES
+    ):
         """
         Initialise le parser
+        
+        Args:
+            fast_path: PyPDF2 d'abord, pdfplumber en repli (défaut : settings.pdf_fast_extraction)
+            parallel: Répartir les pages des longs documents sur le pool de processus
+                      (à laisser désactivé dans un processus worker)
+            parallel_min_pages: Nombre de pages à partir duquel paralléliser
         """
+        self.fast_path = settings.pdf_fast_extraction if fast_path is None else fast_path
+        self.parallel = parallel
+        self.parallel_min_pages = parallel_min_pages
         logger.info("📄 CVParser initialisé")
     
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
+    def extract_text_from_pdf(self, pdf_path: PDFSource) -> str:
         """
         Extrait tout le texte d'un PDF
         
         Args:
-            pdf_path: Chemin vers le fichier PDF
+            pdf_path: Chemin vers le fichier PDF, ou son contenu (bytes)
         
         Returns:
             str: Texte extrait du PDF
@@ -43,27 +190,28 @@ class CVParser:
             text = parser.extract_text_from_pdf("cv_jean_dupont.pdf")
             print(text)
         """
-        pdf_file = Path(pdf_path)
-        
-        # Vérifier que le fichier existe
-        if not pdf_file.exists():
-            raise FileNotFoundError(f"Fichier PDF introuvable : {pdf_path}")
+        if not isinstance(pdf_path, bytes):
+            pdf_path = str(pdf_path)
+            
+            # Vérifier que le fichier existe
+            if not Path(pdf_path).exists():
+                raise FileNotFoundError(f"Fichier PDF introuvable : {pdf_path}")
         
         try:
             text_content = []
             
-            with pdfplumber.open(pdf_path) as pdf:
-                logger.info(f"📖 Lecture du PDF : {pdf_file.name} ({len(pdf.pages)} pages)")
-                
-                for page_num, page in enumerate(pdf.pages, 1):
-                    # Extraire le texte de la page
-                    page_text = page.extract_text()
-                    
-                    if page_text:
-                        text_content.append(page_text)
-                        logger.debug(f"  Page {page_num}: {len(page_text)} caractères extraits")
-                    else:
-                        logger.warning(f"  Page {page_num}: Aucun texte extrait")
+            pages = self.extract_pages_text(pdf_path)
+            logger.info(
+                f"📖 Lecture du PDF : {_source_name(pdf_path)} ({len(pages)} pages, "
+                f"{sum(1 for _, engine in pages if engine == 'pdfplumber')} via pdfplumber)"
+            )
+            
+            for page_num, (page_text, engine) in enumerate(pages, 1):
+                if page_text:
+                    text_content.append(page_text)
+                    logger.debug(f"  Page {page_num}: {len(page_text)} caractères extraits ({engine})")
+                else:
+                    logger.warning(f"  Page {page_num}: Aucun texte extrait")
             
             # Joindre tout le texte
             full_text = "\n\n".join(text_content)
@@ -79,6 +227,28 @@ class CVParser:
             logger.error(f"❌ Erreur lors de l'extraction du PDF : {e}")
             raise
     
+    def extract_pages_text(self, pdf_path: PDFSource) -> List[Tuple[Optional[str], str]]:
+        """
+        Texte brut de chaque page, dans l'ordre : (texte, moteur utilisé)
+        """
+        num_pages = _page_count(pdf_path)
+        
+        if not self.parallel or num_pages < max(self.parallel_min_pages, 2):
+            return extract_pages(pdf_path, range(num_pages), self.fast_path)
+        
+        # Import local : batch_processor n'est utile qu'en mode parallèle
+        from app.modules.cv_analyzer.batch_processor import get_process_pool
+        
+        parts = _split_pages(num_pages, min(settings.max_workers, num_pages))
+        chunks = get_process_pool().map(
+            extract_pages,
+            [pdf_path] * len(parts),
+            parts,
+            [self.fast_path] * len(parts)
+        )
+        # map conserve l'ordre des tranches, donc celui des pages
+        return [page for chunk in chunks for page in chunk]
+    
     def _clean_text(self, text: str) -> str:
         """
         Nettoie le texte extrait
@@ -0,0 +1,220 @@
+"""
+Module 3 - Expressions régulières partagées des extracteurs de CV
+Compilées une seule fois à l'import (ImprovedCVAnalyzer, CVExtractor, CVExtractorML)
+
+Le texte en minuscules est calculé une seule fois par CV (lower_text) et les
+diplômes et langues sont localisés par str.find (KeywordSearch) au lieu d'une
+regex construite par mot-clé.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+# ============ Normalisation du texte ============
+
+@lru_cache(maxsize=32)
+def lower_text(text: str) -> str:
+    """
+    Texte du CV en minuscules
+
+    Mis en cache : les fonctions d'extraction appelées successivement sur le
+    même CV ne recalculent pas la conversion.
+    """
+    return text.lower()
+
+
+def line_context(text: str, start: int, end: int, max_chars: int) -> str:
+    """
+    text[start:end] suivi d'au plus max_chars caractères de la même ligne
+    (équivalent de la regex `mot[^\\n]{0,max_chars}` à la position start)
+    """
+    newline = text.find("\n", end, end + max_chars)
+    return text[start:end + max_chars if newline == -1 else newline]
+
+
+# ============ Contact ============
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_SEPARATORS_PATTERN = re.compile(r'[\s.-]')
+
+# ImprovedCVAnalyzer : formats français, essayés dans l'ordre
+FRENCH_PHONE_PATTERNS = (
+    re.compile(r'\+33\s*[1-9](?:[\s.-]?\d{2}){4}'),  # +33 6 12 34 56 78
+    re.compile(r'\+33[1-9]\d{8}'),                   # +33612345678
+    re.compile(r'0[1-9](?:[\s.-]?\d{2}){4}'),        # 06 12 34 56 78
+    re.compile(r'0[1-9]\d{8}'),                      # 0612345678
+)
+
+# CVExtractor / CVExtractorML
+PHONE_PATTERNS = (
+    re.compile(r'(?:\+33|0)[1-9](?:[\s.-]?\d{2}){4}'),  # Format avec espaces
+    re.compile(r'(?:\+33|0)\d{9}'),  # Format sans espaces
+    re.compile(r'\d{2}[\s.-]\d{2}[\s.-]\d{2}[\s.-]\d{2}[\s.-]\d{2}'),  # Format strict
+)
+
+_UPPER = "A-ZÀÂÄÉÈÊËÏÎÔÙÛÜŸÇ"
+_LOWER = "a-zàâäéèêëïîôùûüÿç"
+
+# Nom en MAJUSCULES au début d'une ligne (CVExtractor / CVExtractorML)
+UPPERCASE_NAME_PATTERN = re.compile(rf'^([{_UPPER}]+ [{_UPPER}]+)', re.MULTILINE)
+
+# Ligne commençant par un nom (ImprovedCVAnalyzer) : Emma Rousseau / EMMA ROUSSEAU
+CAPITALIZED_NAME_LINE_PATTERN = re.compile(
+    rf'^([{_UPPER}][{_LOWER}]+(?:\s+[{_UPPER}][{_LOWER}]+){{1,2}})(?:\s|$)'
+)
+UPPERCASE_NAME_LINE_PATTERN = re.compile(rf'^([{_UPPER}]+(?:\s+[{_UPPER}]+){{1,2}})(?:\s|$)')
+
+# ============ Expérience ============
+
+# ImprovedCVAnalyzer (texte en minuscules) : toutes les correspondances comptent
+EXPERIENCE_YEARS_PATTERNS = (
+    re.compile(r'(\d+)\s*(?:ans?|années?)\s+(?:d\')?expérience'),
+    re.compile(r'expérience\s+(?:de\s+)?(\d+)\s*(?:ans?|années?)'),
+    re.compile(r'(\d+)\+?\s*(?:ans?|années?)\s+en'),
+)
+DATE_RANGE_PATTERN = re.compile(r'(\d{4})\s*[-–]\s*(?:(\d{4})|(?:aujourd\'hui|présent|actuel))')
+
+# CVExtractor / CVExtractorML
+EXPERIENCE_TEXT_PATTERN = re.compile(r"(\d+)\s+ans?\s+d[']expérience", re.IGNORECASE)
+EXPERIENCE_TEXT_PATTERN_ML = re.compile(r"(\d+)\s+ans?\s+d['’]exp[ée]rience", re.IGNORECASE)
+DATE_RANGE_TEXT_PATTERN = re.compile(r'(\d{4})\s*[-–]\s*(\d{4}|aujourd\'hui|présent)', re.IGNORECASE)
+
+YEAR_PATTERN = re.compile(r'\d{4}')
+
+
+# ============ Recherche groupée de mots-clés ============
+
+class KeywordSearch:
+    """
+    Occurrences d'une liste fixe de mots-clés
+
+    Chaque mot-clé est cherché avec str.find sur le texte (en minuscules si
+    ignore_case, calculé une fois par CV) : plus rapide qu'une regex par
+    mot-clé, et deux mots-clés qui se chevauchent ("bac" / "bachelor")
+    sont tous deux trouvés.
+    """
+
+    def __init__(self, keywords: Iterable[str], ignore_case: bool = False):
+        self.keywords = list(dict.fromkeys(keywords))
+        self.ignore_case = ignore_case
+        self._needles = [
+            (keyword, keyword.lower() if ignore_case else keyword)
+            for keyword in self.keywords
+        ]
+        # Repli si la mise en minuscules change la longueur du texte ("İ" -> "i̇")
+        self._patterns = {
+            keyword: re.compile(re.escape(keyword), re.IGNORECASE)
+            for keyword in self.keywords
+        } if ignore_case else {}
+
+    def _haystack(self, text: str) -> Optional[str]:
+        """Texte dans lequel chercher (None : positions décalées, repli regex)"""
+        if not self.ignore_case:
+            return text
+        text_lower = lower_text(text)
+        return text_lower if len(text_lower) == len(text) else None
+
+    def positions(self, text: str) -> Dict[str, List[int]]:
+        """
+        Positions de chaque mot-clé trouvé, sans chevauchement pour un même
+        mot-clé (comme re.finditer)
+        """
+        found: Dict[str, List[int]] = {}
+        haystack = self._haystack(text)
+
+        for keyword, needle in self._needles:
+            if haystack is None:
+                starts = [match.start() for match in self._patterns[keyword].finditer(text)]
+            else:
+                starts = []
+                start = haystack.find(needle)
+                while start != -1:
+                    starts.append(start)
+                    start = haystack.find(needle, start + len(needle))
+            if starts:
+                found[keyword] = starts
+
+        return found
+
+    def first_positions(self, text: str) -> Dict[str, int]:
+        """Position de la première occurrence de chaque mot-clé trouvé"""
+        found: Dict[str, int] = {}
+        haystack = self._haystack(text)
+
+        for keyword, needle in self._needles:
+            if haystack is None:
+                match = self._patterns[keyword].search(text)
+                start = match.start() if match else -1
+            else:
+                start = haystack.find(needle)
+            if start != -1:
+                found[keyword] = start
+
+        return found
+
+
+# ============ Formations et langues (CVExtractor / CVExtractorML) ============
+
+DEGREES = [
+    "Master", "Licence", "Bachelor", "Doctorat", "PhD",
+    "BTS", "DUT", "Ingénieur", "MBA", "BAC"
+]
+DEGREE_SEARCH = KeywordSearch(DEGREES, ignore_case=True)
+
+LANGUAGES = ["Anglais", "Français", "Espagnol", "Allemand", "Italien",
+             "Portugais", "Chinois", "Japonais", "Arabe"]
+LANGUAGE_SEARCH = KeywordSearch(LANGUAGES, ignore_case=True)
+
+# Niveaux, par ordre de priorité : (libellé, libellé en minuscules)
+LANGUAGE_LEVELS = [
+    (level, level.lower())
+    for level in ["Débutant", "Intermédiaire", "Courant", "Bilingue", "Natif",
+                  "A1", "A2", "B1", "B2", "C1", "C2"]
+]
+
+
+def extract_degrees(text: str) -> List[Dict[str, str]]:
+    """
+    Formations du CV : chaque occurrence d'un diplôme (insensible à la casse),
+    suivie éventuellement de l'année accolée ("Master2019")
+    """
+    education = []
+    positions = DEGREE_SEARCH.positions(text)
+
+    for degree in DEGREES:
+        for start in positions.get(degree, []):
+            end = start + len(degree)
+            year_match = YEAR_PATTERN.match(text, end)
+            year = year_match.group(0) if year_match else ""
+            edu_text = text[start:end] + year
+
+            education.append({
+                "degree": degree,
+                "field": edu_text.replace(degree, "").replace(year, "").strip()[:50],
+                "year": year
+            })
+
+    return education
+
+
+def extract_language_levels(text: str) -> List[Dict[str, str]]:
+    """
+    Langues du CV et niveau trouvé dans les 50 caractères qui suivent
+    la première mention de chaque langue
+    """
+    languages_list = []
+    positions = LANGUAGE_SEARCH.first_positions(text)
+
+    for lang in LANGUAGES:
+        if lang in positions:
+            start = positions[lang]
+            context = line_context(text, start, start + len(lang), 50).lower()
+            level = next((lvl for lvl, lvl_lower in LANGUAGE_LEVELS if lvl_lower in context), "Non spécifié")
+
+            languages_list.append({
+                "language": lang,
+                "level": level
+            })
+
+    return languages_list
@@ -0,0 +1,255 @@
+"""
+Module 3 - Matching inversé : tous les candidats en base face à une offre
+Index inversé compétence -> candidats + scoring vectorisé (NumPy)
+
+Reproduit ImprovedCVAnalyzer.calculate_match_score à partir des données
+déjà extraites (extracted_data) : aucun CV n'est ré-analysé. Les
+compétences requises sont rapprochées du vocabulaire de l'index (même
+règle fuzz.ratio > 80), puis les listes de candidats correspondantes
+donnent directement les matchs, pour tout le vivier à la fois.
+"""
+
+import logging
+import threading
+from typing import Dict, List
+
+import numpy as np
+from rapidfuzz import fuzz, process
+from sqlalchemy.orm import Session
+
+from app.models.candidate import Candidate
+from app.modules.cv_analyzer.improved_analyzer import EDUCATION_SCORES
+
+logger = logging.getLogger(__name__)
+
+# Même seuil que calculate_match_score (fuzz.ratio > 80)
+SKILL_MATCH_THRESHOLD = 80
+LOAD_BATCH_SIZE = 1000
+
+# Pondérations de calculate_match_score
+SKILLS_WEIGHT = 0.4
+EXPERIENCE_WEIGHT = 0.3
+EDUCATION_WEIGHT = 0.2
+LANGUAGES_WEIGHT = 0.1
+LANGUAGES_SCORE = 70
+
+
+def _best_degree_score(education: List[Dict]) -> int:
+    """Meilleur score de diplôme (0 si aucun diplôme reconnu)"""
+    if not education or education[0].get("degree") == "Non spécifié":
+        return 0
+
+    best = 0
+    for edu in education:
+        degree = (edu.get("degree") or "").lower()
+        for known_degree, score in EDUCATION_SCORES.items():
+            if known_degree in degree:
+                best = max(best, score)
+    return best
+
+
+class CandidateSkillIndex:
+    """
+    Index en mémoire des candidats : compétences (index inversé),
+    années d'expérience et meilleur diplôme, sous forme de tableaux NumPy
+
+    Mis à jour à chaque requête avec les candidats créés depuis
+    (id > dernier id indexé) ; les candidats supprimés sont écartés lors
+    de la relecture des résultats en base.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._ids: List[int] = []
+        self._experience: List[int] = []
+        self._degree_scores: List[int] = []
+        self._has_skills: List[bool] = []
+        # compétence (minuscules) -> positions des candidats
+        self._postings: Dict[str, List[int]] = {}
+        self._removed = set()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # ============ Construction ============
+
+    def refresh(self, db: Session):
+        """
+        Ajoute à l'index les candidats créés depuis la dernière mise à jour
+        (seules les colonnes id et extracted_data sont lues)
+        """
+        with self._lock:
+            query = (
+                db.query(Candidate.id, Candidate.extracted_data)
+                .filter(Candidate.id > self._last_id)
+                .order_by(Candidate.id)
+                .execution_options(yield_per=LOAD_BATCH_SIZE)
+            )
+
+            added = 0
+            for candidate_id, extracted_data in query:
+                self._add(candidate_id, extracted_data or {})
+                added += 1
+
+            if added:
+                logger.info(f"🗂️  Index des compétences : +{added} candidats ({len(self._ids)} au total)")
+
+    def _add(self, candidate_id: int, extracted_data: Dict):
+        position = len(self._ids)
+        skills = {s.lower() for s in extracted_data.get("skills") or [] if isinstance(s, str)}
+
+        self._ids.append(candidate_id)
+        self._experience.append(int(extracted_data.get("experience_years") or 0))
+        self._degree_scores.append(_best_degree_score(extracted_data.get("education") or []))
+        self._has_skills.append(bool(skills))
+
+        for skill in skills:
+            self._postings.setdefault(skill, []).append(position)
+
+        self._last_id = max(self._last_id, candidate_id)
+
+    def mark_removed(self, candidate_ids):
+        """Écarte des candidats supprimés des prochains résultats"""
+        with self._lock:
+            self._removed.update(candidate_ids)
+
+    # ============ Scoring ============
+
+    def _skill_mask(self, skill: str, size: int) -> np.ndarray:
+        """
+        Candidats possédant une compétence proche (fuzz.ratio > 80)
+        """
+        mask = np.zeros(size, dtype=bool)
+        matches = process.extract(
+            skill.lower(),
+            self._postings.keys(),
+            scorer=fuzz.ratio,
+            score_cutoff=SKILL_MATCH_THRESHOLD,
+            limit=None
+        )
+        for vocabulary_skill, score, _ in matches:
+            if score > SKILL_MATCH_THRESHOLD:
+                mask[self._postings[vocabulary_skill]] = True
+        return mask
+
+    def score_all(self, job_requirements: Dict) -> Dict[str, np.ndarray]:
+        """
+        Calcule le score de chaque candidat indexé pour une offre
+
+        Args:
+            job_requirements: Exigences au format ImprovedCVAnalyzer.analyze
+
+        Returns:
+            dict: Tableaux alignés (ids, score, skills, experience, education)
+                  et la matrice des compétences requises trouvées
+        """
+        required_skills = job_requirements.get("required_skills") or []
+        nice_to_have = job_requirements.get("nice_to_have_skills") or []
+        required_experience = job_requirements.get("experience_min_years") or 0
+        required_education = (job_requirements.get("education_level") or "").lower()
+
+        with self._lock:
+            size = len(self._ids)
+            ids = np.array(self._ids, dtype=np.int64)
+            experience = np.array(self._experience, dtype=np.float64)
+            degree_scores = np.array(self._degree_scores, dtype=np.float64)
+            has_skills = np.array(self._has_skills, dtype=bool)
+            required_matrix = np.array(
+                [self._skill_mask(skill, size) for skill in required_skills], dtype=bool
+            ).reshape(len(required_skills), size)
+            nice_matrix = np.array(
+                [self._skill_mask(skill, size) for skill in nice_to_have], dtype=bool
+            ).reshape(len(nice_to_have), size)
+            removed = np.isin(ids, list(self._removed))
+
+        # ========== 1. COMPÉTENCES ==========
+        if required_skills:
+            skills_score = required_matrix.sum(axis=0) / len(required_skills) * 100
+            if nice_to_have:
+                bonus = nice_matrix.sum(axis=0) / len(nice_to_have) * 10
+                skills_score = np.minimum(100, skills_score + bonus)
+        else:
+            skills_score = np.where(has_skills, 70.0, 30.0)
+
+        # ========== 2. EXPÉRIENCE ==========
+        if required_experience > 0:
+            experience_score = np.select(
+                [
+                    experience >= required_experience,
+                    experience >= required_experience * 0.7,
+                    experience >= required_experience * 0.5
+                ],
+                [100.0, 80.0, 60.0],
+                default=np.maximum(0, experience / required_experience * 50)
+            )
+        else:
+            experience_score = np.full(size, 70.0)
+
+        # ========== 3. ÉDUCATION ==========
+        education_score = np.where(degree_scores > 0, degree_scores, 70.0)
+        if required_education:
+            required_score = EDUCATION_SCORES.get(required_education, 70)
+            education_score = np.where(
+                degree_scores <= 0, 70.0,
+                np.where(
+                    degree_scores >= required_score, 100.0,
+                    np.where(degree_scores >= required_score * 0.8, 85.0, np.minimum(degree_scores, 75))
+                )
+            )
+
+        final_score = (
+            skills_score * SKILLS_WEIGHT +
+            experience_score * EXPERIENCE_WEIGHT +
+            education_score * EDUCATION_WEIGHT +
+            LANGUAGES_SCORE * LANGUAGES_WEIGHT
+        )
+        final_score = np.where(removed, -1.0, final_score)
+
+        return {
+            "ids": ids,
+            "score": final_score,
+            "skills": skills_score,
+            "experience": experience_score,
+            "education": education_score,
+            "required_matrix": required_matrix
+        }
+
+    def top_matches(self, job_requirements: Dict, limit: int = 50, min_score: float = 0.0) -> List[Dict]:
+        """
+        Meilleurs candidats pour une offre
+
+        Returns:
+            list: [{"candidate_id", "match_score", "score_breakdown", "matched_skills"}]
+                  triés par score décroissant
+        """
+        scores = self.score_all(job_requirements)
+        final_score = scores["score"]
+        if len(final_score) == 0:
+            return []
+
+        eligible = np.flatnonzero(final_score >= max(min_score, 0))
+        if len(eligible) > limit:
+            top = np.argpartition(-final_score[eligible], limit)[:limit]
+            eligible = eligible[top]
+        # Tri stable : à score égal, le candidat le plus ancien d'abord
+        eligible = eligible[np.argsort(-final_score[eligible], kind="stable")]
+
+        required_skills = job_requirements.get("required_skills") or []
+        results = []
+        for position in eligible:
+            results.append({
+                "candidate_id": int(scores["ids"][position]),
+                "match_score": round(float(final_score[position]), 1),
+                "score_breakdown": {
+                    "skills": round(float(scores["skills"][position]), 1),
+                    "experience": round(float(scores["experience"][position]), 1),
+                    "education": round(float(scores["education"][position]), 1),
+                    "languages": float(LANGUAGES_SCORE)
+                },
+                "matched_skills": [
+                    skill for skill, row in zip(required_skills, scores["required_matrix"])
+                    if row[position]
+                ]
+            })
+        return results
@@ -0,0 +1,532 @@
+"""
+Module 3 - Index de recherche sémantique des CVs
+Index IVF (inverted file) en NumPy sur les embeddings des passages de CV
+
+Chaque CV est découpé en passages (fenêtres de mots qui se chevauchent),
+encodés avec le SentenceTransformer partagé puis ajoutés à l'index au fil
+des uploads. Au-delà de MIN_TRAIN_VECTORS passages, les vecteurs sont
+répartis en listes par k-means : une recherche ne compare la requête
+qu'aux passages des N_PROBE listes les plus proches.
+
+La suppression d'un candidat marque ses passages (numéros de ligne dans
+{name}.deleted), ignorés par la recherche ; les fichiers sont compactés
+quand les passages supprimés dépassent COMPACT_RATIO de l'index.
+
+Fichiers (dans settings.embeddings_dir) :
+    {name}.meta.json       : modèle, dimension, version de l'entraînement
+    {name}.f32             : vecteurs normalisés (float32, memory-mappés)
+    {name}.rows            : (candidate_id, numéro du passage) par vecteur
+    {name}.lists           : liste IVF de chaque vecteur (int32)
+    {name}.centroids.npy   : centroïdes k-means (absent avant entraînement)
+    {name}.deleted         : lignes des passages supprimés (int64)
+    {name}.lock            : verrou des écritures entre processus
+"""
+
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import get_settings
+
+try:
+    import fcntl
+except ImportError:  # Windows : verrou limité au processus
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+DTYPE = np.float32
+ROW_DTYPE = np.int64  # (candidate_id, numéro du passage)
+LIST_DTYPE = np.int32
+
+# Découpage des CVs
+CHUNK_WORDS = 80
+CHUNK_STRIDE = 60
+
+# Paramètres IVF
+MIN_TRAIN_VECTORS = 2048   # En dessous : recherche exacte
+RETRAIN_GROWTH = 4         # Réentraînement quand l'index a été multiplié par 4
+N_PROBE = 16
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_PER_LIST = 64
+SCAN_BLOCK = 65536
+
+# Suppression
+COMPACT_RATIO = 0.25       # Compactage quand 25 % des passages sont supprimés
+
+
+def chunk_text(text: str) -> List[str]:
+    """
+    Découpe un texte en passages de CHUNK_WORDS mots (pas de CHUNK_STRIDE)
+
+    Le numéro d'un passage (sa position dans la liste) est stocké dans
+    l'index : le même découpage permet de retrouver l'extrait à afficher.
+    """
+    words = (text or "").split()
+    if not words:
+        return []
+
+    chunks = []
+    for start in range(0, len(words), CHUNK_STRIDE):
+        chunks.append(" ".join(words[start:start + CHUNK_WORDS]))
+        if start + CHUNK_WORDS >= len(words):
+            break
+    return chunks
+
+
+class CandidateSearchIndex:
+    """
+    Index ANN des passages de CV, persistant et partagé entre workers
+
+    Les ajouts et suppressions sont faits en fin de fichier ; les vecteurs
+    ne sont réécrits que par le compactage, les listes IVF lors d'un
+    entraînement.
+    """
+
+    def __init__(self, model, model_name: str, directory: str = None, name: str = "cv_chunks"):
+        """
+        Args:
+            model: SentenceTransformer chargé
+            model_name: Nom du modèle (un changement de modèle vide l'index)
+            directory: Dossier des fichiers (défaut : settings.embeddings_dir)
+            name: Préfixe des fichiers
+        """
+        self.model = model
+        self.model_name = model_name
+        self.dim = int(model.get_sentence_embedding_dimension())
+
+        directory = directory or settings.embeddings_dir
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, name)
+        self.meta_path = f"{base}.meta.json"
+        self.vectors_path = f"{base}.f32"
+        self.rows_path = f"{base}.rows"
+        self.lists_path = f"{base}.lists"
+        self.centroids_path = f"{base}.centroids.npy"
+        self.deleted_path = f"{base}.deleted"
+        self.lock_path = f"{base}.lock"
+
+        self._count = 0
+        self._version = None
+        self._vectors = np.empty((0, self.dim), dtype=DTYPE)
+        self._rows = np.empty((0, 2), dtype=ROW_DTYPE)
+        self._lists = np.empty(0, dtype=LIST_DTYPE)
+        self._deleted = np.empty(0, dtype=ROW_DTYPE)
+        self._centroids: Optional[np.ndarray] = None
+        self._trained_count = 0
+        self._lock = threading.Lock()
+
+        with self._lock, self._file_lock():
+            self._check_meta()
+            self._refresh()
+
+        logger.info(f"🔎 Index de recherche '{name}' : {self._count} passages")
+
+    def __len__(self) -> int:
+        return self._count
+
+    # ============ Ajout ============
+
+    def add_candidate(self, candidate_id: int, cv_text: str) -> int:
+        """
+        Indexe les passages d'un CV
+
+        Returns:
+            int: Nombre de passages ajoutés
+        """
+        return self.add_candidates([(candidate_id, cv_text)])
+
+    def add_candidates(self, items: Iterable[Tuple[int, str]]) -> int:
+        """
+        Indexe plusieurs CVs (un seul encode batché pour tous les passages)
+
+        Args:
+            items: (candidate_id, cv_text)
+
+        Returns:
+            int: Nombre de passages ajoutés
+        """
+        chunks = []
+        rows = []
+        for candidate_id, cv_text in items:
+            for chunk_index, chunk in enumerate(chunk_text(cv_text)):
+                chunks.append(chunk)
+                rows.append((candidate_id, chunk_index))
+
+        if not chunks:
+            return 0
+
+        vectors = self._encode_normalized(chunks)
+        rows = np.asarray(rows, dtype=ROW_DTYPE)
+
+        with self._lock, self._file_lock():
+            self._refresh()
+            lists = self._assign(vectors) if self._centroids is not None else np.zeros(len(vectors), dtype=LIST_DTYPE)
+
+            # Vecteurs et listes d'abord, le fichier .rows (qui fixe le nombre
+            # de passages visibles) en dernier
+            self._append(self.vectors_path, vectors, self._count * self.dim * DTYPE().itemsize)
+            self._append(self.lists_path, lists, self._count * LIST_DTYPE().itemsize)
+            self._append(self.rows_path, rows, self._count * 2 * ROW_DTYPE().itemsize)
+            self._refresh()
+
+            if self._count >= MIN_TRAIN_VECTORS and self._count >= self._trained_count * RETRAIN_GROWTH:
+                self._train()
+
+        logger.debug(f"🔎 {len(chunks)} passages indexés ({self._count} au total)")
+        return len(chunks)
+
+    def rebuild(self, items: Iterable[Tuple[int, str]], batch_size: int = 256) -> int:
+        """
+        Reconstruit l'index complet (CVs historiques)
+
+        Args:
+            items: (candidate_id, cv_text), par exemple itéré depuis la base
+            batch_size: Nombre de CVs encodés par lot
+
+        Returns:
+            int: Nombre de passages indexés
+        """
+        with self._lock, self._file_lock():
+            self._reset_files()
+            self._refresh()
+
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                self.add_candidates(batch)
+                batch = []
+        self.add_candidates(batch)
+
+        with self._lock, self._file_lock():
+            self._refresh()
+            if self._count >= MIN_TRAIN_VECTORS and self._trained_count != self._count:
+                self._train()
+
+        logger.info(f"✅ Index reconstruit : {self._count} passages")
+        return self._count
+
+    # ============ Suppression ============
+
+    def remove_candidate(self, candidate_id: int) -> int:
+        """
+        Retire les passages d'un candidat supprimé
+
+        Returns:
+            int: Nombre de passages retirés
+        """
+        return self.remove_candidates([candidate_id])
+
+    def remove_candidates(self, candidate_ids: Iterable[int]) -> int:
+        """
+        Retire les passages de plusieurs candidats
+
+        Les passages sont marqués supprimés (ignorés par search) ; l'index est
+        compacté quand ils dépassent COMPACT_RATIO des passages.
+
+        Returns:
+            int: Nombre de passages retirés
+        """
+        candidate_ids = np.asarray(list(candidate_ids), dtype=ROW_DTYPE)
+        if len(candidate_ids) == 0:
+            return 0
+
+        with self._lock, self._file_lock():
+            self._refresh()
+            removed = np.flatnonzero(np.isin(self._rows[:, 0], candidate_ids))
+            removed = np.setdiff1d(removed, self._deleted, assume_unique=True).astype(ROW_DTYPE)
+            if len(removed) == 0:
+                return 0
+
+            self._append(self.deleted_path, removed, len(self._deleted) * ROW_DTYPE().itemsize)
+            self._refresh()
+
+            if len(self._deleted) >= COMPACT_RATIO * self._count:
+                self._compact()
+
+        logger.debug(f"🔎 {len(removed)} passages retirés de l'index")
+        return len(removed)
+
+    def _compact(self):
+        """
+        Réécrit les fichiers sans les passages supprimés (appelé sous verrou)
+
+        Les centroïdes restent valables : seules les lignes disparaissent.
+        """
+        kept = np.setdiff1d(np.arange(self._count), self._deleted, assume_unique=True)
+
+        tmp_vectors = f"{self.vectors_path}.tmp"
+        with open(tmp_vectors, "wb") as f:
+            for start in range(0, len(kept), SCAN_BLOCK):
+                f.write(np.ascontiguousarray(self._vectors[kept[start:start + SCAN_BLOCK]]).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        self._lists[kept].tofile(f"{self.lists_path}.tmp")
+        self._rows[kept].tofile(f"{self.rows_path}.tmp")
+
+        # Marques supprimées d'abord : un arrêt en cours de route laisse au
+        # pire des passages supprimés visibles, jamais des passages masqués à tort
+        os.remove(self.deleted_path)
+        os.replace(tmp_vectors, self.vectors_path)
+        os.replace(f"{self.lists_path}.tmp", self.lists_path)
+        os.replace(f"{self.rows_path}.tmp", self.rows_path)
+
+        meta = self._read_meta()
+        meta["version"] = meta.get("version", 0) + 1
+        self._write_meta(meta)
+
+        removed = self._count - len(kept)
+        self._version = None
+        self._refresh()
+        logger.info(f"🔎 Index compacté : {removed} passages supprimés retirés ({self._count} restants)")
+
+    # ============ Recherche ============
+
+    def search(self, query: str, top_k: int = 10, n_probe: int = N_PROBE) -> List[Dict]:
+        """
+        Recherche les candidats dont un passage du CV est proche de la requête
+
+        Args:
+            query: Texte libre ("expérience en streaming Kafka")
+            top_k: Nombre de candidats à retourner
+            n_probe: Nombre de listes IVF parcourues
+
+        Returns:
+            list: [{"candidate_id", "chunk_index", "score"}] trié par score
+                  (meilleur passage de chaque candidat)
+        """
+        with self._lock:
+            self._refresh()
+            vectors, rows, lists, centroids = self._vectors, self._rows, self._lists, self._centroids
+            deleted = self._deleted
+
+        if len(rows) == len(deleted):
+            return []
+
+        query_vector = self._encode_normalized([query])[0]
+
+        if centroids is None:
+            candidate_rows = None
+        else:
+            probes = np.argsort(-(centroids @ query_vector))[:n_probe]
+            candidate_rows = np.flatnonzero(np.isin(lists, probes))
+
+        if len(deleted):
+            if candidate_rows is None:
+                candidate_rows = np.arange(len(rows))
+            candidate_rows = np.setdiff1d(candidate_rows, deleted, assume_unique=True)
+
+        # Plusieurs passages d'un même candidat peuvent occuper les premières
+        # places : on élargit tant qu'il manque des candidats
+        limit = top_k * 10
+        while True:
+            row_ids, scores = self._scan(vectors, query_vector, candidate_rows, limit=limit)
+            results = self._best_per_candidate(rows, row_ids, scores, top_k)
+            if len(results) >= top_k or len(row_ids) < limit:
+                return results
+            limit *= 4
+
+    @staticmethod
+    def _best_per_candidate(rows: np.ndarray, row_ids: np.ndarray, scores: np.ndarray, top_k: int) -> List[Dict]:
+        """Meilleur passage par candidat, dans l'ordre des scores"""
+        results = []
+        seen = set()
+        for row, score in zip(row_ids, scores):
+            candidate_id, chunk_index = rows[row]
+            if candidate_id in seen:
+                continue
+            seen.add(candidate_id)
+            results.append({
+                "candidate_id": int(candidate_id),
+                "chunk_index": int(chunk_index),
+                "score": float(score)
+            })
+            if len(results) >= top_k:
+                break
+        return results
+
+    def _scan(self, vectors: np.ndarray, query_vector: np.ndarray, candidate_rows, limit: int):
+        """
+        Produit scalaire par blocs (la matrice memory-mappée n'est jamais
+        chargée en entier) et garde les `limit` meilleurs passages
+        """
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=DTYPE)
+
+        total = len(vectors) if candidate_rows is None else len(candidate_rows)
+        for start in range(0, total, SCAN_BLOCK):
+            if candidate_rows is None:
+                block_rows = np.arange(start, min(start + SCAN_BLOCK, total))
+                block = vectors[start:start + SCAN_BLOCK]
+            else:
+                block_rows = candidate_rows[start:start + SCAN_BLOCK]
+                block = vectors[block_rows]
+
+            block_scores = block @ query_vector
+            best_rows = np.concatenate([best_rows, block_rows])
+            best_scores = np.concatenate([best_scores, block_scores])
+
+            if len(best_scores) > limit:
+                keep = np.argpartition(-best_scores, limit)[:limit]
+                best_rows, best_scores = best_rows[keep], best_scores[keep]
+
+        order = np.argsort(-best_scores)
+        return best_rows[order], best_scores[order]
+
+    # ============ IVF (k-means sphérique) ============
+
+    def _train(self):
+        """
+        Entraîne les centroïdes sur un échantillon puis réassigne tous les
+        vecteurs (appelé sous verrou)
+        """
+        n_lists = int(np.clip(4 * np.sqrt(self._count), 16, 4096))
+        rng = np.random.default_rng(0)
+        sample_size = min(self._count, n_lists * KMEANS_SAMPLE_PER_LIST)
+        sample = np.asarray(self._vectors[np.sort(rng.choice(self._count, sample_size, replace=False))])
+
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)]
+        for _ in range(KMEANS_ITERATIONS):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Liste vide : on garde l'ancien centroïde
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+
+        self._centroids = centroids.astype(DTYPE)
+        lists = np.concatenate([
+            self._assign(self._vectors[start:start + SCAN_BLOCK])
+            for start in range(0, self._count, SCAN_BLOCK)
+        ])
+
+        tmp_lists = f"{self.lists_path}.tmp"
+        lists.tofile(tmp_lists)
+        os.replace(tmp_lists, self.lists_path)
+        with open(f"{self.centroids_path}.tmp", "wb") as f:
+            np.save(f, self._centroids)
+        os.replace(f"{self.centroids_path}.tmp", self.centroids_path)
+
+        meta = self._read_meta()
+        meta["version"] = meta.get("version", 0) + 1
+        meta["trained_count"] = self._count
+        self._write_meta(meta)
+
+        # Rechargement complet (nouvelle version)
+        self._version = None
+        self._refresh()
+        logger.info(f"🔎 Index IVF entraîné : {n_lists} listes pour {self._count} passages")
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(np.asarray(vectors) @ self._centroids.T, axis=1).astype(LIST_DTYPE)
+
+    # ============ Synchronisation avec le disque ============
+
+    def _refresh(self):
+        """
+        Relit les passages ajoutés par ce processus ou un autre et recharge
+        les listes IVF après un entraînement
+        """
+        meta = self._read_meta()
+
+        if meta.get("version") != self._version:
+            self._version = meta.get("version")
+            self._trained_count = meta.get("trained_count", 0)
+            self._centroids = np.load(self.centroids_path) if os.path.exists(self.centroids_path) else None
+            self._count = 0
+            self._vectors = np.empty((0, self.dim), dtype=DTYPE)
+            self._rows = np.empty((0, 2), dtype=ROW_DTYPE)
+            self._lists = np.empty(0, dtype=LIST_DTYPE)
+            self._deleted = np.empty(0, dtype=ROW_DTYPE)
+
+        deleted_count = os.path.getsize(self.deleted_path) // ROW_DTYPE().itemsize if os.path.exists(self.deleted_path) else 0
+        if deleted_count > len(self._deleted):
+            new_deleted = np.fromfile(self.deleted_path, dtype=ROW_DTYPE, count=deleted_count - len(self._deleted),
+                                      offset=len(self._deleted) * ROW_DTYPE().itemsize)
+            self._deleted = np.union1d(self._deleted, new_deleted)
+
+        row_bytes = 2 * ROW_DTYPE().itemsize
+        count = os.path.getsize(self.rows_path) // row_bytes if os.path.exists(self.rows_path) else 0
+        if count <= self._count:
+            return
+
+        new_rows = np.fromfile(self.rows_path, dtype=ROW_DTYPE, count=(count - self._count) * 2,
+                               offset=self._count * row_bytes).reshape(-1, 2)
+        new_lists = np.fromfile(self.lists_path, dtype=LIST_DTYPE, count=count - self._count,
+                                offset=self._count * LIST_DTYPE().itemsize)
+
+        self._vectors = np.memmap(self.vectors_path, dtype=DTYPE, mode="r", shape=(count, self.dim))
+        self._rows = np.concatenate([self._rows, new_rows])
+        self._lists = np.concatenate([self._lists, new_lists])
+        self._count = count
+
+    def _append(self, path: str, array: np.ndarray, expected_size: int):
+        """
+        Ajoute un tableau en fin de fichier, après avoir coupé d'éventuelles
+        données orphelines (arrêt pendant une écriture précédente)
+        """
+        with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+            f.truncate(expected_size)
+            f.seek(0, os.SEEK_END)
+            f.write(np.ascontiguousarray(array).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _encode_normalized(self, texts: List[str]) -> np.ndarray:
+        embeddings = np.asarray(
+            self.model.encode(texts, batch_size=64, convert_to_numpy=True), dtype=DTYPE
+        )
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return embeddings / norms
+
+    def _check_meta(self):
+        """Vide l'index si le modèle ou la dimension ont changé"""
+        meta = self._read_meta()
+        if meta.get("model") == self.model_name and meta.get("dim") == self.dim:
+            return
+
+        if meta:
+            logger.warning(f"⚠️  Modèle d'embeddings changé, index réinitialisé : {self.meta_path}")
+        self._reset_files()
+
+    def _reset_files(self):
+        for path in (self.vectors_path, self.rows_path, self.lists_path, self.centroids_path, self.deleted_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+        version = self._read_meta().get("version", 0) + 1
+        self._write_meta({"model": self.model_name, "dim": self.dim, "version": version, "trained_count": 0})
+
+    def _read_meta(self) -> Dict:
+        if not os.path.exists(self.meta_path):
+            return {}
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_meta(self, meta: Dict):
+        tmp_path = f"{self.meta_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self.meta_path)
+
+    @contextmanager
+    def _file_lock(self):
+        """Verrou exclusif entre processus (workers uvicorn, scripts)"""
+        if fcntl is None:
+            yield
+            return
+
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -3,11 +3,15 @@ Module de statistiques avancées pour l'analyse de CV
 """
 
 import logging
-from typing import Dict, List
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+import math
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import func, case, text
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
 from app.models.candidate import Candidate
 from app.models.job_offer import JobOffer
+from app.models.job_statistics import JobStatistics
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +26,12 @@ class RecruitmentStats:
         """
         Statistiques complètes pour une offre d'emploi
         
+        Lues dans la table job_statistics (mise à jour à chaque écriture de
+        candidat). Sans ligne matérialisée, calculées en base (COUNT/CASE,
+        médiane, fréquence des compétences) sans charger les candidats ;
+        si une requête SQL n'est pas supportée, repli sur un calcul en un
+        seul passage sur (cv_score, compétences).
+        
         Args:
             db: Session de base de données
             job_id: ID de l'offre
@@ -29,80 +39,512 @@ class RecruitmentStats:
         Returns:
             dict: Statistiques détaillées
         """
-        candidates = db.query(Candidate).filter(Candidate.job_offer_id == job_id).all()
+        summary = db.get(JobStatistics, job_id)
+        
+        if summary is not None:
+            aggregates = RecruitmentStats._summary_aggregates(summary)
+            if aggregates["total"]:
+                aggregates["category_a_names"] = RecruitmentStats._category_a_names(db, job_id)
+        else:
+            aggregates = RecruitmentStats.compute_job_aggregates(db, job_id)
         
-        if not candidates:
+        if not aggregates["total"]:
             return {
                 "total_candidates": 0,
                 "message": "Aucun candidat pour cette offre"
             }
         
-        scores = [c.cv_score for c in candidates if c.cv_score]
+        stats = RecruitmentStats._format_job_statistics(aggregates)
+        
+        logger.info(f"📊 Statistiques générées pour offre #{job_id}")
+        
+        return stats
+    
+    @staticmethod
+    def compute_job_aggregates(db: Session, job_id: int) -> Dict:
+        """
+        Agrégats d'une offre calculés depuis la table candidates
+        (requêtes SQL, ou un seul passage si elles ne sont pas supportées)
+        """
+        try:
+            aggregates = RecruitmentStats._score_aggregates(db, job_id)
+            
+            if aggregates["total"]:
+                aggregates["median"] = RecruitmentStats._median_score(db, job_id, aggregates)
+                aggregates["top_skills"] = RecruitmentStats._top_skills(db, job_id)
+                aggregates["category_a_names"] = RecruitmentStats._category_a_names(db, job_id)
+        except (OperationalError, ProgrammingError, NotImplementedError) as e:
+            logger.warning(f"⚠️  Agrégation SQL indisponible ({e}), calcul en un passage")
+            db.rollback()
+            aggregates = RecruitmentStats._single_pass_aggregates(db, job_id)
+        
+        return aggregates
+    
+    # ============ Agrégations SQL ============
+    
+    @staticmethod
+    def _score_aggregates(db: Session, job_id: int) -> Dict:
+        """
+        Total, moyenne/min/max des scores non nuls et effectif de chaque
+        catégorie, en une seule requête
+        """
+        score = func.coalesce(Candidate.cv_score, 0)
+        # Comme `if c.cv_score` : les scores nuls ou absents sont ignorés
+        scored = func.nullif(Candidate.cv_score, 0)
+        
+        row = db.query(
+            func.count(Candidate.id),
+            func.count(scored),
+            func.avg(scored),
+            func.min(scored),
+            func.max(scored),
+            func.sum(scored * scored),
+            func.sum(case((score >= 80, 1), else_=0)),
+            func.sum(case(((score >= 65) & (score < 80), 1), else_=0)),
+            func.sum(case(((score >= 50) & (score < 65), 1), else_=0)),
+            func.sum(case((score < 50, 1), else_=0))
+        ).filter(Candidate.job_offer_id == job_id).one()
         
-        # Catégories
-        category_a = [c for c in candidates if c.cv_score >= 80]
-        category_b = [c for c in candidates if 65 <= c.cv_score < 80]
-        category_c = [c for c in candidates if 50 <= c.cv_score < 65]
-        category_d = [c for c in candidates if c.cv_score < 50]
+        total, scored_count, average, minimum, maximum, sum_squares, count_a, count_b, count_c, count_d = row
         
-        # Compétences les plus fréquentes
-        all_skills = {}
-        for c in candidates:
-            if c.extracted_data and 'skills' in c.extracted_data:
-                for skill in c.extracted_data['skills']:
-                    all_skills[skill] = all_skills.get(skill, 0) + 1
+        return {
+            "total": total or 0,
+            "scored_count": scored_count or 0,
+            "average": float(average) if average is not None else None,
+            "mean_square": float(sum_squares) / scored_count if scored_count else None,
+            "min": minimum,
+            "max": maximum,
+            "categories": [count_a or 0, count_b or 0, count_c or 0, count_d or 0]
+        }
+    
+    @staticmethod
+    def _median_score(db: Session, job_id: int, aggregates: Dict):
+        """
+        Médiane des scores non nuls
+        PostgreSQL : percentile_cont ; autres bases : une ou deux valeurs
+        centrales lues avec ORDER BY / OFFSET
+        """
+        scored_count = aggregates["scored_count"]
+        if not scored_count:
+            return None
+        
+        scored = func.nullif(Candidate.cv_score, 0)
+        
+        if db.get_bind().dialect.name == "postgresql":
+            return db.query(
+                func.percentile_cont(0.5).within_group(scored)
+            ).filter(Candidate.job_offer_id == job_id).scalar()
+        
+        middle = db.query(Candidate.cv_score).filter(
+            Candidate.job_offer_id == job_id,
+            Candidate.cv_score.isnot(None),
+            Candidate.cv_score != 0
+        ).order_by(Candidate.cv_score).offset((scored_count - 1) // 2).limit(
+            2 if scored_count % 2 == 0 else 1
+        ).all()
         
-        # Top 10 compétences
-        top_skills = sorted(all_skills.items(), key=lambda x: x[1], reverse=True)[:10]
+        values = [value for (value,) in middle]
+        return sum(values) / len(values)
+    
+    @staticmethod
+    def _top_skills(db: Session, job_id: int, limit: int = 10) -> List[tuple]:
+        """
+        Fréquence des compétences (extracted_data -> skills) calculée en base
+        """
+        dialect = db.get_bind().dialect.name
+        
+        if dialect == "postgresql":
+            query = text("""
+                SELECT skill, COUNT(*) AS count
+                FROM candidates,
+                     json_array_elements_text(
+                         CASE WHEN json_typeof(candidates.extracted_data -> 'skills') = 'array'
+                              THEN candidates.extracted_data -> 'skills'
+                              ELSE '[]'::json END
+                     ) AS skill
+                WHERE candidates.job_offer_id = :job_id
+                GROUP BY skill
+                ORDER BY count DESC, skill
+                LIMIT :limit
+            """)
+        elif dialect == "sqlite":
+            query = text("""
+                SELECT skills.value AS skill, COUNT(*) AS count
+                FROM candidates,
+                     json_each(candidates.extracted_data, '$.skills') AS skills
+                WHERE candidates.job_offer_id = :job_id
+                  AND json_valid(candidates.extracted_data)
+                  AND json_type(candidates.extracted_data, '$.skills') = 'array'
+                GROUP BY skills.value
+                ORDER BY count DESC, skill
+                LIMIT :limit
+            """)
+        else:
+            raise NotImplementedError(f"Fréquence des compétences non supportée pour {dialect}")
+        
+        return [(skill, count) for skill, count in db.execute(query, {"job_id": job_id, "limit": limit})]
+    
+    @staticmethod
+    def _category_a_names(db: Session, job_id: int, limit: int = 5) -> List[str]:
+        """Noms des premiers candidats de catégorie A"""
+        rows = db.query(Candidate.first_name, Candidate.last_name).filter(
+            Candidate.job_offer_id == job_id,
+            Candidate.ranking_score >= 80
+        ).order_by(Candidate.id).limit(limit).all()
         
-        stats = {
-            "total_candidates": len(candidates),
+        return [f"{first_name} {last_name}" for first_name, last_name in rows]
+    
+    # ============ Repli : un seul passage ============
+    
+    @staticmethod
+    def _single_pass_aggregates(db: Session, job_id: int) -> Dict:
+        """
+        Mêmes agrégats en un seul parcours des colonnes utiles (sans cv_text)
+        """
+        total = 0
+        scores = []
+        categories = [0, 0, 0, 0]
+        category_a_names = []
+        skill_counts = Counter()
+        
+        query = db.query(
+            Candidate.first_name, Candidate.last_name, Candidate.cv_score, Candidate.extracted_data
+        ).filter(Candidate.job_offer_id == job_id).order_by(Candidate.id).execution_options(yield_per=1000)
+        
+        for first_name, last_name, cv_score, extracted_data in query:
+            total += 1
+            score = cv_score or 0
+            if cv_score:
+                scores.append(cv_score)
+            
+            if score >= 80:
+                categories[0] += 1
+                if len(category_a_names) < 5:
+                    category_a_names.append(f"{first_name} {last_name}")
+            elif score >= 65:
+                categories[1] += 1
+            elif score >= 50:
+                categories[2] += 1
+            else:
+                categories[3] += 1
+            
+            skills = (extracted_data or {}).get('skills')
+            if isinstance(skills, list):
+                skill_counts.update(skills)
+        
+        scores.sort()
+        middle = len(scores) // 2
+        if not scores:
+            median = None
+        elif len(scores) % 2:
+            median = scores[middle]
+        else:
+            median = (scores[middle - 1] + scores[middle]) / 2
+        
+        return {
+            "total": total,
+            "scored_count": len(scores),
+            "average": sum(scores) / len(scores) if scores else None,
+            "mean_square": sum(score * score for score in scores) / len(scores) if scores else None,
+            "min": scores[0] if scores else None,
+            "max": scores[-1] if scores else None,
+            "median": median,
+            "categories": categories,
+            "category_a_names": category_a_names,
+            "top_skills": sorted(skill_counts.items(), key=lambda x: (-x[1], x[0]))[:10]
+        }
+    
+    @staticmethod
+    def _format_job_statistics(aggregates: Dict) -> Dict:
+        """Met en forme les agrégats (même structure quel que soit le calcul)"""
+        total = aggregates["total"]
+        count_a, count_b, count_c, count_d = aggregates["categories"]
+        
+        average = aggregates["average"]
+        std_dev = 0
+        if average is not None and aggregates["mean_square"] is not None:
+            std_dev = round(math.sqrt(max(0.0, aggregates["mean_square"] - average ** 2)), 1)
+        
+        return {
+            "total_candidates": total,
             "scores": {
-                "average": round(sum(scores) / len(scores), 1) if scores else 0,
-                "min": min(scores) if scores else 0,
-                "max": max(scores) if scores else 0,
-                "median": sorted(scores)[len(scores)//2] if scores else 0
+                "average": round(average, 1) if average is not None else 0,
+                "min": aggregates["min"] if aggregates["min"] is not None else 0,
+                "max": aggregates["max"] if aggregates["max"] is not None else 0,
+                "median": aggregates["median"] if aggregates["median"] is not None else 0,
+                "std_dev": std_dev
             },
             "categories": {
                 "A (≥80)": {
-                    "count": len(category_a),
-                    "percentage": round(len(category_a) / len(candidates) * 100, 1),
-                    "candidates": [f"{c.first_name} {c.last_name}" for c in category_a[:5]]
+                    "count": count_a,
+                    "percentage": round(count_a / total * 100, 1),
+                    "candidates": aggregates["category_a_names"]
                 },
                 "B (65-79)": {
-                    "count": len(category_b),
-                    "percentage": round(len(category_b) / len(candidates) * 100, 1)
+                    "count": count_b,
+                    "percentage": round(count_b / total * 100, 1)
                 },
                 "C (50-64)": {
-                    "count": len(category_c),
-                    "percentage": round(len(category_c) / len(candidates) * 100, 1)
+                    "count": count_c,
+                    "percentage": round(count_c / total * 100, 1)
                 },
                 "D (<50)": {
-                    "count": len(category_d),
-                    "percentage": round(len(category_d) / len(candidates) * 100, 1)
+                    "count": count_d,
+                    "percentage": round(count_d / total * 100, 1)
                 }
             },
             "top_skills": [
-                {"skill": skill, "count": count, "percentage": round(count/len(candidates)*100, 1)}
-                for skill, count in top_skills
+                {"skill": skill, "count": count, "percentage": round(count/total*100, 1)}
+                for skill, count in aggregates["top_skills"]
             ],
             "recommendations": {
-                "to_interview": len(category_a),
-                "to_consider": len(category_b),
-                "reserve": len(category_c),
-                "reject": len(category_d)
+                "to_interview": count_a,
+                "to_consider": count_b,
+                "reserve": count_c,
+                "reject": count_d
             }
         }
+    
+    # ============ Statistiques matérialisées (table job_statistics) ============
+    
+    @staticmethod
+    def record_candidates(db: Session, candidates: Iterable[Candidate]):
+        """
+        Ajoute des candidats créés aux statistiques de leur offre
         
-        logger.info(f"📊 Statistiques générées pour offre #{job_id}")
+        À appeler après l'insertion (flush), dans la même transaction ;
+        le commit reste à la charge de l'appelant.
+        """
+        for job_id, group in RecruitmentStats._group_by_job(candidates).items():
+            summary, rebuilt = RecruitmentStats._summary_for_update(db, job_id)
+            if rebuilt:
+                # Ligne créée depuis la table candidates : inclut déjà ces candidats
+                continue
+            for candidate in group:
+                RecruitmentStats._apply_to_summary(summary, candidate.cv_score, RecruitmentStats._skills_of(candidate), 1)
+    
+    @staticmethod
+    def remove_candidate(db: Session, candidate: Candidate):
+        """
+        Retire un candidat des statistiques de son offre
         
-        return stats
+        À appeler avant db.delete(candidate), dans la même transaction.
+        """
+        if candidate.job_offer_id is None:
+            return
+        summary, _ = RecruitmentStats._summary_for_update(db, candidate.job_offer_id)
+        RecruitmentStats._apply_to_summary(summary, candidate.cv_score, RecruitmentStats._skills_of(candidate), -1)
+    
+    @staticmethod
+    def rebuild_job_statistics(db: Session, job_id: Optional[int] = None) -> int:
+        """
+        Recalcule entièrement la table job_statistics depuis les candidats
+        
+        Args:
+            job_id: Offre à resynchroniser (toutes si None)
+        
+        Returns:
+            int: Nombre d'offres recalculées
+        """
+        job_query = db.query(JobOffer.id)
+        if job_id is not None:
+            job_query = job_query.filter(JobOffer.id == job_id)
+        job_ids = [row.id for row in job_query.all()]
+        
+        for current_job_id in job_ids:
+            existing = db.get(JobStatistics, current_job_id)
+            if existing is not None:
+                db.delete(existing)
+                db.flush()
+            db.add(RecruitmentStats._build_summary(db, current_job_id))
+        
+        db.commit()
+        logger.info(f"📊 Statistiques matérialisées recalculées pour {len(job_ids)} offre(s)")
+        return len(job_ids)
+    
+    @staticmethod
+    def ensure_job_statistics(db: Session) -> int:
+        """
+        Crée les lignes manquantes (offres ayant des candidats mais pas de
+        statistiques, par exemple avant la création de la table)
+        
+        Returns:
+            int: Nombre d'offres initialisées
+        """
+        existing = db.query(JobStatistics.job_offer_id)
+        missing = [
+            row.job_offer_id for row in db.query(Candidate.job_offer_id).filter(
+                Candidate.job_offer_id.isnot(None),
+                Candidate.job_offer_id.notin_(existing)
+            ).distinct().all()
+        ]
+        
+        for job_id in missing:
+            db.add(RecruitmentStats._build_summary(db, job_id))
+        db.commit()
+        
+        if missing:
+            logger.info(f"📊 Statistiques matérialisées initialisées pour {len(missing)} offre(s)")
+        return len(missing)
+    
+    @staticmethod
+    def _summary_for_update(db: Session, job_id: int) -> Tuple[JobStatistics, bool]:
+        """
+        Ligne de statistiques verrouillée (FOR UPDATE) pour une mise à jour
+        
+        Returns:
+            tuple: (ligne, True si elle vient d'être calculée depuis les candidats)
+        """
+        summary = db.query(JobStatistics).filter(
+            JobStatistics.job_offer_id == job_id
+        ).with_for_update().first()
+        if summary is not None:
+            return summary, False
+        
+        summary = RecruitmentStats._build_summary(db, job_id)
+        try:
+            with db.begin_nested():
+                db.add(summary)
+        except IntegrityError:
+            # Créée entre-temps par une autre transaction
+            summary = db.query(JobStatistics).filter(
+                JobStatistics.job_offer_id == job_id
+            ).with_for_update().one()
+            return summary, False
+        
+        return summary, True
+    
+    @staticmethod
+    def _build_summary(db: Session, job_id: int) -> JobStatistics:
+        """Calcule une ligne de statistiques en un passage sur (cv_score, compétences)"""
+        summary = RecruitmentStats._empty_summary(job_id)
+        
+        query = db.query(Candidate.cv_score, Candidate.extracted_data).filter(
+            Candidate.job_offer_id == job_id
+        ).execution_options(yield_per=1000)
+        
+        for cv_score, extracted_data in query:
+            skills = (extracted_data or {}).get('skills')
+            RecruitmentStats._apply_to_summary(summary, cv_score, skills if isinstance(skills, list) else [], 1)
+        
+        return summary
+    
+    @staticmethod
+    def _empty_summary(job_id: int) -> JobStatistics:
+        return JobStatistics(
+            job_offer_id=job_id,
+            total_candidates=0,
+            scored_count=0,
+            score_sum=0.0,
+            score_sum_squares=0.0,
+            score_histogram={},
+            count_a=0,
+            count_b=0,
+            count_c=0,
+            count_d=0,
+            skill_counts={}
+        )
+    
+    @staticmethod
+    def _apply_to_summary(summary: JobStatistics, cv_score: Optional[float], skills: List[str], sign: int):
+        """
+        Ajoute (sign=1) ou retire (sign=-1) la contribution d'un candidat
+        Les colonnes JSON sont réaffectées pour que SQLAlchemy détecte le changement
+        """
+        summary.total_candidates += sign
+        
+        if cv_score:
+            summary.score_sum += sign * cv_score
+            summary.scored_count += sign
+            summary.score_sum_squares += sign * cv_score * cv_score
+            histogram = dict(summary.score_histogram or {})
+            RecruitmentStats._add_count(histogram, f"{cv_score:.1f}", sign)
+            summary.score_histogram = histogram
+        
+        score = cv_score or 0
+        if score >= 80:
+            summary.count_a += sign
+        elif score >= 65:
+            summary.count_b += sign
+        elif score >= 50:
+            summary.count_c += sign
+        else:
+            summary.count_d += sign
+        
+        if skills:
+            skill_counts = dict(summary.skill_counts or {})
+            for skill in skills:
+                if isinstance(skill, str):
+                    RecruitmentStats._add_count(skill_counts, skill, sign)
+            summary.skill_counts = skill_counts
+    
+    @staticmethod
+    def _add_count(counts: Dict[str, int], key: str, sign: int):
+        count = counts.get(key, 0) + sign
+        if count > 0:
+            counts[key] = count
+        else:
+            counts.pop(key, None)
+    
+    @staticmethod
+    def _summary_aggregates(summary: JobStatistics) -> Dict:
+        """
+        Agrégats lus depuis une ligne job_statistics (médiane, min et max à
+        partir de l'histogramme des scores)
+        """
+        histogram = sorted(
+            ((float(score), count) for score, count in (summary.score_histogram or {}).items()),
+            key=lambda item: item[0]
+        )
+        scored_count = summary.scored_count
+        
+        median = None
+        if scored_count:
+            middle = {(scored_count - 1) // 2, scored_count // 2}
+            values = []
+            seen = 0
+            for score, count in histogram:
+                values.extend(score for position in middle if seen <= position < seen + count)
+                seen += count
+            median = sum(values) / len(values)
+        
+        skill_counts = summary.skill_counts or {}
+        
+        return {
+            "total": summary.total_candidates,
+            "scored_count": scored_count,
+            "average": summary.score_sum / scored_count if scored_count else None,
+            "mean_square": summary.score_sum_squares / scored_count if scored_count else None,
+            "min": histogram[0][0] if histogram else None,
+            "max": histogram[-1][0] if histogram else None,
+            "median": median,
+            "categories": [summary.count_a, summary.count_b, summary.count_c, summary.count_d],
+            "category_a_names": [],
+            "top_skills": sorted(skill_counts.items(), key=lambda x: (-x[1], x[0]))[:10]
+        }
+    
+    @staticmethod
+    def _group_by_job(candidates: Iterable[Candidate]) -> Dict[int, List[Candidate]]:
+        groups = {}
+        for candidate in candidates:
+            if candidate.job_offer_id is not None:
+                groups.setdefault(candidate.job_offer_id, []).append(candidate)
+        return groups
+    
+    @staticmethod
+    def _skills_of(candidate: Candidate) -> List[str]:
+        skills = (candidate.extracted_data or {}).get('skills')
+        return skills if isinstance(skills, list) else []
     
     @staticmethod
     def get_candidate_comparison(db: Session, candidate_id: int, job_id: int) -> Dict:
         """
         Compare un candidat avec les autres pour la même offre
         
+        Rang et percentile sans charger les candidats de l'offre : lus dans
+        l'histogramme des scores (job_statistics), ou à défaut comptés en
+        base sur l'index (job_offer_id, ranking_score).
+        
         Args:
             db: Session
             candidate_id: ID du candidat
@@ -111,22 +553,36 @@ class RecruitmentStats:
         Returns:
             dict: Comparaison
         """
-        candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+        candidate = db.query(Candidate).options(load_only(
+            Candidate.id, Candidate.first_name, Candidate.last_name, Candidate.cv_score, Candidate.job_offer_id
+        )).filter(Candidate.id == candidate_id).first()
         if not candidate:
             return {"error": "Candidat introuvable"}
         
-        all_candidates = db.query(Candidate).filter(Candidate.job_offer_id == job_id).all()
+        score = candidate.cv_score or 0.0
+        summary = db.get(JobStatistics, job_id)
+        
+        # L'histogramme est au dixième de point : exact pour les scores arrondis
+        if summary is not None and summary.total_candidates and round(score, 1) == score:
+            total, greater, less, avg_score = RecruitmentStats._rank_from_summary(summary, score)
+        else:
+            total, greater, less, avg_score = RecruitmentStats._rank_from_counts(db, job_id, score)
         
-        # Rang du candidat
-        sorted_candidates = sorted(all_candidates, key=lambda x: x.cv_score, reverse=True)
-        rank = next((i+1 for i, c in enumerate(sorted_candidates) if c.id == candidate_id), None)
+        if not total:
+            return {"error": "Aucun candidat pour cette offre"}
         
-        # Scores moyens
-        avg_score = sum(c.cv_score for c in all_candidates) / len(all_candidates)
+        # Rang (à score égal, le candidat le plus ancien passe devant)
+        rank = None
+        if candidate.job_offer_id == job_id:
+            ties_before = db.query(func.count(Candidate.id)).filter(
+                Candidate.job_offer_id == job_id,
+                Candidate.ranking_score == score,
+                Candidate.id < candidate.id
+            ).scalar()
+            rank = greater + ties_before + 1
         
         # Percentile
-        better_than = sum(1 for c in all_candidates if c.cv_score < candidate.cv_score)
-        percentile = round(better_than / len(all_candidates) * 100, 1)
+        percentile = round(less / total * 100, 1)
         
         return {
             "candidate": {
@@ -135,40 +591,89 @@ class RecruitmentStats:
             },
             "ranking": {
                 "position": rank,
-                "total": len(all_candidates),
+                "total": total,
                 "percentile": percentile
             },
             "comparison": {
                 "average_score": round(avg_score, 1),
-                "difference": round(candidate.cv_score - avg_score, 1),
-                "above_average": candidate.cv_score > avg_score
+                "difference": round(score - avg_score, 1),
+                "above_average": score > avg_score
             }
         }
     
+    @staticmethod
+    def _rank_from_summary(summary: JobStatistics, score: float) -> Tuple[int, int, int, float]:
+        """
+        (total, meilleurs scores, scores inférieurs, moyenne) depuis l'histogramme
+        Coût proportionnel au nombre de scores distincts (≤ 1001), pas au
+        nombre de candidats
+        """
+        histogram = summary.score_histogram or {}
+        total = summary.total_candidates
+        
+        greater = sum(count for key, count in histogram.items() if float(key) > score)
+        if score:
+            equal = histogram.get(f"{score:.1f}", 0)
+        else:
+            # Les scores nuls ne sont pas dans l'histogramme
+            equal = total - summary.scored_count
+        less = total - greater - equal
+        
+        return total, greater, less, summary.score_sum / total
+    
+    @staticmethod
+    def _rank_from_counts(db: Session, job_id: int, score: float) -> Tuple[int, int, int, float]:
+        """
+        (total, meilleurs scores, scores inférieurs, moyenne) par des COUNT
+        sur l'index (job_offer_id, ranking_score)
+        """
+        base = db.query(func.count(Candidate.id)).filter(Candidate.job_offer_id == job_id)
+        
+        total, score_sum = db.query(
+            func.count(Candidate.id),
+            func.sum(func.coalesce(Candidate.cv_score, 0))
+        ).filter(Candidate.job_offer_id == job_id).one()
+        
+        if not total:
+            return 0, 0, 0, 0.0
+        
+        # ranking_score : cv_score absent compté comme 0
+        greater = base.filter(Candidate.ranking_score > score).scalar()
+        less = base.filter(Candidate.ranking_score < score).scalar()
+        
+        return total, greater, less, (score_sum or 0) / total
+    
     @staticmethod
     def get_global_statistics(db: Session) -> Dict:
         """
         Statistiques globales du système
         
+        Sommes des statistiques matérialisées par offre (job_statistics) :
+        aucune requête ne parcourt la table candidates.
+        
         Args:
             db: Session
         
         Returns:
             dict: Stats globales
         """
-        total_jobs = db.query(JobOffer).count()
-        total_candidates = db.query(Candidate).count()
-        
-        active_jobs = db.query(JobOffer).filter(JobOffer.is_active == True).count()
+        total_jobs, active_jobs = db.query(
+            func.count(JobOffer.id),
+            func.sum(case((JobOffer.is_active == True, 1), else_=0))
+        ).one()
         
-        avg_score = db.query(func.avg(Candidate.cv_score)).scalar()
+        total_candidates, score_sum, category_a, category_b = db.query(
+            func.sum(JobStatistics.total_candidates),
+            func.sum(JobStatistics.score_sum),
+            func.sum(JobStatistics.count_a),
+            func.sum(JobStatistics.count_b)
+        ).one()
         
-        # Candidats par catégorie (global)
-        category_a = db.query(Candidate).filter(Candidate.cv_score >= 80).count()
-        category_b = db.query(Candidate).filter(
-            Candidate.cv_score >= 65, 
-            Candidate.cv_score < 80
-        ).count()
+        total_candidates = total_candidates or 0
+        active_jobs = active_jobs or 0
+        category_a = category_a or 0
+        category_b = category_b or 0
+        avg_score = score_sum / total_candidates if total_candidates else None
         
         return {
             "system": {
@@ -0,0 +1,190 @@
+"""
+Registre des modèles et ressources partagés par toute l'application
+Analyseurs, pipelines spaCy, SentenceTransformer et banque de questions
+sont chargés une seule fois par processus (au démarrage, dans le lifespan)
+puis injectés dans les routes avec Depends(get_model_registry)
+"""
+
+import logging
+import threading
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+# Chemin du modèle NER fine-tuné utilisé pour l'extraction des compétences
+SKILL_NER_MODEL_PATH = "models/skill_ner_v2"
+
+
+# ============ Fabriques (imports tardifs : modèles lourds) ============
+
+def _create_improved_analyzer():
+    from app.modules.cv_analyzer.improved_analyzer import ImprovedCVAnalyzer
+    return ImprovedCVAnalyzer()
+
+
+def _create_cv_parser():
+    from app.modules.cv_analyzer.parser import CVParser
+    # Upload unitaire : les longs PDF sont répartis sur le pool de processus
+    return CVParser(parallel=True)
+
+
+def _create_cv_extractor():
+    from app.modules.cv_analyzer.extractor_ml import CVExtractorML
+    return CVExtractorML(custom_model_path=SKILL_NER_MODEL_PATH)
+
+
+def _create_sentence_model():
+    from app.modules.chatbot.evaluator import get_sentence_model
+    return get_sentence_model()
+
+
+def _create_embedding_store(sentence_model):
+    if sentence_model is None:
+        return None
+    from app.config import get_settings
+    from app.modules.cv_analyzer.embedding_store import EmbeddingStore
+    return EmbeddingStore(sentence_model, model_name=get_settings().sentence_transformer_model)
+
+
+def _create_search_index(sentence_model):
+    if sentence_model is None:
+        return None
+    from app.config import get_settings
+    from app.modules.cv_analyzer.search_index import CandidateSearchIndex
+    return CandidateSearchIndex(sentence_model, model_name=get_settings().sentence_transformer_model)
+
+
+def _create_cv_scorer():
+    from app.modules.cv_analyzer.scorer import CVScorer
+    return CVScorer()
+
+
+def _create_excel_exporter():
+    from app.modules.cv_analyzer.excel_exporter import ExcelExporter
+    return ExcelExporter()
+
+
+def _create_dataset_loader():
+    from app.modules.chatbot.dataset_loader import DatasetLoader
+    return DatasetLoader()
+
+
+def _create_evaluation_service():
+    from app.config import get_settings
+    if not get_settings().ml_evaluation:
+        return None
+    from app.modules.chatbot.evaluation_service import get_evaluation_service
+    return get_evaluation_service()
+
+
+class ModelRegistry:
+    """
+    Conteneur des instances partagées (une par processus)
+    Chaque ressource est créée au premier accès puis réutilisée
+    """
+
+    def __init__(self):
+        self._instances: Dict[str, object] = {}
+        self._lock = threading.RLock()
+
+    def _get(self, name: str, factory: Callable):
+        if name not in self._instances:
+            with self._lock:
+                if name not in self._instances:
+                    self._instances[name] = factory()
+        return self._instances[name]
+
+    # ============ Module 3 : Analyse de CV ============
+
+    @property
+    def improved_analyzer(self):
+        return self._get("improved_analyzer", _create_improved_analyzer)
+
+    @property
+    def cv_parser(self):
+        return self._get("cv_parser", _create_cv_parser)
+
+    @property
+    def cv_extractor(self):
+        """Extracteur ML (pipeline spaCy NER fine-tuné)"""
+        return self._get("cv_extractor", _create_cv_extractor)
+
+    @property
+    def sentence_model(self):
+        """SentenceTransformer partagé (matching des compétences, évaluation)"""
+        return self._get("sentence_model", _create_sentence_model)
+
+    @property
+    def embedding_store(self):
+        """Cache persistant des embeddings de compétences (None sans BERT)"""
+        return self._get("embedding_store", lambda: _create_embedding_store(self.sentence_model))
+
+    @property
+    def cv_matcher(self):
+        from app.modules.cv_analyzer.matcher import CVMatcher
+        return self._get("cv_matcher", lambda: CVMatcher(
+            use_bert=True, model=self.sentence_model, embedding_store=self.embedding_store
+        ))
+
+    @property
+    def search_index(self):
+        """Index de recherche sémantique des CVs (None sans BERT)"""
+        return self._get("search_index", lambda: _create_search_index(self.sentence_model))
+
+    @property
+    def candidate_skill_index(self):
+        """Index inversé des compétences des candidats (matching inversé)"""
+        from app.modules.cv_analyzer.reverse_matcher import CandidateSkillIndex
+        return self._get("candidate_skill_index", CandidateSkillIndex)
+
+    @property
+    def cv_scorer(self):
+        return self._get("cv_scorer", _create_cv_scorer)
+
+    @property
+    def excel_exporter(self):
+        return self._get("excel_exporter", _create_excel_exporter)
+
+    # ============ Chatbot d'entretien ============
+
+    @property
+    def dataset_loader(self):
+        """Banque de questions JSON (lue et parsée une seule fois)"""
+        return self._get("dataset_loader", _create_dataset_loader)
+
+    @property
+    def evaluation_service(self):
+        """Évaluation ML des réponses par micro-lots (None si settings.ml_evaluation est désactivé)"""
+        return self._get("evaluation_service", _create_evaluation_service)
+
+    def warm_up(self):
+        """
+        Charge toutes les ressources (appelé au démarrage de l'application)
+        """
+        for name in (
+            "improved_analyzer", "cv_parser", "cv_extractor", "sentence_model",
+            "embedding_store", "cv_matcher", "search_index", "cv_scorer", "excel_exporter",
+            "dataset_loader", "evaluation_service"
+        ):
+            try:
+                getattr(self, name)
+            except Exception as e:
+                logger.warning(f"⚠️  Ressource '{name}' non chargée : {e}")
+
+        logger.info(f"✅ Registre des modèles prêt ({len(self._instances)} ressources)")
+
+
+_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    """
+    Retourne le registre du processus
+    Utilisé comme dépendance FastAPI
+
+    Example:
+        @router.get("/items")
+        def get_items(models: ModelRegistry = Depends(get_model_registry)):
+            return models.improved_analyzer.analyze(...)
+    """
+    return _registry
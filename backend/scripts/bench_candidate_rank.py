@@ -0,0 +1,136 @@
+"""
+Benchmark du rang / percentile d'un candidat (get_candidate_comparison)
+
+Compare, pour des offres de taille croissante :
+  1. l'ancienne version : chargement de tous les candidats de l'offre + tri
+  2. des COUNT en base sur l'index (job_offer_id, ranking_score)
+  3. la lecture de l'histogramme des scores de job_statistics
+
+Utilise une base SQLite temporaire (aucune donnée réelle n'est modifiée)
+"""
+import sys
+import os
+import argparse
+import logging
+import random
+import shutil
+import tempfile
+import time
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.candidate import Candidate
+from app.models.job_offer import JobOffer
+from app.models.job_statistics import JobStatistics
+import app.models.interview  # noqa: F401  (relations des modèles)
+from app.modules.cv_analyzer.statistics import RecruitmentStats
+
+SIZES = [1_000, 5_000, 10_000, 50_000]
+LOOKUPS = 20
+
+logging.disable(logging.CRITICAL)
+
+
+def legacy_comparison(db, candidate_id: int, job_id: int) -> dict:
+    """Ancienne implémentation : tous les candidats chargés et triés"""
+    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+    all_candidates = db.query(Candidate).filter(Candidate.job_offer_id == job_id).all()
+
+    sorted_candidates = sorted(all_candidates, key=lambda x: x.cv_score, reverse=True)
+    rank = next((i+1 for i, c in enumerate(sorted_candidates) if c.id == candidate_id), None)
+    avg_score = sum(c.cv_score for c in all_candidates) / len(all_candidates)
+    better_than = sum(1 for c in all_candidates if c.cv_score < candidate.cv_score)
+
+    return {
+        "candidate": {
+            "name": f"{candidate.first_name} {candidate.last_name}",
+            "score": candidate.cv_score
+        },
+        "ranking": {
+            "position": rank,
+            "total": len(all_candidates),
+            "percentile": round(better_than / len(all_candidates) * 100, 1)
+        },
+        "comparison": {
+            "average_score": round(avg_score, 1),
+            "difference": round(candidate.cv_score - avg_score, 1),
+            "above_average": candidate.cv_score > avg_score
+        }
+    }
+
+
+def populate(db, job_id: int, size: int, rng: random.Random) -> list:
+    """Crée `size` candidats pour l'offre et renvoie leurs ids"""
+    db.add(JobOffer(
+        id=job_id, reference=f"BENCH-{job_id}", title="Benchmark", industry="IT",
+        location="Tunis", experience_min_years=2
+    ))
+    db.bulk_save_objects([
+        Candidate(
+            first_name="Candidat", last_name=str(i), email=f"bench{job_id}_{i}@example.com",
+            cv_score=round(rng.uniform(20, 95), 1), job_offer_id=job_id,
+            extracted_data={"skills": ["Python"]}
+        )
+        for i in range(size)
+    ])
+    db.commit()
+    return [row.id for row in db.query(Candidate.id).filter(Candidate.job_offer_id == job_id)]
+
+
+def timed(function, db, lookups: list, job_id: int) -> float:
+    """Durée moyenne (ms) d'une comparaison"""
+    start = time.perf_counter()
+    for candidate_id in lookups:
+        function(db, candidate_id, job_id)
+        db.expire_all()
+    return (time.perf_counter() - start) / len(lookups) * 1000
+
+
+def main(sizes: list):
+    directory = tempfile.mkdtemp(prefix="bench_rank_")
+    engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+    tables = [JobOffer.__table__, Candidate.__table__, JobStatistics.__table__]
+    JobOffer.metadata.create_all(bind=engine, tables=tables)
+    Session = sessionmaker(bind=engine)
+    rng = random.Random(42)
+
+    print(f"📊 Rang d'un candidat ({LOOKUPS} requêtes par taille)\n")
+    print(f"  {'candidats':>10} {'ancien':>12} {'COUNT indexés':>15} {'histogramme':>13}")
+
+    try:
+        for job_id, size in enumerate(sizes, start=1):
+            db = Session()
+            try:
+                ids = populate(db, job_id, size, rng)
+                lookups = rng.sample(ids, LOOKUPS)
+
+                legacy_ms = timed(legacy_comparison, db, lookups, job_id)
+                counts_ms = timed(RecruitmentStats.get_candidate_comparison, db, lookups, job_id)
+
+                RecruitmentStats.rebuild_job_statistics(db, job_id)
+                summary_ms = timed(RecruitmentStats.get_candidate_comparison, db, lookups, job_id)
+
+                mismatches = sum(
+                    legacy_comparison(db, candidate_id, job_id)
+                    != RecruitmentStats.get_candidate_comparison(db, candidate_id, job_id)
+                    for candidate_id in lookups
+                )
+            finally:
+                db.close()
+
+            print(f"  {size:>10} {legacy_ms:>9.2f} ms {counts_ms:>12.2f} ms {summary_ms:>10.2f} ms"
+                  + (f"  ⚠️ {mismatches} écart(s)" if mismatches else ""))
+    finally:
+        engine.dispose()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+
+    main(parser.parse_args().sizes)
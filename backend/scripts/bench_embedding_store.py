@@ -0,0 +1,80 @@
+"""
+Benchmark du cache persistant d'embeddings (EmbeddingStore)
+
+Simule le matching de compétences sur une série de CVs qui partagent
+l'essentiel de leur vocabulaire :
+  1. sans cache : chaque CV ré-encode ses compétences avec le modèle
+  2. cache froid : premier passage, les compétences sont encodées puis écrites
+  3. cache chaud : nouveau processus simulé (réouverture des fichiers)
+
+Nécessite sentence-transformers (modèle paraphrase-multilingual-MiniLM-L12-v2)
+"""
+import sys
+import os
+import logging
+import random
+import shutil
+import tempfile
+import time
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import get_settings
+from app.modules.chatbot.evaluator import get_sentence_model
+from app.modules.cv_analyzer.embedding_store import EmbeddingStore
+from app.modules.cv_analyzer.improved_analyzer import PROFESSIONAL_SKILLS
+from app.modules.cv_analyzer.matcher import CVMatcher
+
+NUM_CVS = 200
+SKILLS_PER_CV = 25
+
+logging.disable(logging.CRITICAL)
+
+
+def synthetic_cv_skills(vocabulary: list, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    return [rng.sample(vocabulary, SKILLS_PER_CV) for _ in range(NUM_CVS)]
+
+
+def run(matcher: CVMatcher, cvs: list, required_skills: list) -> float:
+    """Durée moyenne (ms) du matching par CV"""
+    start = time.perf_counter()
+    for cv_skills in cvs:
+        matcher.match_skills(cv_skills, required_skills)
+    return (time.perf_counter() - start) / len(cvs) * 1000
+
+
+def main():
+    model = get_sentence_model()
+    if model is None:
+        print("❌ sentence-transformers indisponible : benchmark impossible")
+        sys.exit(1)
+
+    vocabulary = sorted(skill.title() for skill in PROFESSIONAL_SKILLS)
+    cvs = synthetic_cv_skills(vocabulary)
+    required_skills = vocabulary[:15]
+    model_name = get_settings().sentence_transformer_model
+    directory = tempfile.mkdtemp(prefix="embeddings_")
+
+    print(f"📊 Matching de {NUM_CVS} CVs ({SKILLS_PER_CV} compétences, vocabulaire de {len(vocabulary)})")
+
+    try:
+        no_cache_ms = run(CVMatcher(use_bert=True, model=model), cvs, required_skills)
+
+        cold_store = EmbeddingStore(model, model_name=model_name, directory=directory)
+        cold_ms = run(CVMatcher(use_bert=True, model=model, embedding_store=cold_store), cvs, required_skills)
+
+        warm_store = EmbeddingStore(model, model_name=model_name, directory=directory)
+        warm_ms = run(CVMatcher(use_bert=True, model=model, embedding_store=warm_store), cvs, required_skills)
+
+        print(f"  Sans cache                {no_cache_ms:9.2f} ms/CV")
+        print(f"  Cache froid               {cold_ms:9.2f} ms/CV")
+        print(f"  Cache chaud (réouvert)    {warm_ms:9.2f} ms/CV  ({len(warm_store)} vecteurs)")
+        print(f"\n📈 Accélération (cache chaud) : x{no_cache_ms / warm_ms:.1f}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark de l'évaluation ML des réponses d'entretien (réponses/s)
+
+Sur des réponses construites à partir de la banque de questions, mesure :
+  1. Evaluator.analyze_response appelé une réponse à la fois
+  2. Evaluator.analyze_responses par lots (nlp.pipe, sentiment et encode
+     sur tout le lot)
+  3. EvaluationService (micro-lots) avec des clients simultanés, comme
+     des requêtes /respond traitées en parallèle
+
+Les modèles absents (BERT, SentenceTransformer) sont signalés : seules les
+étapes disponibles sont mesurées.
+
+Usage :
+    python scripts/bench_evaluator.py [--answers 256] [--batch-size 16] [--clients 1 8 32]
+"""
+import sys
+import os
+import argparse
+import logging
+import random
+import threading
+import time
+import warnings
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.modules.chatbot.dataset_loader import DatasetLoader
+from app.modules.chatbot.evaluation_service import EvaluationService
+from app.modules.chatbot.evaluator import Evaluator
+
+logging.disable(logging.CRITICAL)
+warnings.filterwarnings("ignore")  # Similarité spaCy sans vecteurs (modèle vierge)
+
+SENTENCES = [
+    "J'ai travaillé sur plusieurs projets avec {kw} en équipe agile.",
+    "Dans mon dernier poste, j'utilisais {kw} au quotidien pour livrer des fonctionnalités.",
+    "Je maîtrise {kw} et j'ai formé deux collègues à son utilisation.",
+    "Je pense que {kw} est important, même si je n'ai pas beaucoup d'expérience.",
+]
+
+
+def build_answers(count: int, rng: random.Random) -> list:
+    """(question, réponse, mots-clés) tirés de la banque de questions"""
+    bank = DatasetLoader().questions_bank
+    questions = list(bank.get("welcome", [])) + list(bank.get("behavioral", []))
+    for job_questions in bank.get("technical", {}).values():
+        questions.extend(job_questions)
+
+    answers = []
+    for _ in range(count):
+        q_data = rng.choice(questions)
+        keywords = q_data.get("keywords", []) or ["projet"]
+        response = " ".join(
+            rng.choice(SENTENCES).format(kw=rng.choice(keywords)) for _ in range(rng.randint(2, 5))
+        )
+        answers.append((q_data["text"], response, keywords))
+    return answers
+
+
+def throughput(count: int, elapsed: float) -> float:
+    return count / elapsed if elapsed else float("inf")
+
+
+def bench_sequential(evaluator: Evaluator, answers: list) -> float:
+    start = time.perf_counter()
+    for question, response, keywords in answers:
+        evaluator.analyze_response(question, response, keywords)
+    return throughput(len(answers), time.perf_counter() - start)
+
+
+def bench_batched(evaluator: Evaluator, answers: list, batch_size: int) -> float:
+    start = time.perf_counter()
+    for i in range(0, len(answers), batch_size):
+        evaluator.analyze_responses(answers[i:i + batch_size])
+    return throughput(len(answers), time.perf_counter() - start)
+
+
+def bench_service(evaluator: Evaluator, answers: list, batch_size: int, wait_ms: float, clients: int) -> tuple:
+    """Réponses/s et taille moyenne des lots avec `clients` threads simultanés"""
+    service = EvaluationService(evaluator, max_batch_size=batch_size, max_wait_ms=wait_ms)
+    chunks = [answers[i::clients] for i in range(clients)]
+
+    def client(chunk):
+        for question, response, keywords in chunk:
+            service.evaluate(question, response, keywords)
+
+    threads = [threading.Thread(target=client, args=(chunk,)) for chunk in chunks]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    service.close()
+
+    return throughput(len(answers), elapsed), service.answers / max(service.batches, 1)
+
+
+def main(count: int, batch_size: int, wait_ms: float, clients_list: list):
+    answers = build_answers(count, random.Random(42))
+
+    evaluator = Evaluator()
+    evaluator.warm_up()
+
+    print(f"📊 Évaluation de {count} réponses (lots de {batch_size}, attente {wait_ms} ms)\n")
+    print(f"  spaCy : {evaluator.nlp.meta.get('name', '?')} ({'vecteurs' if evaluator.nlp.vocab.vectors.size else 'sans vecteurs'})")
+    print(f"  Sentiment BERT : {'chargé' if evaluator.sentiment_analyzer is not None else 'absent'}")
+    print(f"  SentenceTransformer : {'chargé' if evaluator.sentence_model is not None else 'absent'}\n")
+
+    sequential = bench_sequential(evaluator, answers)
+    print(f"  {'une réponse à la fois':34} {sequential:>9.1f} réponses/s")
+
+    batched = bench_batched(evaluator, answers, batch_size)
+    print(f"  {'analyze_responses (lots)':34} {batched:>9.1f} réponses/s  (x{batched / sequential:.1f})")
+
+    for clients in clients_list:
+        rate, average_batch = bench_service(evaluator, answers, batch_size, wait_ms, clients)
+        label = f"EvaluationService, {clients} client(s)"
+        print(f"  {label:34} {rate:>9.1f} réponses/s  (x{rate / sequential:.1f}, lots de {average_batch:.1f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--answers", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--wait-ms", type=float, default=2.0)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+
+    main(args.answers, args.batch_size, args.wait_ms, args.clients)
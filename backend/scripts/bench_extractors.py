@@ -0,0 +1,122 @@
+"""
+Benchmark des fonctions d'extraction des CVs (temps par CV)
+
+Mesure, sur les textes des PDF du dossier (défaut : data/uploads/cvs),
+chaque fonction d'extraction d'ImprovedCVAnalyzer, CVExtractor et
+CVExtractorML (sans modèle spaCy : seules les expressions régulières
+sont mesurées), puis l'extraction complète.
+
+Le cache du texte en minuscules (patterns.lower_text) est vidé avant
+chaque CV : les temps incluent la conversion, comme au premier appel.
+
+Usage :
+    python scripts/bench_extractors.py [--dir data/uploads/cvs] [--repeat 20]
+"""
+import sys
+import os
+import argparse
+import logging
+import time
+from pathlib import Path
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.modules.cv_analyzer.extractor import CVExtractor
+from app.modules.cv_analyzer.extractor_ml import CVExtractorML
+from app.modules.cv_analyzer.improved_analyzer import ImprovedCVAnalyzer
+from app.modules.cv_analyzer.parser import CVParser
+from app.modules.cv_analyzer.patterns import lower_text
+
+logging.disable(logging.CRITICAL)
+
+
+def load_texts(directory: str) -> list:
+    """Textes des PDF lisibles du dossier"""
+    parser = CVParser()
+    texts = []
+    for path in sorted(Path(directory).glob("*.pdf")):
+        try:
+            text = parser.extract_text_from_pdf(str(path))
+        except Exception:
+            continue
+        if text.strip():
+            texts.append(text)
+    return texts
+
+
+def time_per_cv(function, texts: list, repeat: int) -> float:
+    """Meilleur temps moyen (µs) par CV sur `repeat` passes"""
+    best = float("inf")
+    for _ in range(repeat):
+        elapsed = 0.0
+        for text in texts:
+            lower_text.cache_clear()
+            start = time.perf_counter()
+            function(text)
+            elapsed += time.perf_counter() - start
+        best = min(best, elapsed)
+    return best / len(texts) * 1e6
+
+
+def regex_only_ml_extractor() -> CVExtractorML:
+    """CVExtractorML sans modèle spaCy (repli sur les expressions régulières)"""
+    extractor = CVExtractorML.__new__(CVExtractorML)
+    extractor.nlp = None
+    extractor.use_custom_model = False
+    return extractor
+
+
+def main(directory: str, repeat: int):
+    texts = load_texts(directory)
+    if not texts:
+        print(f"❌ Aucun CV lisible dans {directory}")
+        sys.exit(1)
+
+    improved = ImprovedCVAnalyzer()
+    extractor = CVExtractor()
+    extractor_ml = regex_only_ml_extractor()
+
+    benchmarks = [
+        ("ImprovedCVAnalyzer", [
+            ("contact", improved.extract_contact_info),
+            ("compétences", improved.extract_skills),
+            ("expérience", improved.extract_experience_years),
+            ("formations", improved.extract_education),
+            ("langues", improved.extract_languages),
+            ("extract (complet)", improved.extract),
+        ]),
+        ("CVExtractor", [
+            ("contact", extractor.extract_contact_info),
+            ("compétences", extractor.extract_skills),
+            ("expérience", extractor.extract_experience_years),
+            ("formations", extractor.extract_education),
+            ("langues", extractor.extract_languages),
+            ("extract_all (complet)", extractor.extract_all),
+        ]),
+        ("CVExtractorML (sans spaCy)", [
+            ("contact", extractor_ml.extract_contact_info),
+            ("expérience", extractor_ml.extract_experience_years),
+            ("formations", extractor_ml.extract_education),
+            ("langues", extractor_ml.extract_languages),
+        ]),
+    ]
+
+    average_chars = sum(len(text) for text in texts) // len(texts)
+    print(f"📊 Extraction sur {len(texts)} CVs ({average_chars} caractères en moyenne, "
+          f"{repeat} passes, meilleur temps)\n")
+
+    for title, functions in benchmarks:
+        print(f"  {title}")
+        for label, function in functions:
+            print(f"    {label:24} {time_per_cv(function, texts, repeat):>9.1f} µs/CV")
+        print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", default="data/uploads/cvs")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    main(args.dir, args.repeat)
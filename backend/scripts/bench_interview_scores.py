@@ -0,0 +1,162 @@
+"""
+Benchmark de la mise à jour des scores d'une session d'entretien
+
+Pour des sessions de plus en plus longues (entretiens adaptatifs), mesure
+la mise à jour des scores après une réponse :
+  1. l'ancienne version : toutes les réponses relues, question chargée
+     une par une (N+1)
+  2. les sommes courantes de la session (temps constant)
+  3. le recalcul complet en une requête agrégée (audit)
+
+Utilise une base SQLite temporaire (aucune donnée réelle n'est modifiée)
+"""
+import sys
+import os
+import argparse
+import logging
+import random
+import shutil
+import tempfile
+import time
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.candidate import Candidate
+from app.models.job_offer import JobOffer
+from app.models.interview import (
+    InterviewQuestion, InterviewResponse, InterviewSession, QuestionCategory
+)
+from app.modules.chatbot.dataset_loader import DatasetLoader
+from app.modules.chatbot.interviewer import Interviewer
+
+SIZES = [10, 100, 1_000]
+UPDATES = 20
+
+logging.disable(logging.CRITICAL)
+
+
+def legacy_update_scores(db, session: InterviewSession):
+    """Ancienne implémentation : toutes les réponses de la session relues"""
+    responses = db.query(InterviewResponse).filter(
+        InterviewResponse.session_id == session.id
+    ).all()
+
+    tech = [r.overall_response_score * r.question.weight
+            for r in responses
+            if r.question.category == QuestionCategory.TECHNICAL]
+    beh = [r.overall_response_score * r.question.weight
+           for r in responses
+           if r.question.category == QuestionCategory.BEHAVIORAL]
+
+    if tech:
+        session.technical_score = sum(tech) / len(tech)
+    if beh:
+        session.behavioral_score = sum(beh) / len(beh)
+    session.overall_score = (session.technical_score * 0.6) + (session.behavioral_score * 0.4)
+
+
+def populate(db, interviewer: Interviewer, session_id: int, size: int, rng: random.Random) -> InterviewSession:
+    """Session de `size` réponses à autant de questions"""
+    categories = list(QuestionCategory)
+    questions = [
+        InterviewQuestion(
+            text=f"Question {session_id}-{i}", category=categories[i % len(categories)],
+            weight=rng.choice([0.5, 1.0, 1.5]), job_offer_id=1, is_generic=False
+        )
+        for i in range(size)
+    ]
+    db.add_all(questions)
+    db.flush()
+
+    session = InterviewSession(
+        id=session_id, candidate_id=session_id, job_offer_id=1,
+        question_ids=[question.id for question in questions]
+    )
+    db.add(session)
+    db.add_all([
+        InterviewResponse(
+            session_id=session_id, question_id=question.id, response_text="Réponse",
+            overall_response_score=round(rng.uniform(30, 95), 1)
+        )
+        for question in questions
+    ])
+    db.commit()
+
+    interviewer._recompute_scores(session)
+    db.commit()
+    return session
+
+
+def timed(Session, session_id: int, update) -> float:
+    """Durée moyenne (ms) d'une mise à jour, dans une session DB neuve comme une requête"""
+    total = 0.0
+    for _ in range(UPDATES):
+        db = Session()
+        try:
+            session = db.get(InterviewSession, session_id)
+            question = db.get(InterviewQuestion, session.question_ids[-1])
+            start = time.perf_counter()
+            update(db, session, question)
+            total += time.perf_counter() - start
+            db.rollback()
+        finally:
+            db.close()
+    return total / UPDATES * 1000
+
+
+def main(sizes: list):
+    directory = tempfile.mkdtemp(prefix="bench_scores_")
+    engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    rng = random.Random(42)
+    dataset_loader = DatasetLoader()
+
+    def legacy(db, session, question):
+        legacy_update_scores(db, session)
+
+    def running(db, session, question):
+        Interviewer(db, dataset_loader=dataset_loader)._update_scores(session, question, 80.0)
+
+    def recompute(db, session, question):
+        Interviewer(db, dataset_loader=dataset_loader)._recompute_scores(session)
+
+    print(f"📊 Mise à jour des scores après une réponse ({UPDATES} mesures par taille)\n")
+    print(f"  {'réponses':>10} {'ancien (N+1)':>14} {'sommes courantes':>18} {'recalcul agrégé':>17}")
+
+    db = Session()
+    try:
+        db.add(JobOffer(
+            id=1, reference="BENCH-1", title="Benchmark", industry="IT",
+            location="Tunis", experience_min_years=2
+        ))
+        db.add_all([
+            Candidate(id=i, first_name="Candidat", last_name=str(i), email=f"bench{i}@example.com", job_offer_id=1)
+            for i in range(1, len(sizes) + 1)
+        ])
+        db.commit()
+
+        for session_id, size in enumerate(sizes, start=1):
+            populate(db, Interviewer(db, dataset_loader=dataset_loader), session_id, size, rng)
+
+            legacy_ms = timed(Session, session_id, legacy)
+            running_ms = timed(Session, session_id, running)
+            recompute_ms = timed(Session, session_id, recompute)
+
+            print(f"  {size:>10} {legacy_ms:>11.2f} ms {running_ms:>15.3f} ms {recompute_ms:>14.2f} ms")
+    finally:
+        db.close()
+        engine.dispose()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+
+    main(parser.parse_args().sizes)
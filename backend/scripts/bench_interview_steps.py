@@ -0,0 +1,230 @@
+"""
+Benchmark des étapes d'entretien (start_interview, submit_response)
+
+Après N entretiens démarrés sur la même offre, mesure :
+  - le démarrage d'un entretien (durée et nombre de requêtes SQL) :
+    copie des questions pour chaque session (ancien) ou référence aux
+    questions canoniques (question_store)
+  - la latence d'une réponse (analyse + enregistrement + question suivante) :
+    toutes les questions de l'offre relues à chaque étape (ancien) ou
+    lecture par clé primaire dans l'ordre propre à la session
+
+Utilise une base SQLite temporaire (aucune donnée réelle n'est modifiée)
+"""
+import sys
+import os
+import argparse
+import logging
+import shutil
+import tempfile
+import time
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.candidate import Candidate
+from app.models.job_offer import JobOffer
+from app.models.interview import (
+    InterviewPhase, InterviewQuestion, InterviewSession, InterviewStatus,
+    QuestionCategory, QuestionDifficulty
+)
+from app.modules.chatbot.dataset_loader import DatasetLoader
+from app.modules.chatbot.interviewer import Interviewer
+
+SIZES = [0, 100, 1_000]
+SESSIONS_MEASURED = 5
+STEPS = 10  # Questions d'un entretien (Interviewer._load_questions_from_dataset)
+ANSWER = "J'ai travaillé sur plusieurs projets Python avec Django et PostgreSQL en équipe agile."
+
+logging.disable(logging.CRITICAL)
+
+
+class LegacyInterviewer(Interviewer):
+    """
+    Ancienne implémentation : questions copiées pour chaque session,
+    questions de l'offre relues à chaque étape
+    """
+
+    def start_interview(self, candidate_id: int, job_offer_id: int) -> dict:
+        job_offer = self.db.query(JobOffer).filter(JobOffer.id == job_offer_id).first()
+        custom_questions = self._load_questions_from_dataset(job_offer)
+
+        session = InterviewSession(
+            candidate_id=candidate_id, job_offer_id=job_offer_id,
+            status=InterviewStatus.IN_PROGRESS, current_phase=InterviewPhase.WELCOME,
+            questions_total=len(custom_questions), questions_answered=0
+        )
+        self.db.add(session)
+        self.db.commit()
+        self.db.refresh(session)
+
+        for q_data in custom_questions:
+            self.db.add(InterviewQuestion(
+                text=q_data['text'],
+                category=QuestionCategory[q_data['category'].upper()],
+                difficulty=QuestionDifficulty[q_data.get('difficulty', 'medium').upper()],
+                expected_keywords=q_data.get('keywords', []),
+                weight=q_data.get('weight', 1.0),
+                job_offer_id=job_offer_id,
+                job_title=job_offer.title,
+                is_generic=False
+            ))
+        self.db.commit()
+
+        return {"session_id": str(session.id), **self.get_next_question(str(session.id))}
+
+    def get_next_question(self, session_id: str) -> dict:
+        session = self.db.query(InterviewSession).filter(
+            InterviewSession.id == int(session_id)
+        ).first()
+
+        if session.status == InterviewStatus.COMPLETED:
+            return {"status": "completed"}
+
+        questions = self.db.query(InterviewQuestion).filter(
+            InterviewQuestion.job_offer_id == session.job_offer_id,
+            InterviewQuestion.is_generic == False
+        ).order_by(InterviewQuestion.id).all()
+
+        if not questions or session.questions_answered >= len(questions):
+            return self._complete_interview(session)
+
+        current = questions[session.questions_answered]
+        self._update_phase(session, current.category)
+        self.db.commit()
+
+        return {
+            "status": "in_progress",
+            "question_id": str(current.id),
+            "current_question": session.questions_answered + 1,
+            "total_questions": len(questions)
+        }
+
+
+def add_candidates(db, job_id: int, count: int) -> list:
+    """Crée `count` candidats pour l'offre et renvoie leurs ids"""
+    start = db.query(Candidate).count()
+    candidates = [
+        Candidate(
+            first_name="Candidat", last_name=str(i), email=f"bench{i}@example.com",
+            cv_score=50.0, job_offer_id=job_id
+        )
+        for i in range(start, start + count)
+    ]
+    db.add_all(candidates)
+    db.commit()
+    return [candidate.id for candidate in candidates]
+
+
+class StatementCounter:
+    """Nombre de requêtes SQL envoyées au moteur"""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+def run_interview(interviewer: Interviewer, candidate_id: int, job_id: int, counter: StatementCounter) -> tuple:
+    """
+    Entretien de STEPS réponses au plus
+
+    (l'ancienne lecture ne termine l'entretien qu'après toutes les questions
+    de l'offre, y compris celles des autres sessions)
+
+    Returns:
+        tuple: (durée du démarrage en ms, requêtes SQL du démarrage,
+                durées de chaque submit_response en ms)
+    """
+    statements = counter.count
+    start = time.perf_counter()
+    step = interviewer.start_interview(candidate_id, job_id)
+    start_ms = (time.perf_counter() - start) * 1000
+    statements = counter.count - statements
+
+    session_id = step["session_id"]
+    timings = []
+
+    while step.get("status") == "in_progress" and len(timings) < STEPS:
+        start = time.perf_counter()
+        result = interviewer.submit_response(session_id, step["question_id"], ANSWER)
+        timings.append((time.perf_counter() - start) * 1000)
+        step = result["next_question"]
+
+    return start_ms, statements, timings
+
+
+def average(values: list) -> float:
+    return sum(values) / len(values)
+
+
+def main(sizes: list):
+    directory = tempfile.mkdtemp(prefix="bench_interview_")
+    engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    dataset_loader = DatasetLoader()
+
+    counter = StatementCounter(engine)
+
+    print(f"📊 Étapes d'entretien ({SESSIONS_MEASURED} entretiens mesurés par taille, ancien -> nouveau)\n")
+    print(f"  {'entretiens':>10} {'questions':>10} {'démarrage':>22} {'requêtes SQL':>14} {'réponse':>22}")
+
+    db = Session()
+    try:
+        db.add(JobOffer(
+            id=1, reference="BENCH-1", title="Développeur Python", industry="IT",
+            location="Tunis", experience_min_years=2
+        ))
+        db.commit()
+
+        interviewer = Interviewer(db, dataset_loader=dataset_loader)
+        legacy = LegacyInterviewer(db, dataset_loader=dataset_loader)
+        started = 0
+
+        for size in sorted(sizes):
+            # Entretiens démarrés sur la même offre jusqu'à `size` (avec chaque implémentation)
+            candidates = add_candidates(db, 1, 2 * max(0, size - started))
+            for legacy_id, current_id in zip(candidates[0::2], candidates[1::2]):
+                legacy.start_interview(legacy_id, 1)
+                interviewer.start_interview(current_id, 1)
+            started = max(started, size)
+
+            measured = add_candidates(db, 1, 2 * SESSIONS_MEASURED)
+
+            results = {"legacy": ([], [], []), "current": ([], [], [])}
+            for name, implementation, candidates in (
+                ("legacy", legacy, measured[:SESSIONS_MEASURED]),
+                ("current", interviewer, measured[SESSIONS_MEASURED:])
+            ):
+                start_timings, start_statements, step_timings = results[name]
+                for candidate_id in candidates:
+                    start_ms, statements, timings = run_interview(implementation, candidate_id, 1, counter)
+                    start_timings.append(start_ms)
+                    start_statements.append(statements)
+                    step_timings.extend(timings)
+
+            num_questions = db.query(InterviewQuestion).count()
+            legacy_start, legacy_statements, legacy_steps = results["legacy"]
+            current_start, current_statements, current_steps = results["current"]
+            print(f"  {size:>10} {num_questions:>10} "
+                  f"{average(legacy_start):>7.2f} -> {average(current_start):>6.2f} ms "
+                  f"{average(legacy_statements):>5.0f} -> {average(current_statements):<4.0f} "
+                  f"{average(legacy_steps):>7.2f} -> {average(current_steps):>6.2f} ms")
+    finally:
+        db.close()
+        engine.dispose()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+
+    main(parser.parse_args().sizes)
@@ -0,0 +1,131 @@
+"""
+Benchmark du score de mots-clés des réponses d'entretien (temps par réponse)
+
+Compare, sur des réponses construites à partir de la banque de questions :
+  1. l'ancienne version : réponse et chaque mot-clé analysés par le
+     pipeline spaCy complet, puis Doc.similarity mot-clé par mot-clé
+  2. les vecteurs des mots-clés stockés (InterviewQuestion.keyword_vectors) :
+     réponse tokenisée, une similarité cosinus vectorisée, recherche des
+     mots-clés dans les tokens
+
+Utilise settings.spacy_model s'il est installé, sinon un pipeline vierge
+avec des vecteurs aléatoires (--dim) : seul le tokenizer est alors mesuré
+dans l'ancienne version, le gain réel est plus grand.
+
+Usage :
+    python scripts/bench_keyword_score.py [--answers 500] [--repeat 5]
+"""
+import sys
+import os
+import argparse
+import logging
+import random
+import time
+import warnings
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import spacy
+
+from app.config import get_settings
+from app.modules.chatbot.evaluator import Evaluator
+from bench_evaluator import build_answers
+
+logging.disable(logging.CRITICAL)
+warnings.filterwarnings("ignore")
+
+
+def legacy_keyword_score(nlp, response_text: str, expected_keywords: list) -> float:
+    """Ancienne implémentation : chaque mot-clé réanalysé à chaque réponse"""
+    response_doc = nlp(response_text.lower())
+
+    matches = 0
+    for keyword in expected_keywords:
+        keyword_doc = nlp(keyword.lower())
+        similarity = response_doc.similarity(keyword_doc)
+        if similarity > 0.7:
+            matches += 1
+        elif similarity > 0.5:
+            matches += 0.5
+        elif any(keyword.lower() in token.text.lower() for token in response_doc):
+            matches += 0.75
+
+    return min(100, (matches / len(expected_keywords)) * 100)
+
+
+def load_nlp(answers: list, dim: int):
+    """Modèle spaCy configuré, sinon pipeline vierge avec vecteurs aléatoires"""
+    try:
+        return spacy.load(get_settings().spacy_model), True
+    except OSError:
+        pass
+
+    nlp = spacy.blank("fr")
+    rng = np.random.default_rng(42)
+    words = {
+        token.text
+        for _, response, keywords in answers
+        for text in [response, *keywords]
+        for token in nlp.tokenizer(text.lower())
+    }
+    for word in sorted(words):
+        nlp.vocab.set_vector(word, rng.normal(size=dim).astype("float32"))
+    return nlp, False
+
+
+def best_time(function, answers: list, repeat: int) -> float:
+    """Meilleur temps moyen (µs) par réponse"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best / len(answers) * 1e6
+
+
+def main(count: int, repeat: int, dim: int):
+    answers = build_answers(count, random.Random(42))
+    nlp, installed = load_nlp(answers, dim)
+
+    evaluator = Evaluator()
+    evaluator.nlp = nlp
+    stored = [evaluator.keyword_vectors(keywords).tolist() for _, _, keywords in answers]
+    responses = [response for _, response, _ in answers]
+    keywords_list = [keywords for _, _, keywords in answers]
+
+    legacy_scores = [legacy_keyword_score(nlp, response, keywords) for _, response, keywords in answers]
+    scores = evaluator.calculate_keyword_scores(responses, keywords_list, stored)
+    different = sum(1 for a, b in zip(legacy_scores, scores) if abs(a - b) > 1e-6)
+
+    average_keywords = sum(len(keywords) for keywords in keywords_list) / len(answers)
+    model = nlp.meta.get("name") if installed else f"pipeline vierge, vecteurs aléatoires ({dim} dim.)"
+    print(f"📊 Score de mots-clés sur {count} réponses "
+          f"({average_keywords:.1f} mots-clés en moyenne, {model})\n")
+
+    legacy_us = best_time(
+        lambda: [legacy_keyword_score(nlp, r, k) for _, r, k in answers], answers, repeat
+    )
+    unit_us = best_time(
+        lambda: [evaluator.calculate_keyword_score(r, k, v) for (_, r, k), v in zip(answers, stored)],
+        answers, repeat
+    )
+    batch_us = best_time(
+        lambda: evaluator.calculate_keyword_scores(responses, keywords_list, stored), answers, repeat
+    )
+
+    print(f"  {'ancien (nlp par mot-clé)':34} {legacy_us:>9.1f} µs/réponse")
+    print(f"  {'vecteurs stockés, une réponse':34} {unit_us:>9.1f} µs/réponse  (x{legacy_us / unit_us:.1f})")
+    print(f"  {'vecteurs stockés, lot':34} {batch_us:>9.1f} µs/réponse  (x{legacy_us / batch_us:.1f})")
+    print(f"\n  Scores différents de l'ancienne version : {different}/{count}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--answers", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--dim", type=int, default=300)
+    args = parser.parse_args()
+
+    main(args.answers, args.repeat, args.dim)
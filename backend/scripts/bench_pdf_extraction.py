@@ -0,0 +1,129 @@
+"""
+Benchmark de l'extraction de texte des CVs (temps par page)
+
+Pour chaque PDF du dossier (défaut : data/uploads/cvs) :
+  1. pdfplumber seul (ancienne extraction, analyse de mise en page)
+  2. chemin rapide : PyPDF2, repli pdfplumber sur les pages dégradées
+et, sur un document long formé de toutes les pages, le chemin rapide
+en série puis réparti sur le pool de processus.
+
+Usage :
+    python scripts/bench_pdf_extraction.py [--dir data/uploads/cvs] [--repeat 3]
+"""
+import sys
+import os
+import argparse
+import logging
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyPDF2 import PdfReader, PdfWriter
+
+from app.config import get_settings
+from app.modules.cv_analyzer import batch_processor
+from app.modules.cv_analyzer.parser import CVParser
+
+logging.disable(logging.CRITICAL)
+
+
+def best_time(function, repeat: int) -> float:
+    """Meilleur temps (s) sur `repeat` exécutions"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def merge_pages(pdf_paths: list, output_path: str) -> int:
+    """Concatène toutes les pages en un seul PDF et renvoie leur nombre"""
+    writer = PdfWriter()
+    for path in pdf_paths:
+        for page in PdfReader(str(path)).pages:
+            writer.add_page(page)
+    with open(output_path, "wb") as output:
+        writer.write(output)
+    return len(writer.pages)
+
+
+def main(directory: str, repeat: int):
+    plumber = CVParser(fast_path=False)
+    fast = CVParser(fast_path=True)
+
+    pdf_paths = sorted(Path(directory).glob("*.pdf"))
+    if not pdf_paths:
+        print(f"❌ Aucun PDF dans {directory}")
+        sys.exit(1)
+
+    print(f"📊 Extraction de {len(pdf_paths)} PDF ({repeat} répétitions, meilleur temps)\n")
+    print(f"  {'fichier':38} {'pages':>5} {'pdfplumber':>14} {'rapide':>12} {'repli':>6} {'texte':>7}")
+
+    valid_paths = []
+    total_pages = 0
+    total_plumber = 0.0
+    total_fast = 0.0
+
+    for path in pdf_paths:
+        try:
+            pages = fast.extract_pages_text(str(path))
+            reference = plumber.extract_text_from_pdf(str(path))
+        except Exception as e:
+            print(f"  {path.name[:38]:38} ignoré ({type(e).__name__})")
+            continue
+
+        plumber_time = best_time(lambda: plumber.extract_text_from_pdf(str(path)), repeat)
+        fast_time = best_time(lambda: fast.extract_text_from_pdf(str(path)), repeat)
+        fallbacks = sum(1 for _, engine in pages if engine == "pdfplumber")
+        same_text = fast.extract_text_from_pdf(str(path)) == reference
+
+        valid_paths.append(path)
+        total_pages += len(pages)
+        total_plumber += plumber_time
+        total_fast += fast_time
+
+        print(f"  {path.name[:38]:38} {len(pages):>5} "
+              f"{plumber_time / len(pages) * 1000:>9.1f} ms/p {fast_time / len(pages) * 1000:>7.1f} ms/p "
+              f"{fallbacks:>6} {'égal' if same_text else 'diff.':>7}")
+
+    if not total_pages:
+        sys.exit(1)
+
+    print(f"\n  Moyenne : pdfplumber {total_plumber / total_pages * 1000:.1f} ms/page, "
+          f"rapide {total_fast / total_pages * 1000:.1f} ms/page "
+          f"(x{total_plumber / total_fast:.1f})")
+
+    # Document long : série vs parallèle
+    workers = get_settings().max_workers
+    directory_tmp = tempfile.mkdtemp(prefix="bench_pdf_")
+    try:
+        long_pdf = os.path.join(directory_tmp, "long.pdf")
+        num_pages = merge_pages(valid_paths, long_pdf)
+        parallel = CVParser(fast_path=True, parallel=True)
+
+        parallel.extract_text_from_pdf(long_pdf)  # démarrage du pool
+        serial_time = best_time(lambda: fast.extract_text_from_pdf(long_pdf), repeat)
+        parallel_time = best_time(lambda: parallel.extract_text_from_pdf(long_pdf), repeat)
+        same_order = fast.extract_text_from_pdf(long_pdf) == parallel.extract_text_from_pdf(long_pdf)
+
+        print(f"\n📄 Document de {num_pages} pages ({workers} workers, {os.cpu_count()} CPU)")
+        print(f"  Série                 {serial_time * 1000:9.1f} ms")
+        print(f"  Parallèle             {parallel_time * 1000:9.1f} ms  (x{serial_time / parallel_time:.1f})")
+        print(f"  Ordre des pages       {'conservé' if same_order else 'DIFFÉRENT'}")
+    finally:
+        batch_processor.shutdown_process_pool()
+        shutil.rmtree(directory_tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", default="data/uploads/cvs")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    main(args.dir, args.repeat)
@@ -0,0 +1,75 @@
+"""
+Mesure des allocations mémoire par requête : construction par requête vs registre partagé
+
+Avant : chaque requête créait un ImprovedCVAnalyzer() et un Interviewer(db),
+        qui relisait et reparsait la banque de questions JSON (DatasetLoader)
+Après : les routes récupèrent les instances du registre (Depends(get_model_registry))
+"""
+import sys
+import os
+import logging
+import time
+import tracemalloc
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.modules.cv_analyzer.improved_analyzer import ImprovedCVAnalyzer
+from app.modules.chatbot.interviewer import Interviewer
+from app.modules.chatbot.dataset_loader import DatasetLoader
+from app.modules.model_registry import ModelRegistry
+
+NUM_REQUESTS = 200
+
+logging.disable(logging.CRITICAL)
+
+
+def per_request_construction():
+    """Ce que faisaient les routes avant le registre"""
+    analyzer = ImprovedCVAnalyzer()
+    interviewer = Interviewer(db=None)
+    return analyzer, interviewer
+
+
+def with_registry(registry: ModelRegistry):
+    """Ce que font les routes avec le registre"""
+    analyzer = registry.improved_analyzer
+    interviewer = Interviewer(db=None, dataset_loader=registry.dataset_loader)
+    return analyzer, interviewer
+
+
+def measure(label: str, func, *args):
+    """Pic mémoire alloué pendant chaque requête (moyenne) et durée moyenne"""
+    tracemalloc.start()
+    allocated = 0
+    start = time.perf_counter()
+
+    for _ in range(NUM_REQUESTS):
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = func(*args)
+        _, request_peak = tracemalloc.get_traced_memory()
+        allocated += request_peak - baseline
+        del result
+
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+
+    print(f"  {label:<28} {allocated / NUM_REQUESTS / 1024:9.1f} KiB/requête  "
+          f"{elapsed / NUM_REQUESTS * 1000:7.3f} ms/requête")
+
+
+def main():
+    print(f"📊 Allocations par requête ({NUM_REQUESTS} requêtes simulées)")
+    print(f"   Banque de questions : {DatasetLoader().dataset_path}")
+
+    measure("Avant (construction)", per_request_construction)
+
+    registry = ModelRegistry()
+    registry.improved_analyzer
+    registry.dataset_loader
+    measure("Après (registre partagé)", with_registry, registry)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark de l'extraction des compétences (ImprovedCVAnalyzer.extract_skills)
+Compare l'ancienne boucle regex (une recherche par compétence) avec le trie
+précompilé, et vérifie que les deux retournent exactement les mêmes compétences
+"""
+import sys
+import os
+import re
+import random
+import time
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.modules.cv_analyzer.improved_analyzer import (
+    PROFESSIONAL_SKILLS, find_professional_skills
+)
+
+NUM_CVS = 1000
+
+FILLER_WORDS = [
+    "expérience", "projet", "équipe", "développement", "client", "gestion",
+    "mise", "en", "place", "de", "la", "des", "avec", "pour", "sur", "chez",
+    "2019", "2024", "(", ")", ",", ".", "-", "/", "+", "#", "senior", "junior"
+]
+
+
+def legacy_find_skills(text_lower: str) -> set:
+    """Ancienne implémentation : une regex par compétence"""
+    found = set()
+    for skill in PROFESSIONAL_SKILLS:
+        pattern = r'\b' + re.escape(skill) + r'\b'
+        if re.search(pattern, text_lower):
+            found.add(skill)
+    return found
+
+
+def generate_cvs(count: int, seed: int = 42) -> list:
+    """Génère des CVs synthétiques mêlant compétences et texte libre"""
+    rng = random.Random(seed)
+    skills = sorted(PROFESSIONAL_SKILLS)
+    cvs = []
+
+    for _ in range(count):
+        tokens = []
+        for _ in range(rng.randint(150, 600)):
+            if rng.random() < 0.15:
+                skill = rng.choice(skills)
+                tokens.append(skill.upper() if rng.random() < 0.3 else skill)
+            else:
+                tokens.append(rng.choice(FILLER_WORDS))
+        separator = rng.choice([" ", ", ", "\n", " / "])
+        cvs.append(separator.join(tokens))
+
+    return cvs
+
+
+def main():
+    cvs = [cv.lower() for cv in generate_cvs(NUM_CVS)]
+    print(f"📄 {len(cvs)} CVs synthétiques, {len(PROFESSIONAL_SKILLS)} compétences")
+
+    start = time.perf_counter()
+    legacy_results = [legacy_find_skills(cv) for cv in cvs]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    trie_results = [find_professional_skills(cv) for cv in cvs]
+    trie_time = time.perf_counter() - start
+
+    # Parité
+    mismatches = [i for i, (a, b) in enumerate(zip(legacy_results, trie_results)) if a != b]
+    if mismatches:
+        i = mismatches[0]
+        print(f"❌ {len(mismatches)} CVs divergent (ex. CV #{i})")
+        print(f"   Seulement regex : {sorted(legacy_results[i] - trie_results[i])}")
+        print(f"   Seulement trie  : {sorted(trie_results[i] - legacy_results[i])}")
+        sys.exit(1)
+
+    print("✅ Parité : mêmes compétences sur tous les CVs")
+    print(f"⏱️  Boucle regex : {legacy_time:.3f}s ({legacy_time / len(cvs) * 1000:.2f} ms/CV)")
+    print(f"⏱️  Trie         : {trie_time:.3f}s ({trie_time / len(cvs) * 1000:.2f} ms/CV)")
+    print(f"🚀 Accélération : x{legacy_time / trie_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark du matching des compétences : paires encodées une à une vs matrice vectorisée
+
+Avant : pour 30 compétences du CV x 15 compétences requises, match_skills
+        appelait compute_similarity 450 fois (450 appels à encode, 900 textes)
+Après : un seul encode batché des compétences uniques, puis un produit
+        matriciel de vecteurs normalisés et un argmax par ligne
+
+Nécessite sentence-transformers (modèle paraphrase-multilingual-MiniLM-L12-v2)
+"""
+import sys
+import os
+import logging
+import time
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from app.modules.cv_analyzer.matcher import CVMatcher
+
+NUM_RUNS = 5
+
+logging.disable(logging.CRITICAL)
+
+CV_SKILLS = [
+    "Python", "Django", "Flask", "FastAPI", "PostgreSQL", "MySQL", "MongoDB", "Redis",
+    "Docker", "Kubernetes", "Git", "Linux", "JavaScript", "TypeScript", "React",
+    "Vue.js", "Node.js", "HTML", "CSS", "REST API", "GraphQL", "AWS", "Azure",
+    "CI/CD", "Jenkins", "Pandas", "NumPy", "Machine Learning", "Scrum", "Agile"
+]
+
+REQUIRED_SKILLS = [
+    "Python", "Django REST Framework", "Bases de données relationnelles", "Docker",
+    "Orchestration de conteneurs", "Git", "JavaScript", "React", "API REST", "Cloud AWS",
+    "Intégration continue", "Analyse de données", "Apprentissage automatique",
+    "Méthodes agiles", "Tests unitaires"
+]
+
+
+def legacy_best_matches(matcher: CVMatcher, cv_skills: list, required_skills: list) -> list:
+    """Ancienne boucle de match_skills : une similarité (donc un encode) par paire"""
+    results = []
+    for req_skill in required_skills:
+        best_match = None
+        best_score = 0.0
+        for cv_skill in cv_skills:
+            similarity = matcher.compute_similarity(cv_skill, req_skill)
+            if similarity > best_score:
+                best_score = similarity
+                best_match = cv_skill
+        results.append((req_skill, best_match, best_score))
+    return results
+
+
+def vectorized_best_matches(matcher: CVMatcher, cv_skills: list, required_skills: list) -> list:
+    """Nouvelle version de match_skills (détails uniquement)"""
+    details = matcher.match_skills(cv_skills, required_skills)["details"]
+    return [
+        (d["required"], None if d["found"] == "Non trouvé" else d["found"], d["similarity"])
+        for d in details
+    ]
+
+
+def timed(func, *args) -> tuple:
+    """Durée moyenne (ms) sur NUM_RUNS exécutions et dernier résultat"""
+    start = time.perf_counter()
+    for _ in range(NUM_RUNS):
+        result = func(*args)
+    return (time.perf_counter() - start) / NUM_RUNS * 1000, result
+
+
+def main():
+    matcher = CVMatcher(use_bert=True)
+    if not (matcher.use_bert and matcher.model):
+        print("❌ sentence-transformers indisponible : benchmark BERT impossible")
+        sys.exit(1)
+
+    print(f"📊 Matching {len(CV_SKILLS)} compétences CV x {len(REQUIRED_SKILLS)} requises "
+          f"({NUM_RUNS} exécutions)")
+
+    # Préchauffage du modèle
+    matcher.model.encode(["warm-up"])
+
+    legacy_ms, legacy = timed(legacy_best_matches, matcher, CV_SKILLS, REQUIRED_SKILLS)
+    vectorized_ms, vectorized = timed(vectorized_best_matches, matcher, CV_SKILLS, REQUIRED_SKILLS)
+
+    # Mêmes meilleures correspondances, scores identiques à l'arrondi près
+    same_matches = all(
+        old[1] == new[1] and np.isclose(old[2], new[2], atol=1e-2)
+        for old, new in zip(legacy, vectorized)
+    )
+
+    print(f"  Avant (paire par paire)   {legacy_ms:9.1f} ms")
+    print(f"  Après (matrice)           {vectorized_ms:9.1f} ms")
+    print(f"\n📈 Accélération : x{legacy_ms / vectorized_ms:.1f}")
+    print(f"{'✅' if same_matches else '❌'} Correspondances identiques : {same_matches}")
+
+
+if __name__ == "__main__":
+    main()
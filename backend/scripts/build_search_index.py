@@ -0,0 +1,57 @@
+"""
+Script pour (re)construire l'index de recherche sémantique des CVs
+À lancer une fois pour indexer les candidats déjà en base ; les nouveaux
+CVs sont ensuite ajoutés à l'index au fil des uploads.
+"""
+import sys
+import os
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database import SessionLocal
+from app.models.candidate import Candidate
+from app.modules.model_registry import get_model_registry
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+DB_BATCH_SIZE = 500
+
+
+def iter_candidates(db):
+    """(candidate_id, cv_text) de tous les candidats, lus par paquets"""
+    query = (
+        db.query(Candidate.id, Candidate.cv_text)
+        .filter(Candidate.cv_text.isnot(None))
+        .order_by(Candidate.id)
+        .execution_options(yield_per=DB_BATCH_SIZE)
+    )
+    for row in query:
+        yield row.id, row.cv_text
+
+
+def main():
+    """Reconstruit l'index à partir de la base"""
+    search_index = get_model_registry().search_index
+    if search_index is None:
+        logger.error("❌ sentence-transformers indisponible : index non construit")
+        sys.exit(1)
+
+    logger.info("🚀 RECONSTRUCTION DE L'INDEX DE RECHERCHE")
+    db = SessionLocal()
+    try:
+        total = search_index.rebuild(iter_candidates(db))
+    finally:
+        db.close()
+
+    logger.info(f"🎉 {total} passages indexés")
+
+
+if __name__ == "__main__":
+    main()
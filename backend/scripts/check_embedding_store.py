@@ -0,0 +1,96 @@
+"""
+Vérifie que le cache d'embeddings (EmbeddingStore) relit ses clés à
+l'identique après écriture et réouverture, y compris les textes contenant
+des séparateurs de ligne Unicode (U+2028, U+2029, \x85) ou des accents
+
+Utilise un modèle déterministe minimal (pas de SentenceTransformer) et un
+dossier temporaire :
+    python scripts/check_embedding_store.py
+
+Code de sortie 1 si une clé est perdue ou associée au mauvais vecteur.
+"""
+import sys
+import os
+import hashlib
+import logging
+import shutil
+import tempfile
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from app.modules.cv_analyzer.embedding_store import EmbeddingStore
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+DIM = 8
+TEXTS = [
+    "Python",
+    "node" + chr(0x2028) + "js",
+    "data" + chr(0x2029) + "science",
+    "ci" + chr(0x85) + "cd",
+    "Développement Web",
+    "ligne\nsuivante",
+]
+
+
+class HashModel:
+    """Modèle d'embeddings déterministe (vecteur tiré du sha256 du texte)"""
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return DIM
+
+    def encode(self, texts, **kwargs) -> np.ndarray:
+        return np.array([
+            np.frombuffer(hashlib.sha256(text.encode("utf-8")).digest()[:DIM], dtype=np.uint8) + 1.0
+            for text in texts
+        ], dtype=np.float32)
+
+
+def main() -> int:
+    logger.info("🔍 VÉRIFICATION DU CACHE D'EMBEDDINGS")
+    directory = tempfile.mkdtemp(prefix="check_embeddings_")
+    model = HashModel()
+    failures = 0
+
+    try:
+        store = EmbeddingStore(model, model_name="hash", directory=directory)
+        expected = store.encode(TEXTS)
+        store.encode(["Docker"])  # Ajout suivant : les clés déjà écrites sont relues
+
+        reopened = EmbeddingStore(model, model_name="hash", directory=directory)
+        if len(reopened) != len(TEXTS) + 1:
+            failures += 1
+            logger.error(f"❌ {len(reopened)} clés relues, {len(TEXTS) + 1} attendues")
+
+        for text, vector in zip(TEXTS, expected):
+            if text not in reopened._index:
+                failures += 1
+                logger.error(f"❌ Clé perdue après réouverture : {text!r}")
+            elif not np.allclose(reopened.encode([text])[0], vector):
+                failures += 1
+                logger.error(f"❌ Mauvais vecteur après réouverture : {text!r}")
+            else:
+                logger.info(f"✅ {text!r}")
+    except Exception as e:
+        failures += 1
+        logger.error(f"❌ Erreur du cache : {e}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    if failures:
+        logger.error(f"❌ {failures} problème(s)")
+        return 1
+    logger.info("✅ Toutes les clés survivent à l'écriture et à la réouverture")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
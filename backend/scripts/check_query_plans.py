@@ -0,0 +1,107 @@
+"""
+Vérifie, par EXPLAIN, que les requêtes de liste des candidats utilisent les
+index composites et ne lisent pas les colonnes lourdes (cv_text,
+extracted_data)
+
+À lancer après `alembic upgrade head` sur la base configurée (DATABASE_URL) :
+    python scripts/check_query_plans.py
+
+Code de sortie 1 si un plan n'utilise pas l'index attendu.
+"""
+import sys
+import os
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import load_only
+
+from app.database import SessionLocal, engine
+from app.models.candidate import Candidate, LISTING_COLUMNS
+from app.models.interview import InterviewSession, InterviewStatus
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+HEAVY_COLUMNS = ("cv_text", "extracted_data")
+
+
+def listing_checks(db):
+    """(nom, requête, index attendu) : mêmes requêtes que les routes"""
+    by_job = db.query(Candidate).options(load_only(*LISTING_COLUMNS))\
+        .filter(Candidate.job_offer_id == 1)\
+        .order_by(Candidate.ranking_score.desc(), Candidate.id)
+
+    return [
+        ("GET /api/candidates/by-job", by_job.offset(0).limit(20), "ix_candidates_job_offer_ranking"),
+        ("GET /api/candidates/by-job?min_score",
+         by_job.filter(Candidate.ranking_score >= 65).limit(20), "ix_candidates_job_offer_ranking"),
+        ("GET /api/candidates/ranking", by_job.limit(10), "ix_candidates_job_offer_ranking"),
+        ("Rang d'un candidat (COUNT)",
+         db.query(func.count(Candidate.id)).filter(Candidate.job_offer_id == 1, Candidate.ranking_score > 50),
+         "ix_candidates_job_offer_ranking"),
+        ("Session d'entretien en cours",
+         db.query(InterviewSession).filter(
+             InterviewSession.candidate_id == 1,
+             InterviewSession.job_offer_id == 1,
+             InterviewSession.status.in_([InterviewStatus.STARTED, InterviewStatus.IN_PROGRESS])
+         ).limit(1),
+         "ix_interview_sessions_candidate_job_status"),
+        ("GET /api/candidates/",
+         db.query(Candidate).options(load_only(*LISTING_COLUMNS)).offset(0).limit(100), None),
+    ]
+
+
+def explain(db, sql: str) -> str:
+    """Plan d'exécution textuel (PostgreSQL ou SQLite)"""
+    if engine.dialect.name == "postgresql":
+        # Sur une petite table le planificateur préfère un parcours séquentiel :
+        # on le désactive pour vérifier que l'index est utilisable
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        rows = db.execute(text(f"EXPLAIN {sql}")).fetchall()
+        return "\n".join(row[0] for row in rows)
+
+    rows = db.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+def main() -> int:
+    logger.info(f"🔍 VÉRIFICATION DES PLANS D'EXÉCUTION ({engine.dialect.name})")
+    failures = 0
+
+    db = SessionLocal()
+    try:
+        for name, query, expected_index in listing_checks(db):
+            sql = str(query.statement.compile(engine, compile_kwargs={"literal_binds": True}))
+            plan = explain(db, sql)
+
+            problems = []
+            if query.column_descriptions[0]["entity"] is Candidate:
+                problems += [f"colonne {column} lue" for column in HEAVY_COLUMNS if column in sql]
+            if expected_index and expected_index not in plan:
+                problems.append(f"index {expected_index} non utilisé")
+
+            if problems:
+                failures += 1
+                logger.error(f"❌ {name} : {', '.join(problems)}\n{plan}")
+            else:
+                logger.info(f"✅ {name} : {plan.splitlines()[0] if plan else ''}")
+    finally:
+        db.rollback()
+        db.close()
+
+    if failures:
+        logger.error(f"❌ {failures} requête(s) en échec")
+    else:
+        logger.info("🎉 Tous les plans utilisent les index attendus")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Vérifie la suppression de candidats dans l'index de recherche sémantique
+(CandidateSearchIndex) :
+  1. un candidat retiré n'est plus retourné, y compris par une autre
+     instance (autre worker) et après réouverture
+  2. la recherche retourne top_k candidats même quand un candidat occupe
+     les premières places avec beaucoup de passages
+  3. le compactage retire les passages supprimés des fichiers sans
+     perdre ni décaler les autres (recherche exacte puis IVF)
+
+Utilise un modèle déterministe minimal (sac de mots haché, pas de
+SentenceTransformer) et un dossier temporaire :
+    python scripts/check_search_index.py
+
+Code de sortie 1 si un candidat supprimé réapparaît ou si un résultat manque.
+"""
+import sys
+import os
+import hashlib
+import logging
+import shutil
+import tempfile
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from app.modules.cv_analyzer import search_index as search_index_module
+from app.modules.cv_analyzer.search_index import CandidateSearchIndex, chunk_text
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+DIM = 64
+WORDS = ["python", "java", "kafka", "docker", "react", "sql", "spark", "linux"]
+
+
+class BagOfWordsModel:
+    """Modèle d'embeddings déterministe (mots hachés dans DIM dimensions)"""
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return DIM
+
+    def encode(self, texts, **kwargs) -> np.ndarray:
+        vectors = np.zeros((len(texts), DIM), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[i, hashlib.sha256(word.encode("utf-8")).digest()[0] % DIM] += 1.0
+        return vectors
+
+
+def cv_text(candidate_id: int, chunks: int = 1) -> str:
+    """CV dont chaque passage parle d'une compétence (rotation sur WORDS)"""
+    word = WORDS[candidate_id % len(WORDS)]
+    return " ".join([word] * (search_index_module.CHUNK_STRIDE * chunks))
+
+
+# Passages du candidat 8 plus proches de la requête "python java" que ceux
+# de tous les autres candidats, et plus nombreux que top_k * 10
+CROWDING_TEXT = " ".join(["python", "java"] * (search_index_module.CHUNK_STRIDE * 50))
+
+
+def check(condition: bool, message: str) -> int:
+    if condition:
+        logger.info(f"✅ {message}")
+        return 0
+    logger.error(f"❌ {message}")
+    return 1
+
+
+def found_ids(index: CandidateSearchIndex, query: str, top_k: int) -> list:
+    """Candidats dont un passage correspond à la requête (la recherche complète avec des scores nuls)"""
+    return [hit["candidate_id"] for hit in index.search(query, top_k=top_k) if hit["score"] > 0.99]
+
+
+def check_removal(model, directory: str) -> int:
+    failures = 0
+    index = CandidateSearchIndex(model, model_name="bow", directory=directory)
+    other = CandidateSearchIndex(model, model_name="bow", directory=directory)
+
+    items = [(candidate_id, cv_text(candidate_id)) for candidate_id in range(1, 41)]
+    items.append((8, CROWDING_TEXT))
+    index.add_candidates(items)
+
+    hits = [hit["candidate_id"] for hit in index.search("python java", top_k=5)]
+    failures += check(len(set(hits)) == 5 and hits[0] == 8,
+                      f"{len(set(hits))}/5 candidats malgré les passages répétés du candidat 8")
+
+    python_ids = [candidate_id for candidate_id in range(1, 41) if candidate_id % len(WORDS) == 0]
+
+    # Suppression marquée (sous le seuil de compactage)
+    failures += check(index.remove_candidate(16) == 1 and os.path.exists(index.deleted_path),
+                      "Passage du candidat 16 marqué supprimé")
+    failures += check(index.remove_candidate(16) == 0, "Deuxième suppression sans effet")
+    for name, instance in (("même instance", index), ("autre instance", other)):
+        hits = found_ids(instance, "python", top_k=10)
+        failures += check(sorted(hits) == [i for i in python_ids if i != 16],
+                          f"Candidat 16 absent des résultats ({name})")
+
+    # Compactage : plus de COMPACT_RATIO des passages supprimés
+    rows_before = os.path.getsize(index.rows_path)
+    removed = index.remove_candidate(8)
+    failures += check(removed == len(chunk_text(cv_text(8))) + len(chunk_text(CROWDING_TEXT)),
+                      f"{removed} passages retirés pour le candidat 8")
+    failures += check(not os.path.exists(index.deleted_path) and os.path.getsize(index.rows_path) < rows_before,
+                      f"Index compacté : {len(index)} passages restants")
+    index.remove_candidates(range(9, 33))
+
+    expected = sorted(set(range(1, 41)) - set(range(8, 33)))
+    for name, instance in (("même instance", index), ("autre instance", other),
+                           ("réouverture", CandidateSearchIndex(model, model_name="bow", directory=directory))):
+        hits = [hit for word in WORDS for hit in instance.search(word, top_k=40) if hit["score"] > 0.99]
+        failures += check(sorted(hit["candidate_id"] for hit in hits) == expected,
+                          f"Candidats restants retrouvés après compactage ({name})")
+        failures += check(all(hit["chunk_index"] == 0 for hit in hits),
+                          f"Passages non décalés après compactage ({name})")
+    return failures
+
+
+def check_removal_ivf(model, directory: str) -> int:
+    failures = 0
+    index = CandidateSearchIndex(model, model_name="bow", directory=directory)
+    count = search_index_module.MIN_TRAIN_VECTORS
+    index.add_candidates((candidate_id, cv_text(candidate_id)) for candidate_id in range(1, count + 1))
+    failures += check(index._centroids is not None, f"Index IVF entraîné ({len(index)} passages)")
+
+    removed_ids = set(range(1, count + 1, 2))
+    index.remove_candidates(removed_ids)
+    hits = found_ids(index, "kafka", top_k=count)
+    expected = [i for i in range(1, count + 1) if i % len(WORDS) == 2 and i not in removed_ids]
+    failures += check(sorted(hits) == expected and not removed_ids & set(hits),
+                      f"IVF : {len(hits)}/{len(expected)} candidats retrouvés, aucun supprimé")
+    return failures
+
+
+def main() -> int:
+    logger.info("🔍 VÉRIFICATION DE LA SUPPRESSION DANS L'INDEX DE RECHERCHE")
+    model = BagOfWordsModel()
+    failures = 0
+
+    for check_function in (check_removal, check_removal_ivf):
+        directory = tempfile.mkdtemp(prefix="check_search_index_")
+        try:
+            failures += check_function(model, directory)
+        except Exception as e:
+            failures += 1
+            logger.error(f"❌ Erreur de l'index : {e}", exc_info=True)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    if failures:
+        logger.error(f"❌ {failures} problème(s)")
+        return 1
+    logger.info("✅ Les candidats supprimés ne sont plus retournés")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
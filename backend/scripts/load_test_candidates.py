@@ -0,0 +1,104 @@
+"""
+Test de charge : latence de GET /api/candidates/{id} pendant des uploads de CV
+
+Mesure le p50/p99 de GET /api/candidates/{id} :
+  1. au repos
+  2. pendant que plusieurs clients envoient des CVs en continu (upload-cv)
+
+Si l'analyse bloque la boucle d'événements, le p99 de la phase 2 explose ;
+avec les routes synchrones + l'exécuteur NLP dédié il doit rester stable.
+
+Usage (serveur lancé à côté) :
+    python scripts/load_test_candidates.py --candidate-id 1 --job-id 1 \\
+        --pdf "data/uploads/cvs/20260109_094429_CV FRANK MOREAU.pdf"
+"""
+import os
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(values: list, pct: float) -> float:
+    """Percentile simple (méthode du rang le plus proche)"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def measure_reads(client: httpx.AsyncClient, candidate_id: int, duration: float) -> list:
+    """Enchaîne les GET /api/candidates/{id} et retourne les latences (ms)"""
+    latencies = []
+    deadline = time.perf_counter() + duration
+
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get(f"/api/candidates/{candidate_id}")
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+
+    return latencies
+
+
+async def upload_loop(client: httpx.AsyncClient, job_id: int, pdf_path: str, stop: asyncio.Event) -> int:
+    """
+    Envoie le même CV en boucle jusqu'à l'arrêt, retourne le nombre d'uploads
+    (un email déjà existant peut faire échouer l'insertion : seule la charge
+    d'analyse compte ici)
+    """
+    with open(pdf_path, "rb") as f:
+        content = f.read()
+
+    count = 0
+    while not stop.is_set():
+        await client.post(
+            "/api/candidates/upload-cv",
+            params={"job_offer_id": job_id},
+            files={"cv_file": (os.path.basename(pdf_path), content, "application/pdf")},
+            timeout=None
+        )
+        count += 1
+    return count
+
+
+def report(label: str, latencies: list):
+    print(f"  {label:<22} n={len(latencies):<5} "
+          f"p50={statistics.median(latencies):7.1f} ms  "
+          f"p99={percentile(latencies, 99):7.1f} ms  "
+          f"max={max(latencies):7.1f} ms")
+
+
+async def main(args):
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30) as client:
+        print(f"📊 GET /api/candidates/{args.candidate_id} — {args.duration:.0f}s par phase")
+
+        idle = await measure_reads(client, args.candidate_id, args.duration)
+        report("Au repos", idle)
+
+        stop = asyncio.Event()
+        uploaders = [
+            asyncio.create_task(upload_loop(client, args.job_id, args.pdf, stop))
+            for _ in range(args.uploaders)
+        ]
+        loaded = await measure_reads(client, args.candidate_id, args.duration)
+        stop.set()
+        uploads = sum(await asyncio.gather(*uploaders))
+        report(f"Pendant {args.uploaders} uploaders", loaded)
+
+        print(f"\n📤 {uploads} CVs uploadés pendant la mesure")
+        ratio = percentile(loaded, 99) / percentile(idle, 99)
+        print(f"📈 p99 sous charge / p99 au repos : x{ratio:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--candidate-id", type=int, required=True)
+    parser.add_argument("--job-id", type=int, required=True)
+    parser.add_argument("--pdf", required=True, help="CV PDF à uploader en boucle")
+    parser.add_argument("--uploaders", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=20.0)
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,48 @@
+"""
+Script pour resynchroniser les statistiques matérialisées (table job_statistics)
+à partir des candidats en base
+
+Usage :
+    python scripts/rebuild_job_statistics.py            # toutes les offres
+    python scripts/rebuild_job_statistics.py --job-id 3 # une seule offre
+"""
+import sys
+import os
+import argparse
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database import Base, SessionLocal, engine
+from app.modules.cv_analyzer.statistics import RecruitmentStats
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+
+def main(job_id: int = None):
+    """Recalcule les statistiques d'une offre ou de toutes les offres"""
+    logger.info("🚀 RECALCUL DES STATISTIQUES DES OFFRES")
+
+    # Crée la table job_statistics si nécessaire
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        total = RecruitmentStats.rebuild_job_statistics(db, job_id)
+    finally:
+        db.close()
+
+    logger.info(f"🎉 {total} offre(s) resynchronisée(s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--job-id", type=int, default=None)
+
+    main(parser.parse_args().job_id)
@@ -0,0 +1,61 @@
+"""
+Script d'audit des scores d'entretien : recalcule les sommes courantes
+(interview_sessions.*_score_sum / *_count) à partir des réponses et
+signale les sessions dont le score global a changé
+
+Usage :
+    python scripts/recompute_interview_scores.py                # toutes les sessions
+    python scripts/recompute_interview_scores.py --session-id 3 # une seule session
+"""
+import sys
+import os
+import argparse
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database import SessionLocal
+from app.models.interview import InterviewSession
+from app.modules.chatbot.interviewer import Interviewer
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+DRIFT_TOLERANCE = 0.01
+
+
+def main(session_id: int = None):
+    """Recalcule les scores d'une session ou de toutes les sessions"""
+    logger.info("🚀 AUDIT DES SCORES D'ENTRETIEN")
+
+    db = SessionLocal()
+    try:
+        interviewer = Interviewer(db)
+
+        query = db.query(InterviewSession.id).order_by(InterviewSession.id)
+        if session_id is not None:
+            query = query.filter(InterviewSession.id == session_id)
+        session_ids = [row.id for row in query.all()]
+
+        drifted = 0
+        for current_id in session_ids:
+            result = interviewer.recompute_scores(str(current_id))
+            if abs(result["drift"]) > DRIFT_TOLERANCE:
+                drifted += 1
+                logger.warning(f"⚠️  Session #{current_id} : score global corrigé de {result['drift']:+.2f}")
+    finally:
+        db.close()
+
+    logger.info(f"🎉 {len(session_ids)} session(s) recalculée(s), {drifted} écart(s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--session-id", type=int, default=None)
+
+    main(parser.parse_args().session_id)